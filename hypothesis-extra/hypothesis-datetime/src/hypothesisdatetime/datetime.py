@@ -22,8 +22,8 @@ from collections import namedtuple
 
 import pytz
 import hypothesis.internal.distributions as dist
-from hypothesis.errors import InvalidArgument
-from hypothesis.internal.compat import hrange, text_type
+from hypothesis.errors import BadData, InvalidArgument
+from hypothesis.internal.compat import text_type, integer_types
 from hypothesis.searchstrategy.strategies import SearchStrategy, \
     strategy, check_length, check_data_type
 
@@ -34,15 +34,107 @@ timezone_aware_datetime = DatetimeSpec({False})
 any_datetime = DatetimeSpec({False, True})
 
 
+DAYS_IN_MONTH = (None, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+DAYS_BEFORE_MONTH = (None, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304,
+                     334)
+
+MICROSECONDS_PER_SECOND = 10 ** 6
+MICROSECONDS_PER_DAY = 24 * 60 * 60 * MICROSECONDS_PER_SECOND
+
+
+def is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year, month):
+    if month == 2 and is_leap(year):
+        return 29
+    return DAYS_IN_MONTH[month]
+
+
+def to_ordinal(year, month, day):
+    """The same as dt.date(year, month, day).toordinal() but without
+    constructing a date."""
+    y = year - 1
+    return (
+        y * 365 + y // 4 - y // 100 + y // 400 +
+        DAYS_BEFORE_MONTH[month] + (month > 2 and is_leap(year)) + day
+    )
+
+
+EPOCH = dt.datetime(1970, 1, 1)
+EPOCH_ORDINAL = to_ordinal(1970, 1, 1)
+
+
+def to_microseconds(year, month, day, hour, minute, second, microsecond):
+    """Count the microseconds from the epoch to the naive datetime with these
+    fields."""
+    seconds = (hour * 60 + minute) * 60 + second
+    return (
+        (to_ordinal(year, month, day) - EPOCH_ORDINAL) * MICROSECONDS_PER_DAY +
+        seconds * MICROSECONDS_PER_SECOND + microsecond
+    )
+
+
+def from_microseconds(microseconds):
+    return EPOCH + dt.timedelta(microseconds=microseconds)
+
+
 def draw_day_for_month(random, year, month):
     # Validate that we've not got a bad year or month
-    dt.datetime(year=year, month=month, day=27)
-    for max_day in hrange(31, 27, -1):  # pragma: no branch
-        try:
-            dt.datetime(year=year, month=month, day=max_day)
-            return random.randint(1, max_day)
-        except ValueError:
-            pass
+    if not (dt.MINYEAR <= year <= dt.MAXYEAR and 1 <= month <= 12):
+        raise ValueError('Invalid year and month %r, %r' % (year, month))
+    return random.randint(1, days_in_month(year, month))
+
+
+_timezone_cache = {}
+
+
+def get_timezone(name):
+    """Equivalent to pytz.timezone(name) but cached, as it's called once for
+    every example we reify."""
+    try:
+        return _timezone_cache[name]
+    except KeyError:
+        result = pytz.timezone(name)
+        _timezone_cache[name] = result
+        return result
+
+
+_all_timezones = []
+
+
+def all_timezones():
+    """Every timezone pytz knows about, with UTC first."""
+    if not _all_timezones:
+        names = list(pytz.all_timezones)
+        names.remove('UTC')
+        names.insert(0, 'UTC')
+        _all_timezones.extend(map(get_timezone, names))
+    return _all_timezones
+
+
+FIELDS = ('year', 'month', 'day', 'hour', 'minute', 'second', 'microsecond')
+
+FIELD_MINIMA = {
+    'month': 1, 'day': 1, 'hour': 0, 'minute': 0, 'second': 0,
+    'microsecond': 0,
+}
+
+
+def shrink_towards(current, target):
+    """Yield values from target back towards current, each half as far from
+    current as the last.
+
+    Trying these in order and restarting from whichever first works finds
+    the value closest to target that works in O(log(distance)) tries if
+    working values are contiguous.
+
+    """
+    distance = current - target
+    while distance:
+        yield current - distance
+        distance = int(distance / 2)
 
 
 def maybe_zero_or(random, p, v):
@@ -71,6 +163,11 @@ class DatetimeStrategy(SearchStrategy):
         self.timezones = timezones
         self.min_year = min_year or dt.MINYEAR
         self.max_year = max_year or dt.MAXYEAR
+        self._timezone_indices = None
+        self.min_microseconds = to_microseconds(
+            self.min_year, 1, 1, 0, 0, 0, 0)
+        self.max_microseconds = to_microseconds(
+            self.max_year, 12, 31, 23, 59, 59, 999999)
 
     def draw_parameter(self, random):
         return self.Parameter(
@@ -84,10 +181,9 @@ class DatetimeStrategy(SearchStrategy):
         )
 
     def draw_template(self, random, pv):
-        random = random
         year = random.randint(self.min_year, self.max_year)
         month = random.choice(pv.month)
-        base = dt.datetime(
+        microseconds = to_microseconds(
             year=year,
             month=month,
             day=draw_day_for_month(random, year, month),
@@ -97,114 +193,99 @@ class DatetimeStrategy(SearchStrategy):
             microsecond=random.randint(0, 1000000 - 1),
         )
         if not pv.timezones:
-            return self.templateize(base)
+            return (microseconds, None)
 
         timezone = random.choice(pv.timezones)
 
         if not self.allow_naive:
-            return self.templateize(timezone.localize(base))
+            return (microseconds, text_type(timezone.zone))
 
         naive = random.random() <= pv.naive_chance
 
         if naive:
-            return self.templateize(base)
+            return (microseconds, None)
         else:
-            return self.templateize(timezone.localize(base))
+            return (microseconds, text_type(timezone.zone))
 
     def templateize(self, dt):
         return (
-            dt.year,
-            dt.month,
-            dt.day,
-            dt.hour,
-            dt.minute,
-            dt.second,
-            dt.microsecond,
+            to_microseconds(
+                dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second,
+                dt.microsecond,
+            ),
             text_type(dt.tzinfo.zone) if dt.tzinfo else None,
         )
 
     def reify(self, template):
-        tz = template[-1]
-        d = dt.datetime(
-            year=template[0], month=template[1], day=template[2],
-            hour=template[3], minute=template[4], second=template[5],
-            microsecond=template[6]
-        )
+        microseconds, tz = template
+        d = from_microseconds(microseconds)
         if tz:
-            d = pytz.timezone(tz).localize(d)
+            d = get_timezone(tz).localize(d)
         return d
 
     def simplifiers(self, random, template):
         yield self.simplify_timezones
-        yield self.simplify_towards_2000
+        yield self.simplify_to_start_of_2000
+        for field in FIELDS:
+            yield self.field_simplifier(field)
+
+    def timezone_index(self, zone):
+        if self._timezone_indices is None:
+            self._timezone_indices = dict(
+                (tz.zone, i) for i, tz in enumerate(self.timezones))
+        return self._timezone_indices.get(zone, len(self.timezones))
 
     def simplify_timezones(self, random, value):
-        value = self.reify(value)
-        if self.timezones:
-            if not value.tzinfo:
-                yield self.templateize(self.timezones[0].localize(value))
-            else:
-                for j in hrange(len(self.timezones)):
-                    tz = self.timezones[j]
-                    if tz.zone == value.tzinfo.zone:
-                        break
-                    yield self.templateize(tz.normalize(value.astimezone(tz)))
-
-    def year_in_bounds(self, year):
-        return self.min_year <= year <= self.max_year
-
-    def simplify_towards_2000(self, random, value):
-        value = self.reify(value)
-        s = {value}
-        s.add(value.replace(microsecond=0))
-        s.add(value.replace(second=0))
-        s.add(value.replace(minute=0))
-        s.add(value.replace(hour=0))
-        s.add(value.replace(day=1))
-        s.add(value.replace(month=1))
-        if self.year_in_bounds(2000):
-            s.add(value.replace(year=2000))
-        s.remove(value)
-        for t in s:
-            yield self.templateize(t)
-
-        for h in hrange(value.hour - 1, 0, -1):
-            yield self.templateize(value.replace(hour=h))
-
-        year = value.year
-        if year == 2000:
+        microseconds, zone = value
+        if not self.timezones:
             return
-        # We swallow a bunch of value errors here.
-        # These can happen if the original value was february 29 on a
-        # leap year and the current year is not a leap year.
-        # Note that 2000 was a leap year which is why we didn't need one above.
-        mid = (year + 2000) // 2
-        if mid != 2000 and mid != year and self.year_in_bounds(mid):
-            try:
-                yield self.templateize(value.replace(year=mid))
-            except ValueError:
-                pass
-        direction = -1 if year > 2000 else 1
-        years = hrange(year + direction, 2000, direction)
-        for year in years:
-            if year == mid:
-                continue
-            try:
-                if self.year_in_bounds(year):
-                    yield self.templateize(value.replace(year))
-            except ValueError:
-                pass
+        if zone is None:
+            yield (microseconds, text_type(self.timezones[0].zone))
+            return
+        for i in shrink_towards(self.timezone_index(zone), 0):
+            yield (microseconds, text_type(self.timezones[i].zone))
+
+    def target(self, field):
+        if field == 'year':
+            return min(max(2000, self.min_year), self.max_year)
+        return FIELD_MINIMA[field]
+
+    def with_fields(self, value, **fields):
+        d = from_microseconds(value[0])
+        values = dict((f, getattr(d, f)) for f in FIELDS)
+        values.update(fields)
+        values['day'] = min(
+            values['day'], days_in_month(values['year'], values['month']))
+        return (to_microseconds(**values), value[1])
+
+    def simplify_to_start_of_2000(self, random, value):
+        simplest = self.with_fields(
+            value, **dict((f, self.target(f)) for f in FIELDS))
+        if simplest != value:
+            yield simplest
+
+    def field_simplifier(self, field):
+        def accept(random, value):
+            current = getattr(from_microseconds(value[0]), field)
+            for simpler in shrink_towards(current, self.target(field)):
+                yield self.with_fields(value, **{str(field): simpler})
+        accept.__name__ = str('field_simplifier(%s)' % (field,))
+        return accept
 
     def to_basic(self, value):
         return list(value)
 
     def from_basic(self, values):
         check_data_type(list, values)
-        check_length(8, values)
-        for d in values[:-1]:
-            check_data_type(int, d)
-        if values[-1] is not None:
-            check_data_type(text_type, values[-1])
+        check_length(2, values)
+        microseconds, tz = values
+        check_data_type(integer_types, microseconds)
+        if not (
+            self.min_microseconds <= microseconds <= self.max_microseconds
+        ):
+            raise BadData('Datetime out of range %r' % (microseconds,))
+        if tz is not None:
+            check_data_type(text_type, tz)
         return tuple(values)
 
 
@@ -218,13 +299,12 @@ def datetimes(allow_naive=None, timezones=None, min_year=None, max_year=None):
 
     """
     if timezones is None:
-        timezones = list(pytz.all_timezones)
-        timezones.remove('UTC')
-        timezones.insert(0, 'UTC')
-    timezones = [
-        tz if isinstance(tz, dt.tzinfo) else pytz.timezone(tz)
-        for tz in timezones
-    ]
+        timezones = all_timezones()
+    else:
+        timezones = [
+            tz if isinstance(tz, dt.tzinfo) else get_timezone(tz)
+            for tz in timezones
+        ]
     if allow_naive is None:
         allow_naive = not timezones
     if not (timezones or allow_naive):
@@ -24,7 +24,7 @@ import hypothesis.settings as hs
 from hypothesis import given, assume
 from hypothesis.strategytests import strategy_test_suite
 from hypothesis.extra.datetime import datetimes, any_datetime, \
-    naive_datetime, timezone_aware_datetime
+    all_timezones, naive_datetime, timezone_aware_datetime
 from hypothesis.internal.debug import minimal
 from hypothesis.internal.compat import hrange
 
@@ -127,3 +127,37 @@ def test_min_year_is_respected():
 
 def test_max_year_is_respected():
     assert minimal(datetimes(max_year=1998)).year == 1998
+
+
+def count_calls_to_minimize(strategy, condition):
+    calls = [0]
+
+    def counting_condition(x):
+        calls[0] += 1
+        return condition(x)
+    minimal(strategy, counting_condition)
+    return calls[0]
+
+
+def test_shrinks_distant_years_in_logarithmically_many_steps():
+    calls = count_calls_to_minimize(
+        datetimes(min_year=9000), lambda x: x.year >= 9000)
+    assert calls <= 200
+
+
+def test_shrinks_timezones_in_logarithmically_many_steps():
+    zones = [tz.zone for tz in all_timezones()]
+    calls = count_calls_to_minimize(
+        datetimes(allow_naive=False),
+        lambda x: zones.index(x.tzinfo.zone) >= len(zones) // 2)
+    assert calls <= 200
+
+
+def test_shrinks_each_field_to_its_boundary():
+    x = minimal(datetimes(timezones=[]), lambda x: (
+        x.year >= 2100 and x.month >= 6 and x.day >= 17 and
+        x.hour >= 13 and x.minute >= 7 and x.second >= 42
+    ))
+    assert (x.year, x.month, x.day, x.hour, x.minute, x.second) == (
+        2100, 6, 17, 13, 7, 42)
+    assert x.microsecond == 0
@@ -18,11 +18,60 @@ from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
 import random
+import datetime as dt
 
 import pytest
-from hypothesis.extra.datetime import draw_day_for_month
+
+import pytz
+from hypothesis import given
+from hypothesis.errors import BadData
+from hypothesis.strategies import integers
+from hypothesis.extra.datetime import datetimes, to_ordinal, \
+    get_timezone, all_timezones, to_microseconds, from_microseconds, \
+    draw_day_for_month
 
 
 def test_draw_day_for_month_errors_on_bad_month():
     with pytest.raises(ValueError):
         draw_day_for_month(random, 2001, 13)
+
+
+def test_draw_day_for_month_knows_about_leap_years():
+    r = random.Random(0)
+    days = {draw_day_for_month(r, 2000, 2) for _ in range(200)}
+    assert max(days) == 29
+    days = {draw_day_for_month(r, 1900, 2) for _ in range(200)}
+    assert max(days) == 28
+
+
+@given(integers(dt.date.min.toordinal(), dt.date.max.toordinal()))
+def test_to_ordinal_agrees_with_date(ordinal):
+    d = dt.date.fromordinal(ordinal)
+    assert to_ordinal(d.year, d.month, d.day) == ordinal
+
+
+@given(integers(
+    to_microseconds(1, 1, 1, 0, 0, 0, 0),
+    to_microseconds(9999, 12, 31, 23, 59, 59, 999999),
+))
+def test_microseconds_round_trip(microseconds):
+    d = from_microseconds(microseconds)
+    assert to_microseconds(
+        d.year, d.month, d.day, d.hour, d.minute, d.second, d.microsecond
+    ) == microseconds
+
+
+def test_caches_timezones():
+    assert get_timezone('Europe/London') is get_timezone('Europe/London')
+    assert get_timezone('Europe/London') is pytz.timezone('Europe/London')
+
+
+def test_only_looks_up_all_timezones_once():
+    assert datetimes().timezones is datetimes().timezones
+    assert all_timezones()[0] is pytz.UTC
+
+
+def test_rejects_out_of_range_templates():
+    strategy = datetimes(min_year=2000, max_year=2001)
+    with pytest.raises(BadData):
+        strategy.from_basic([to_microseconds(1999, 1, 1, 0, 0, 0, 0), None])
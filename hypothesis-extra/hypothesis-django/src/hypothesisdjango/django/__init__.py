@@ -20,6 +20,10 @@ from __future__ import division, print_function, absolute_import, \
 import unittest
 
 import django.test as dt
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test.testcases import connections_support_transactions
+
+from .models import deferring_saves
 
 
 class HypothesisTestCase(object):
@@ -30,6 +34,14 @@ class HypothesisTestCase(object):
     def teardown_example(self, example):
         self._post_teardown()
 
+    def execute_example(self, function):
+        token = self.setup_example()
+        try:
+            with deferring_saves():
+                return function()
+        finally:
+            self.teardown_example(token)
+
     def __call__(self, result=None):
         testMethod = getattr(self, self._testMethodName)
         if getattr(testMethod, 'is_hypothesis_test', False):
@@ -39,7 +51,67 @@ class HypothesisTestCase(object):
 
 
 class TestCase(HypothesisTestCase, dt.TestCase):
-    pass
+
+    """A Django TestCase which runs each example in its own transaction.
+
+    By default every example gets a full _pre_setup and _post_teardown, the
+    same as a normal test would. If savepoint_per_example is True then
+    instead the transaction for the test (and any fixtures) is set up only
+    once for all of its examples, and each example is rolled back to a
+    savepoint taken at the start. This is much cheaper, but means that
+    anything outside the database that _pre_setup would reset (e.g. the
+    mail outbox) is shared between examples.
+
+    savepoint_per_example has no effect on databases which do not support
+    transactions.
+
+    """
+
+    savepoint_per_example = False
+
+    def uses_savepoints(self):
+        return (
+            self.savepoint_per_example and
+            connections_support_transactions()
+        )
+
+    def savepoint_databases(self):
+        if getattr(self, 'multi_db', False):
+            return [
+                db for db in connections
+                if not connections[db].settings_dict['TEST'].get('MIRROR')
+            ]
+        return [DEFAULT_DB_ALIAS]
+
+    def setup_batch(self):
+        if not self.uses_savepoints():
+            return None
+        self._pre_setup()
+        return dict(
+            (db, transaction.savepoint(using=db))
+            for db in self.savepoint_databases()
+        )
+
+    def reset_example(self, savepoints):
+        if savepoints is None:
+            return
+        for db, savepoint in savepoints.items():
+            # An error in the example may have marked the transaction as
+            # unusable, but rolling back to the savepoint will fix that.
+            transaction.set_rollback(False, using=db)
+            transaction.savepoint_rollback(savepoint, using=db)
+
+    def teardown_batch(self, savepoints):
+        if savepoints is not None:
+            self._post_teardown()
+
+    def setup_example(self):
+        if not self.uses_savepoints():
+            super(TestCase, self).setup_example()
+
+    def teardown_example(self, example):
+        if not self.uses_savepoints():
+            super(TestCase, self).teardown_example(example)
 
 
 class TransactionTestCase(HypothesisTestCase, dt.TransactionTestCase):
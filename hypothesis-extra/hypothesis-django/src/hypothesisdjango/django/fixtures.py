@@ -17,30 +17,114 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import hashlib
 import weakref
+import binascii
 from random import Random
+from contextlib import contextmanager
 
-from django.db import transaction
+from django.db import connections, transaction
 from hypothesis.core import best_satisfying_template
 from hypothesis.errors import UnsatisfiedAssumption
 from django.test.runner import setup_databases
 from hypothesis.settings import Settings
+from hypothesis.internal.reflection import function_digest
+from hypothesis.internal.fingerprint import strategy_fingerprint
+
+
+def using_test_databases():
+    """Is every database connection already pointed at its test database,
+    e.g. because we are being called from inside a running test?"""
+    for alias in connections:
+        connection = connections[alias]
+        if (
+            connection.settings_dict['NAME'] !=
+            connection.creation._get_test_db_name()
+        ):
+            return False
+    return True
+
+
+@contextmanager
+def test_databases(verbosity=0):
+    """Run the block against the test databases, creating them for its
+    duration if they do not already exist."""
+    if using_test_databases():
+        yield
+    else:
+        old_config = setup_databases(
+            verbosity=verbosity, interactive=False
+        )
+        try:
+            yield
+        finally:
+            old_names, mirrors = old_config
+            for connection, old_name, destroy in old_names:
+                if destroy:
+                    connection.creation.destroy_test_db(
+                        old_name, verbosity, False)
+
+
+class FixtureRegistry(object):
+
+    """Keeps track of fixtures in the order they were defined and finds
+    templates for them.
+
+    Templates are not found when a fixture is defined but the first time any
+    fixture is used, and then for every fixture defined so far at once, so
+    the test databases only have to be set up once rather than once per
+    fixture.
 
-ALL_FIXTURES = []
+    Each template that is found is saved in the example database under a key
+    derived from the definition of its fixture and of every fixture defined
+    before it (because a fixture's constraint is checked with those already
+    present). A later run with the same definitions reuses the saved
+    templates without touching the database at all.
 
+    """
 
-def active_fixtures():
-    for f in ALL_FIXTURES:
-        t = f()
-        if t is not None:
-            yield t
+    def __init__(self):
+        self.references = []
+        self.chain = hashlib.sha1()
+
+    def fixtures(self):
+        for r in self.references:
+            f = r()
+            if f is not None:
+                yield f
+
+    def register(self, fixture):
+        self.chain.update(fixture.definition_digest().encode('ascii'))
+        fixture.key = 'django.fixtures:' + self.chain.hexdigest()
+        self.references.append(weakref.ref(fixture))
+
+    def resolve(self):
+        pending = [f for f in self.fixtures() if f.template is None]
+        # Once one template has to be found afresh, saved templates for any
+        # later fixtures may not be compatible with it, so we search for
+        # those too.
+        while pending:
+            template = pending[0].saved_template()
+            if template is None:
+                break
+            pending.pop(0).template = template
+        if not pending:
+            return
+        with test_databases():
+            for f in pending:
+                f.template = f.find_template()
+
+
+default_registry = FixtureRegistry()
 
 
 class Fixture(object):
 
-    def __init__(self, strategy, constraint=None, execute=None, settings=None):
+    def __init__(
+        self, strategy, constraint=None, execute=None, settings=None,
+        registry=None,
+    ):
         self.strategy = strategy
-        self.constraint = constraint
         self.settings = settings or Settings(
             max_examples=10000,
             max_iterations=10000,
@@ -48,15 +132,30 @@ class Fixture(object):
         )
         self.constraint = constraint or (lambda x: True)
         self.execute = execute or (lambda f: f())
-        self._set_template()
-        ALL_FIXTURES.append(weakref.ref(self))
+        self.template = None
+        self.registry = registry or default_registry
+        self.registry.register(self)
+
+    def definition_digest(self):
+        return hashlib.sha1((
+            strategy_fingerprint(self.strategy) + ':' +
+            binascii.hexlify(
+                function_digest(self.constraint)).decode('ascii')
+        ).encode('ascii')).hexdigest()
+
+    def storage(self):
+        if self.settings.database is None:
+            return None
+        return self.settings.database.storage(
+            self.key, strategy_fingerprint(self.strategy))
 
     def template_condition(self, template):
         def run():
             try:
                 with transaction.atomic():
-                    for f in active_fixtures():
-                        assert f is not self
+                    for f in self.registry.fixtures():
+                        if f.template is None:
+                            continue
                         if f.template == template:
                             return False
                         f()
@@ -68,33 +167,33 @@ class Fixture(object):
 
         return self.execute(run)
 
-    def _set_template(self):
-        verbosity = 0
-        old_config = setup_databases(
-            verbosity=verbosity, interactive=False
+    def saved_template(self):
+        storage = self.storage()
+        if storage is None:
+            return None
+        for template in storage.fetch(self.strategy):
+            return template
+        return None
+
+    def find_template(self):
+        storage = self.storage()
+        template = best_satisfying_template(
+            search_strategy=self.strategy,
+            random=Random(),
+            condition=self.template_condition,
+            settings=self.settings,
+            storage=storage,
+            max_parameter_tries=1
         )
-        try:
-            if self.settings.database:
-                storage = self.settings.database.storage('django.fixtures')
-            else:
-                storage = None
-
-            self.template = best_satisfying_template(
-                search_strategy=self.strategy,
-                random=Random(),
-                condition=self.template_condition,
-                settings=self.settings,
-                storage=storage,
-                max_parameter_tries=1
-            )
-        finally:
-            old_names, mirrors = old_config
-            for connection, old_name, destroy in old_names:
-                if destroy:
-                    connection.creation.destroy_test_db(
-                        old_name, verbosity, False)
+        if storage is not None:
+            for stale in list(storage.fetch(self.strategy)):
+                if stale != template:
+                    storage.delete(stale, self.strategy)
+        return template
 
     def __call__(self):
+        if self.template is None:
+            self.registry.resolve()
         return self.strategy.reify(self.template)
 
 
@@ -17,13 +17,18 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+from itertools import groupby
+from contextlib import contextmanager
+
 import django.db.models as dm
 import hypothesis.strategies as st
 import hypothesis.extra.fakefactory as ff
-from django.db import IntegrityError
+from django.db import IntegrityError, connections, transaction
 from hypothesis.errors import InvalidArgument
 from hypothesis.control import assume
 from hypothesis.extra.datetime import datetimes
+from hypothesis.internal.compat import text_type, binary_type
+from hypothesis.utils.dynamicvariables import DynamicVariable
 from hypothesis.searchstrategy.strategies import SearchStrategy, \
     MappedSearchStrategy
 
@@ -72,14 +77,83 @@ def field_mappings():
 
 def add_default_field_mapping(field_type, strategy):
     field_mappings()[field_type] = strategy
+    clear_model_caches()
 
 
-def models(model, **extra):
+__dependency_orders = {}
+__resolved_mappings = {}
+__default_model_strategies = {}
+
+
+def clear_model_caches():
+    __dependency_orders.clear()
+    __resolved_mappings.clear()
+    __default_model_strategies.clear()
+
+
+def generated_foreign_keys(model, overridden=frozenset()):
+    """The foreign keys of model that we have to generate an instance of the
+    related model for."""
+    for f in model._meta.concrete_fields:
+        if (
+            isinstance(f, dm.ForeignKey) and not f.null and
+            f.name not in overridden
+        ):
+            yield f
+
+
+def dependency_order(model, overridden=frozenset()):
+    """Returns model and every model that generating it requires instances
+    of, in an order where each model comes after all of the models it
+    requires."""
+    key = (model, overridden)
+    try:
+        return __dependency_orders[key]
+    except KeyError:
+        pass
+    order = []
+    visiting = []
+
+    def visit(m, skip):
+        if m in order:
+            return
+        if m in visiting:
+            raise InvalidArgument(
+                'Cannot generate %s because its foreign keys which may not '
+                'be null form a cycle: %s' % (
+                    model.__name__, ' -> '.join(
+                        v.__name__ for v in visiting + [m])))
+        visiting.append(m)
+        for f in generated_foreign_keys(m, skip):
+            visit(f.rel.to, frozenset())
+        visiting.pop()
+        order.append(m)
+    visit(model, overridden)
+    __dependency_orders[key] = order
+    return order
+
+
+def resolved_mappings(model, overridden, deferred):
+    """Strategies for every field of model that is not overridden, from the
+    default field mappings and the default strategies for related models.
+
+    Strategies for the related models must already have been built.
+
+    """
+    key = (model, overridden, deferred)
+    try:
+        return __resolved_mappings[key]
+    except KeyError:
+        pass
     result = {}
     mappings = field_mappings()
     mandatory = set()
+    foreign_keys = set(f.name for f in generated_foreign_keys(model))
     for f in model._meta.concrete_fields:
-        if isinstance(f, dm.AutoField):
+        if isinstance(f, dm.AutoField) or f.name in overridden:
+            continue
+        if f.name in foreign_keys:
+            result[f.name] = __default_model_strategies[(f.rel.to, deferred)]
             continue
         try:
             mapped = mappings[type(f)]
@@ -90,27 +164,193 @@ def models(model, **extra):
         if f.null:
             mapped = st.one_of(st.none(), mapped)
         result[f.name] = mapped
-    missed = {x for x in mandatory if x not in extra}
-    if missed:
+    if mandatory:
         raise InvalidArgument((
             'Missing arguments for mandatory field%s %s for model %s' % (
-                's' if len(missed) > 1 else '',
-                ', '.join(missed),
+                's' if len(mandatory) > 1 else '',
+                ', '.join(sorted(mandatory)),
                 model.__name__,
             )))
+    __resolved_mappings[key] = result
+    return result
+
+
+def model_strategy(model, extra, deferred):
+    overridden = frozenset(extra)
+    for dependency in dependency_order(model, overridden)[:-1]:
+        key = (dependency, deferred)
+        if key not in __default_model_strategies:
+            __default_model_strategies[key] = ModelStrategy(
+                dependency,
+                resolved_mappings(dependency, frozenset(), deferred),
+                deferred=deferred,
+            )
+    result = dict(resolved_mappings(model, overridden, deferred))
     for k, v in extra.items():
         if isinstance(v, SearchStrategy):
             result[k] = v
         else:
             result[k] = st.just(v)
-    result.update(extra)
-    return ModelStrategy(model, result)
+    return ModelStrategy(model, result, deferred=deferred)
+
+
+def models(model, **extra):
+    """Returns a strategy for instances of model which have been saved to the
+    database.
+
+    Values for fields are generated from the default field mappings, which
+    can be overridden by passing a strategy or a value for a field as a
+    keyword argument. Foreign keys which may not be null are filled in with
+    new instances of the related model unless they are overridden. Other
+    fields which have no default mapping and may not be null must be
+    provided.
+
+    """
+    return model_strategy(model, extra, deferred=False)
+
+
+def deferred_models(model, **extra):
+    """As models, but the instances are not saved straight away.
+
+    Inside a Hypothesis Django TestCase, nothing is saved until the test
+    calls save_deferred_models, and tests which never do so never save
+    anything. Instances are then saved in the order they were generated, in
+    bulk where the database can report the primary keys of rows created by
+    bulk_create. Elsewhere, instances are saved as soon as they are
+    generated.
+
+    """
+    return model_strategy(model, extra, deferred=True)
+
+
+def check_field_constraints(model, value):
+    """Reject values for the fields of model which could never be saved, so
+    that we do not have to find out from the database."""
+    for f in model._meta.concrete_fields:
+        if f.name not in value:
+            continue
+        v = value[f.name]
+        if v is None:
+            assume(f.null)
+        elif (
+            f.max_length is not None and
+            isinstance(v, (text_type, binary_type))
+        ):
+            assume(len(v) <= f.max_length)
+
+
+def unique_values(instance):
+    for f in instance._meta.concrete_fields:
+        if f.unique and not f.primary_key:
+            value = getattr(instance, f.attname)
+            if value is not None:
+                yield (type(instance), f.attname, value)
+
+
+def refresh_foreign_keys(instance):
+    # The id of a related object is copied when it is assigned, so anything
+    # assigned before it was saved needs to be assigned again.
+    for f in instance._meta.concrete_fields:
+        if isinstance(f, dm.ForeignKey):
+            try:
+                related = getattr(instance, f.get_cache_name())
+            except AttributeError:
+                continue
+            setattr(instance, f.name, related)
+
+
+def has_unsaved_references(instance):
+    for f in instance._meta.concrete_fields:
+        if isinstance(f, dm.ForeignKey):
+            related = getattr(instance, f.get_cache_name(), None)
+            if related is not None and related.pk is None:
+                return True
+    return False
+
+
+def can_bulk_create(model):
+    connection = connections[model.objects.db]
+    return getattr(
+        connection.features, 'can_return_ids_from_bulk_insert', False)
+
+
+class DeferredSaves(object):
+
+    """Model instances which have been generated but not yet saved.
+
+    Once flush has been called, any further instances are saved as soon as
+    they are added.
+
+    """
+
+    def __init__(self):
+        self.instances = []
+        self.unique_values = set()
+        self.flushed = False
+
+    def add(self, instance):
+        for key in unique_values(instance):
+            assume(key not in self.unique_values)
+            self.unique_values.add(key)
+        self.instances.append(instance)
+        if self.flushed:
+            self.flush()
+
+    def flush(self):
+        self.flushed = True
+        instances = self.instances
+        self.instances = []
+        try:
+            with transaction.atomic():
+                for model, group in groupby(instances, type):
+                    group = list(group)
+                    if can_bulk_create(model) and not any(
+                        has_unsaved_references(i) for i in group
+                    ):
+                        for instance in group:
+                            refresh_foreign_keys(instance)
+                        model.objects.bulk_create(group)
+                    else:
+                        # Saving one instance may give an id to an object
+                        # that a later one refers to, so refresh each just
+                        # before saving it.
+                        for instance in group:
+                            refresh_foreign_keys(instance)
+                            instance.save()
+        except IntegrityError:
+            assume(False)
+
+
+deferred_saves = DynamicVariable(None)
+
+
+@contextmanager
+def deferring_saves():
+    """Collect the instances deferred_models generates inside this context
+    rather than saving them, until save_deferred_models is called."""
+    saves = DeferredSaves()
+    with deferred_saves.with_value(saves):
+        yield saves
+
+
+def save_deferred_models():
+    """Save every instance deferred_models has generated for the current
+    example and not yet saved, in the order they were generated.
+
+    Instances generated after this has been called are saved as soon as
+    they are generated.
+
+    """
+    saves = deferred_saves.value
+    if saves is not None:
+        saves.flush()
 
 
 class ModelStrategy(MappedSearchStrategy):
 
-    def __init__(self, model, mappings):
+    def __init__(self, model, mappings, deferred=False):
         self.model = model
+        self.deferred = deferred
         super(ModelStrategy, self).__init__(
             strategy=st.fixed_dictionaries(mappings))
 
@@ -118,6 +358,12 @@ class ModelStrategy(MappedSearchStrategy):
         return 'ModelStrategy(%s)' % (self.model.__name__,)
 
     def pack(self, value):
+        check_field_constraints(self.model, value)
+        saves = deferred_saves.value if self.deferred else None
+        if saves is not None:
+            result = self.model(**value)
+            saves.add(result)
+            return result
         try:
             result, _ = self.model.objects.get_or_create(**value)
             return result
@@ -63,6 +63,10 @@ class SelfLoop(models.Model):
     me = models.ForeignKey('self', null=True)
 
 
+class MandatorySelfLoop(models.Model):
+    me = models.ForeignKey('self', null=False)
+
+
 class LoopA(models.Model):
     b = models.ForeignKey('LoopB', null=False)
 
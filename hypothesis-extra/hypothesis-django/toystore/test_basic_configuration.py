@@ -46,6 +46,27 @@ class TestConstraintsWithoutTransactions(SomeStuff, TransactionTestCase):
     pass
 
 
+class TestConstraintsWithSavepoints(SomeStuff, TestCase):
+    savepoint_per_example = True
+
+
+class TestSavepointsAreRolledBack(TestCase):
+    savepoint_per_example = True
+
+    @given(integers())
+    def test_sees_no_other_examples(self, unused):
+        self.assertEqual(Company.objects.count(), 0)
+        Company.objects.create(name='MickeyCo')
+
+    @given(integers())
+    def test_recovers_from_errors(self, unused):
+        Company.objects.create(name='MickeyCo')
+        try:
+            Company.objects.create(name='MickeyCo')
+        except IntegrityError:
+            pass
+
+
 class TestWorkflow(VanillaTestCase):
     def test_does_not_break_later_tests(self):
         def break_the_db(i):
@@ -66,3 +87,16 @@ class TestWorkflow(VanillaTestCase):
         except IntegrityError:
             pass
         t.test_normal_test_1()
+
+    def test_savepoints_do_not_leak_out_of_the_test(self):
+        class LocalTest(TestCase):
+            savepoint_per_example = True
+
+            @given(integers())
+            def test_creates_things(self, unused):
+                Company.objects.create(name='DonaldCo')
+
+        t = LocalTest('test_creates_things')
+        t.test_creates_things()
+        t.test_creates_things()
+        self.assertFalse(Company.objects.filter(name='DonaldCo').exists())
@@ -14,13 +14,17 @@
 
 # END HEADER
 
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
 from django.test import TestCase
+from toystore.models import Store, Company, Customer
+from hypothesis.database import ExampleDatabase
+from hypothesis.settings import Settings
+from hypothesis.strategies import just, lists
 from hypothesis.extra.django.models import models
-from hypothesis.extra.django.fixtures import fixture
-from hypothesis.strategies import lists, just
-
-from toystore.models import Company, Customer, Store
-
+from hypothesis.extra.django.fixtures import Fixture, FixtureRegistry, \
+    fixture
 
 a_company = fixture(
     models(Company),
@@ -84,3 +88,36 @@ class TestFinding(TestCase):
     def test_can_find_with_children(self):
         x = a_company_with_some_stores()
         assert len(x.store_set.all()) == 2
+
+
+class TestFixtureRegistry(TestCase):
+    def test_finds_templates_for_all_fixtures_on_first_use(self):
+        registry = FixtureRegistry()
+        settings = Settings(database=None)
+        x = Fixture(models(Company), settings=settings, registry=registry)
+        y = Fixture(models(Company), settings=settings, registry=registry)
+        assert x.template is None
+        assert y.template is None
+        x()
+        assert y.template is not None
+
+    def test_reuses_saved_templates_for_the_same_definitions(self):
+        database = ExampleDatabase()
+        calls = [0]
+
+        def constraint(c):
+            calls[0] += 1
+            return c.name
+
+        def define():
+            return Fixture(
+                models(Company), constraint,
+                settings=Settings(database=database),
+                registry=FixtureRegistry(),
+            )
+
+        name = define()().name
+        assert calls[0] > 0
+        calls[0] = 0
+        assert define()().name == name
+        assert calls[0] == 0
@@ -17,13 +17,17 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
-from hypothesis.errors import InvalidArgument
-from hypothesis.extra.django import TestCase, TransactionTestCase
-from hypothesis.extra.django.models import models, add_default_field_mapping
+from django.db import connections
 from hypothesis import given, assume
-from toystore.models import Company, Customer, CouldBeCharming, Store, \
-    SelfLoop, ManyInts, CustomishField, Customish
-from hypothesis.strategies import lists, just
+from toystore.models import LoopA, Store, Company, Charming, Customer, \
+    ManyInts, SelfLoop, Customish, CustomishField, CouldBeCharming, \
+    MandatorySelfLoop
+from hypothesis.errors import InvalidArgument, UnsatisfiedAssumption
+from hypothesis.strategies import just, lists
+from hypothesis.extra.django import TestCase, TransactionTestCase
+from hypothesis.extra.django.models import models, deferred_models, \
+    resolved_mappings, save_deferred_models, check_field_constraints, \
+    add_default_field_mapping
 
 add_default_field_mapping(CustomishField, just("a"))
 
@@ -73,7 +77,83 @@ class TestGetsBasicModels(TestCase):
 
     def test_mandatory_fields_are_mandatory(self):
         with self.assertRaises(InvalidArgument):
-            models(Store)
+            models(Charming)
+
+    @given(models(Store))
+    def test_generates_mandatory_foreign_keys(self, store):
+        self.assertIsNotNone(store.company.pk)
+
+    @given(models(LoopA))
+    def test_generates_foreign_keys_through_other_models(self, a):
+        self.assertIsNotNone(a.b.pk)
+        self.assertIsNone(a.b.a)
+
+    def test_cycles_of_mandatory_foreign_keys_are_an_error(self):
+        with self.assertRaises(InvalidArgument):
+            models(MandatorySelfLoop)
+
+    def test_overridden_foreign_keys_are_not_resolved(self):
+        models(MandatorySelfLoop, me=just(None))
+
+    def test_reuses_strategies_for_related_models(self):
+        models(Store)
+        mappings = resolved_mappings(Store, frozenset(), False)
+        self.assertIs(
+            mappings['company'],
+            resolved_mappings(Store, frozenset(), False)['company'],
+        )
+
+
+class TestDeferredModels(TestCase):
+    @given(deferred_models(Company))
+    def test_is_saved_when_asked(self, company):
+        self.assertIsNone(company.pk)
+        save_deferred_models()
+        self.assertEqual(Company.objects.count(), 1)
+        self.assertIsNotNone(company.pk)
+
+    @given(deferred_models(Store, company=deferred_models(Company)))
+    def test_saves_related_models_first(self, store):
+        save_deferred_models()
+        self.assertEqual(Store.objects.get().company, store.company)
+        self.assertEqual(store.company_id, store.company.pk)
+
+    @given(lists(deferred_models(Company)))
+    def test_never_generates_duplicate_unique_fields(self, companies):
+        save_deferred_models()
+        self.assertEqual(Company.objects.count(), len(companies))
+        self.assertEqual(
+            len({c.name for c in companies}), len(companies))
+
+    @given(deferred_models(Company))
+    def test_never_saves_if_not_asked(self, company):
+        self.assertEqual(Company.objects.count(), 0)
+        self.assertIsNone(company.pk)
+
+    @given(deferred_models(Company))
+    def test_does_not_patch_connections(self, company):
+        for connection in connections.all():
+            self.assertNotIn('cursor', vars(connection))
+
+    @given(deferred_models(Company))
+    def test_saves_later_instances_straight_away(self, company):
+        save_deferred_models()
+        self.assertIsNotNone(deferred_models(Company).example().pk)
+
+    def test_saves_straight_away_outside_of_tests(self):
+        self.assertIsNotNone(deferred_models(Company).example().pk)
+
+
+class TestFieldConstraints(TestCase):
+    def test_rejects_values_which_are_too_long(self):
+        with self.assertRaises(UnsatisfiedAssumption):
+            check_field_constraints(Company, {'name': 'a' * 101})
+        check_field_constraints(Company, {'name': 'a' * 100})
+
+    def test_rejects_none_for_fields_which_are_not_null(self):
+        with self.assertRaises(UnsatisfiedAssumption):
+            check_field_constraints(Company, {'name': None})
+        check_field_constraints(CouldBeCharming, {'charm': None})
 
 
 class TestsNeedingRollback(TransactionTestCase):
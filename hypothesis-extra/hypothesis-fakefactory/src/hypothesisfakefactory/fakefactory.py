@@ -17,16 +17,70 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import hashlib
+import threading
+from random import Random
+
 import faker
 import hypothesis.internal.distributions as dist
 from faker import AVAILABLE_LOCALES
-from hypothesis.internal.compat import hrange, text_type
+from hypothesis.settings import Settings
+from hypothesis.internal.compat import hrange, qualname, text_type
+from hypothesis.internal.fingerprint import strategy_fingerprint
 from hypothesis.internal.distributions import geometric
 from hypothesis.searchstrategy.strategies import SearchStrategy, \
     check_data_type
 
+_fakers = {}
+
+# Faker seeds and draws from the global random module, so seeding a Faker
+# and then generating from it has to happen under this lock if the result
+# is to depend only on the seed.
+faker_lock = threading.Lock()
+
+
+def faker_for(locale, providers):
+    """Return a Faker for locale with providers added.
+
+    Creating a Faker is expensive, so there is only one for each locale
+    and set of providers. Callers should seed it and generate from it while
+    holding faker_lock.
+
+    """
+    key = (locale, providers)
+    try:
+        return _fakers[key]
+    except KeyError:
+        factory = faker.Faker(locale=locale)
+        for p in providers:
+            factory.add_provider(p)
+        _fakers[key] = factory
+        return factory
+
+
+def provider_name(provider):
+    if not isinstance(provider, type):
+        provider = type(provider)
+    return qualname(provider)
+
+
+def fake_factory(
+    source, locale=None, locales=None, providers=(), bank_size=0,
+    settings=None,
+):
+    """Return a strategy for values produced by the fake-factory source method
+    of a Faker for one of the given locales.
 
-def fake_factory(source, locale=None, locales=None, providers=()):
+    If bank_size is positive then, rather than calling Faker for every value,
+    values are drawn from a bank of bank_size values per locale. The banks
+    are generated the first time they're needed and saved in the example
+    database, so later runs won't need to call Faker at all. The database
+    used is the one from settings if it is given, and otherwise the one from
+    the settings in effect when a bank is first needed. Banks are generated
+    from a seed derived from the source and locale, so they are the same on
+    every run even without a database.
+
+    """
     test_faker = faker.Faker()
 
     for provider in providers:
@@ -46,15 +100,23 @@ def fake_factory(source, locale=None, locales=None, providers=()):
         if l not in AVAILABLE_LOCALES:
             raise ValueError('Unsupported locale %r' % (l,))
     locales = locales or AVAILABLE_LOCALES
-    return FakeFactoryStrategy(source, providers, locales)
+    if bank_size < 0:
+        raise ValueError('Invalid bank_size %r' % (bank_size,))
+    return FakeFactoryStrategy(
+        source, providers, locales, bank_size, settings=settings)
 
 
 class FakeFactoryStrategy(SearchStrategy):
 
-    def __init__(self, source, providers, locales):
+    def __init__(
+        self, source, providers, locales, bank_size=0, settings=None,
+    ):
         self.source = source
         self.providers = tuple(providers)
         self.locales = tuple(locales)
+        self.bank_size = bank_size
+        self.settings = settings
+        self._banks = {}
 
     def draw_parameter(self, random):
         locales = dist.non_empty_subset(random, self.locales)
@@ -65,15 +127,82 @@ class FakeFactoryStrategy(SearchStrategy):
         ]
 
     def gen_example(self, random, locales):
-        factory = faker.Faker(locale=random.choice(locales))
-        factory.seed(random.getrandbits(128))
-        for p in self.providers:
-            factory.add_provider(p)
-        return text_type(getattr(factory, self.source)())
+        locale = random.choice(locales)
+        if self.bank_size:
+            return random.choice(self.bank(locale))
+        return self.fake(random, locale)
+
+    def fake(self, random, locale):
+        factory = faker_for(locale, self.providers)
+        seed = random.getrandbits(128)
+        with faker_lock:
+            factory.seed(seed)
+            return text_type(getattr(factory, self.source)())
+
+    def bank_name(self, locale):
+        return 'fakefactory:%s:%s:%s' % (
+            self.source, locale, ','.join(map(provider_name, self.providers)),
+        )
+
+    def bank_storage(self, locale, settings):
+        # The strategy's fingerprint is part of the key rather than passed as
+        # the storage's fingerprint, so that banks saved by a strategy with
+        # different providers or options are never read, rather than being
+        # migrated to the new key.
+        database = settings.database
+        if database is None:
+            return None
+        fingerprint = strategy_fingerprint(self)
+        if fingerprint is None:
+            # Without a fingerprint we can't tell our banks from those of a
+            # different strategy, so don't save them at all.
+            return None
+        return database.storage(
+            '%s:%s' % (self.bank_name(locale), fingerprint))
+
+    def bank(self, locale, settings=None):
+        try:
+            return self._banks[locale]
+        except KeyError:
+            pass
+        storage = self.bank_storage(
+            locale, settings or self.settings or Settings.default)
+        values = []
+        if storage is not None:
+            values.extend(storage.fetch(self))
+            del values[self.bank_size:]
+        random = Random(int(hashlib.sha1(
+            self.bank_name(locale).encode('utf-8')).hexdigest(), 16))
+        # Each value uses one seed from random, so skipping the seeds of the
+        # values we already have tops the bank up with the values it would
+        # have had if it had been generated in one go.
+        for _ in hrange(len(values)):
+            random.getrandbits(128)
+        while len(values) < self.bank_size:
+            value = self.fake(random, locale)
+            if storage is not None:
+                storage.save(value, self)
+            values.append(value)
+        self._banks[locale] = values
+        return values
 
     def basic_simplify(self, random, template):
+        if self.bank_size:
+            # Every value we could produce is in a bank, so we can just try
+            # the simpler ones from simplest up.
+            banked = set()
+            for values in self._banks.values():
+                banked.update(values)
+            for y in sorted(banked, key=lambda x: (len(x), x)):
+                if not self.strictly_simpler(y, template):
+                    break
+                yield y
+            return
+        # Faker is seeded from the template rather than from random, so that
+        # a template we have failed to simplify once stays simplest.
+        faker_random = Random(template)
         for _ in hrange(10):
-            y = self.gen_example(random, self.locales)
+            y = self.gen_example(faker_random, self.locales)
             if self.strictly_simpler(y, template):
                 yield y
 
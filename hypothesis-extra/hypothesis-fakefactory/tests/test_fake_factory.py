@@ -17,13 +17,20 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import threading
+from random import Random
+
 import pytest
+
 from hypothesis import given
 from faker.providers import BaseProvider
+from hypothesis.database import ExampleDatabase
+from hypothesis.settings import Settings
 from hypothesis.strategytests import strategy_test_suite
 from hypothesis.internal.debug import minimal
 from hypothesis.searchstrategy import strategy
-from hypothesis.extra.fakefactory import fake_factory
+from hypothesis.extra.fakefactory import faker_for, fake_factory
+from hypothesis.extra import fakefactory
 
 
 class KittenProvider(BaseProvider):
@@ -90,6 +97,131 @@ def test_can_get_specification_for_fake_factory():
     strategy(ff)
 
 
+def test_reuses_fakers():
+    assert faker_for('en_US', ()) is faker_for('en_US', ())
+    assert faker_for('en_US', ()) is not faker_for('fr_FR', ())
+    assert faker_for('en_US', ()) is not faker_for(
+        'en_US', (KittenProvider,))
+
+
+class CountingProvider(BaseProvider):
+    calls = 0
+
+    def counted(self):
+        CountingProvider.calls += 1
+        return 'count %d' % (self.random_number(digits=10),)
+
+
+def test_draws_from_a_saved_bank_of_values():
+    database = ExampleDatabase()
+    CountingProvider.calls = 0
+    with Settings(database=database):
+        strategy = fake_factory(
+            'counted', locale='en_US', providers=[CountingProvider],
+            bank_size=5,
+        )
+        values = {strategy.example() for _ in range(20)}
+        assert CountingProvider.calls == 5
+        assert values.issubset(strategy.bank('en_US'))
+
+        strategy = fake_factory(
+            'counted', locale='en_US', providers=[CountingProvider],
+            bank_size=5,
+        )
+        strategy.example()
+        assert CountingProvider.calls == 5
+
+
+def test_banks_are_keyed_by_strategy_fingerprint():
+    database = ExampleDatabase()
+    CountingProvider.calls = 0
+    with Settings(database=database):
+        legacy = database.storage('fakefactory:counted:en_US:CountingProvider')
+        strategy = fake_factory(
+            'counted', locale='en_US', providers=[CountingProvider],
+            bank_size=5,
+        )
+        legacy.save('stale', strategy)
+        assert 'stale' not in strategy.bank('en_US')
+        assert CountingProvider.calls == 5
+
+        strategy = fake_factory(
+            'counted', locale='en_US', providers=[CountingProvider],
+            bank_size=6,
+        )
+        strategy.bank('en_US')
+        assert CountingProvider.calls == 11
+
+
+def test_banks_are_the_same_on_every_run_without_a_database():
+    with Settings(database=None):
+        banks = [
+            fake_factory('name', locale='en_US', bank_size=5).bank('en_US')
+            for _ in range(2)
+        ]
+    assert banks[0] == banks[1]
+
+
+def test_tops_up_a_partly_saved_bank_with_the_same_values():
+    database = ExampleDatabase()
+    with Settings(database=database):
+        strategy = fake_factory('name', locale='en_US', bank_size=5)
+        bank = strategy.bank('en_US')
+        storage = strategy.bank_storage('en_US', Settings.default)
+        for value in bank[3:]:
+            storage.delete(value, strategy)
+        strategy = fake_factory('name', locale='en_US', bank_size=5)
+        assert sorted(strategy.bank('en_US')) == sorted(bank)
+
+
+def test_saves_banks_in_the_database_from_its_settings():
+    database = ExampleDatabase()
+    strategy = fake_factory(
+        'name', locale='en_US', bank_size=5,
+        settings=Settings(database=database),
+    )
+    with Settings(database=None):
+        bank = strategy.bank('en_US')
+    storage = strategy.bank_storage('en_US', Settings(database=database))
+    assert sorted(storage.fetch(strategy)) == sorted(bank)
+
+
+def test_does_not_save_banks_without_a_fingerprint(monkeypatch):
+    monkeypatch.setattr(fakefactory, 'strategy_fingerprint', lambda s: None)
+    database = ExampleDatabase()
+    strategy = fake_factory('name', locale='en_US', bank_size=5)
+    with Settings(database=database):
+        assert len(strategy.bank('en_US')) == 5
+    assert list(database.backend.keys()) == []
+
+
+def test_fakes_the_same_values_from_many_threads():
+    strategy = fake_factory('name', locale='en_US')
+    expected = [
+        strategy.fake(Random(i), 'en_US') for i in range(50)
+    ]
+    results = {}
+
+    def fake_all(thread):
+        results[thread] = [
+            strategy.fake(Random(i), 'en_US') for i in range(50)
+        ]
+
+    threads = [
+        threading.Thread(target=fake_all, args=(i,)) for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert list(results.values()) == [expected] * 4
+
+
+def test_fake_factory_errors_with_negative_bank_size():
+    with pytest.raises(ValueError):
+        fake_factory('name', bank_size=-1)
+
+
 TestFakeEmail = strategy_test_suite(
     fake_factory('email')
 )
@@ -101,3 +233,7 @@ TestFakeNames = strategy_test_suite(
 TestFakeEnglishNames = strategy_test_suite(
     fake_factory('name', locale='en_US')
 )
+
+TestFakeBankedNames = strategy_test_suite(
+    fake_factory('name', locale='en_US', bank_size=20)
+)
@@ -17,13 +17,18 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import base64
 import operator
+from collections import namedtuple
 
 import numpy as np
 import hypothesis.strategies as st
+from hypothesis.errors import BadData, InvalidArgument
 from hypothesis.searchstrategy import SearchStrategy
 from hypothesis.internal.compat import hrange, reduce, text_type, \
-    binary_type
+    binary_type, integer_types
+from hypothesis.searchstrategy.numbers import WideRangeIntStrategy, \
+    GaussianFloatStrategy
 from hypothesis.searchstrategy.strategies import check_length, \
     check_data_type
 
@@ -202,6 +207,544 @@ class ArrayStrategy(SearchStrategy):
         return result.reshape(self.shape)
 
 
+NUMERIC_KINDS = ('b', 'i', 'u', 'f', 'c')
+
+
+def element_dtype(dtype):
+    """The dtype we generate and simplify cells of an array of dtype as.
+
+    Complex arrays are treated as float arrays with two cells per element.
+
+    """
+    if dtype.kind == 'c':
+        return np.dtype('%sf%d' % (dtype.byteorder, dtype.itemsize // 2))
+    return dtype
+
+
+CellsParameter = namedtuple(
+    'CellsParameter',
+    (
+        'zero_probability', 'negative_probability', 'p', 'scale',
+        'special_probability',
+    )
+)
+
+
+def draw_cells_parameter(random):
+    """Draw a parameter for the cells of a NumericArrayStrategy, which does
+    not depend on its dtype or shape."""
+    return CellsParameter(
+        zero_probability=random.betavariate(0.5, 2.0),
+        negative_probability=random.betavariate(0.5, 0.5),
+        p=max(random.betavariate(0.2, 1.8), 1e-6),
+        scale=random.expovariate(1.0 / 1000.0),
+        special_probability=random.betavariate(0.5, 10.0),
+    )
+
+
+class NumericArrayStrategy(SearchStrategy):
+
+    """A strategy for arrays of a numeric dtype that never deals with
+    individual cells in Python unless it has to.
+
+    Templates are the raw bytes of the flattened array, so a template is a
+    single immutable, hashable object however large the array is. They are
+    drawn in bulk from a numpy RandomState seeded from the random we are
+    given, and reify is a single copy of the buffer into a new array.
+
+    """
+
+    max_blocks = 64
+
+    def __init__(self, shape, dtype):
+        SearchStrategy.__init__(self)
+        assert dtype.kind in NUMERIC_KINDS
+        self.shape = tuple(shape)
+        self.array_size = reduce(operator.mul, self.shape, 1)
+        self.dtype = dtype
+        self.dtype_name = dtype.str
+        self.cell_dtype = element_dtype(dtype)
+        self.cell_count = self.array_size * (
+            dtype.itemsize // self.cell_dtype.itemsize)
+        self.template_size = self.array_size * dtype.itemsize
+        if self.cell_dtype.kind == 'f':
+            self.scalar_strategy = GaussianFloatStrategy()
+        elif self.cell_dtype.kind in ('i', 'u'):
+            self.scalar_strategy = WideRangeIntStrategy()
+        else:
+            self.scalar_strategy = None
+
+    def __repr__(self):
+        return 'NumericArrayStrategy(shape=%r, dtype=%r)' % (
+            self.shape, self.dtype_name)
+
+    def draw_parameter(self, random):
+        return draw_cells_parameter(random)
+
+    def draw_template(self, random, parameter):
+        return self.draw_buffer(random, parameter, self.cell_count)
+
+    def draw_buffer(self, random, parameter, n):
+        """Draw a template for a flat array of n cells, whatever our own
+        shape is."""
+        rng = np.random.RandomState(random.getrandbits(32))
+        kind = self.cell_dtype.kind
+        with np.errstate(over='ignore', invalid='ignore'):
+            if kind == 'b':
+                cells = rng.random_sample(n) >= parameter.zero_probability
+            elif kind == 'f':
+                cells = rng.exponential(parameter.scale, n)
+                cells[
+                    rng.random_sample(n) < parameter.negative_probability
+                ] *= -1
+                cells = cells.astype(self.cell_dtype)
+                special = rng.random_sample(n) < parameter.special_probability
+                cells[special] = rng.choice(
+                    self.special_values(), special.sum())
+            else:
+                info = np.iinfo(self.cell_dtype)
+                magnitudes = rng.geometric(parameter.p, n) - 1
+                if kind == 'i':
+                    magnitudes[
+                        rng.random_sample(n) < parameter.negative_probability
+                    ] *= -1
+                cells = np.clip(
+                    magnitudes, info.min, info.max).astype(self.cell_dtype)
+                wide = rng.random_sample(n) < parameter.special_probability
+                cells[wide] = rng.randint(
+                    int(info.min), int(info.max) + 1, wide.sum(),
+                    dtype=self.cell_dtype,
+                )
+            cells[rng.random_sample(n) < parameter.zero_probability] = 0
+        return self.to_template(cells)
+
+    def special_values(self):
+        info = np.finfo(self.cell_dtype)
+        return np.array([
+            np.nan, np.inf, -np.inf, info.max, info.min, info.tiny,
+            info.eps,
+        ], dtype=self.cell_dtype)
+
+    def to_template(self, cells):
+        return binary_type(cells.astype(self.cell_dtype).tobytes())
+
+    def cells(self, template):
+        """A read only view of template as a flat array of cells."""
+        return np.frombuffer(template, dtype=self.cell_dtype)
+
+    def reify(self, template):
+        return np.frombuffer(
+            bytearray(template), dtype=self.dtype
+        ).reshape(self.shape)
+
+    def simplifiers(self, random, template):
+        yield self.simplify_to_zero
+        yield self.zero_blocks
+        yield self.minimize_blocks
+        yield self.round_blocks
+        # Rounding can leave many cells that are now easy to zero, which we
+        # want to do in bulk before trying cells one at a time.
+        yield self.zero_blocks
+        yield self.simplify_with_example_cloning
+        yield self.simplify_cells
+
+    def simplify_to_zero(self, random, template):
+        cells = self.cells(template)
+        if cells.any():
+            yield self.to_template(np.zeros(len(cells)))
+
+    def complexity(self, cells):
+        """A rough per cell measure of how complicated each cell is, where
+        smaller is simpler."""
+        with np.errstate(invalid='ignore'):
+            result = np.abs(cells.astype(float))
+        result[np.isnan(result)] = np.inf
+        return result
+
+    def simplify_with_example_cloning(self, random, template):
+        cells = self.cells(template)
+        if len(cells) <= 1:
+            return
+        complexity = self.complexity(cells)
+        best = cells[np.argmin(complexity)]
+        if (cells != best).any():
+            yield self.to_template(np.full(len(cells), best))
+
+        for _ in hrange(20):
+            samples = [random.randrange(len(cells)) for _ in hrange(10)]
+            pivot = min(samples, key=lambda i: complexity[i])
+            indices = np.flatnonzero(complexity > complexity[pivot])
+            if not len(indices):
+                break
+            random.shuffle(indices)
+            indices = indices[:random.randint(1, len(cells) - 1)]
+            result = cells.copy()
+            result[indices] = cells[pivot]
+            yield self.to_template(result)
+
+    def simplify_cell(self, random, value):
+        if self.scalar_strategy is None:
+            if value:
+                yield False
+            return
+        is_integer = self.cell_dtype.kind != 'f'
+        if is_integer:
+            info = np.iinfo(self.cell_dtype)
+        for simpler in self.scalar_strategy.full_simplify(random, value):
+            if is_integer and not (info.min <= simpler <= info.max):
+                continue
+            yield simpler
+
+    def simplify_cells(self, random, template):
+        cells = self.cells(template)
+        indices = np.flatnonzero(cells != 0)
+        random.shuffle(indices)
+        for i in indices:
+            for simpler in self.simplify_cell(random, cells[i].item()):
+                replacement = cells.copy()
+                replacement[i] = simpler
+                yield self.to_template(replacement)
+
+    def blocks(self, cells):
+        """Yield slices dividing cells into halves, then quarters, and so on
+        down to single cells, skipping any blocks that contain only zeroes.
+
+        We stop early at any level with more than max_blocks non-zero blocks,
+        so that the number of blocks is bounded however dense the array is.
+
+        """
+        n = len(cells)
+        nonzero = np.concatenate(([0], np.cumsum(cells != 0)))
+        size = n
+        while size > 1:
+            size = (size + 1) // 2
+            starts = np.arange(0, n, size)
+            ends = np.minimum(starts + size, n)
+            live = np.flatnonzero(nonzero[ends] > nonzero[starts])
+            if len(live) > self.max_blocks:
+                return
+            for i in live:
+                yield slice(int(starts[i]), int(ends[i]))
+
+    def zero_blocks(self, random, template):
+        cells = self.cells(template)
+        total = np.count_nonzero(cells)
+        for block in self.blocks(cells):
+            # Zeroing every non-zero cell is simplify_to_zero's job
+            if np.count_nonzero(cells[block]) == total:
+                continue
+            result = cells.copy()
+            result[block] = 0
+            yield self.to_template(result)
+
+    def minimize_blocks(self, random, template):
+        cells = self.cells(template)
+        complexity = self.complexity(cells)
+        for block in self.blocks(cells):
+            best = block.start + np.argmin(complexity[block])
+            if (cells[block] == cells[best]).all():
+                continue
+            result = cells.copy()
+            result[block] = cells[best]
+            yield self.to_template(result)
+
+    def round_blocks(self, random, template):
+        cells = self.cells(template)
+        if self.cell_dtype.kind == 'b':
+            return
+        for block in self.blocks(cells):
+            region = cells[block]
+            if self.cell_dtype.kind == 'f':
+                candidates = (np.trunc(region), np.trunc(region / 2))
+            else:
+                # Halve towards zero without leaving the integer type
+                odd_negative = (region < 0) & (region % 2 != 0)
+                candidates = (region // 2 + odd_negative,)
+            for rounded in candidates:
+                if np.array_equal(rounded, region):
+                    continue
+                result = cells.copy()
+                result[block] = rounded
+                yield self.to_template(result)
+
+    def to_basic(self, template):
+        return base64.b64encode(template).decode('ascii')
+
+    def from_basic(self, data):
+        check_data_type(text_type, data)
+        try:
+            template = binary_type(base64.b64decode(data.encode('ascii')))
+        except (TypeError, ValueError) as e:
+            raise BadData(e.args[0])
+        check_length(self.template_size, template)
+        return template
+
+
+class ArrayShapeStrategy(SearchStrategy):
+
+    """A strategy for array shapes, which are tuples of between min_dims and
+    max_dims sides each between min_side and max_side.
+
+    Templates are the shapes themselves, which simplify by dropping
+    dimensions and by halving or shrinking individual sides.
+
+    """
+
+    Parameter = namedtuple('Parameter', ('max_dims', 'max_side'))
+
+    def __init__(self, min_dims, max_dims, min_side, max_side):
+        SearchStrategy.__init__(self)
+        self.min_dims = min_dims
+        self.max_dims = max_dims
+        self.min_side = min_side
+        self.max_side = max_side
+        sides = max_side - min_side + 1
+        self.template_upper_bound = sum(
+            sides ** d for d in hrange(min_dims, max_dims + 1))
+
+    def __repr__(self):
+        return 'ArrayShapeStrategy(%d, %d, %d, %d)' % (
+            self.min_dims, self.max_dims, self.min_side, self.max_side)
+
+    def draw_parameter(self, random):
+        return self.Parameter(
+            max_dims=random.randint(self.min_dims, self.max_dims),
+            max_side=random.randint(self.min_side, self.max_side),
+        )
+
+    def draw_template(self, random, parameter):
+        return tuple(
+            random.randint(self.min_side, parameter.max_side)
+            for _ in hrange(random.randint(self.min_dims, parameter.max_dims))
+        )
+
+    def reify(self, template):
+        return template
+
+    def strictly_simpler(self, x, y):
+        return (len(x), sum(x)) < (len(y), sum(y))
+
+    def simplifiers(self, random, template):
+        yield self.drop_dimensions
+        yield self.shrink_sides
+
+    def drop_dimensions(self, random, shape):
+        if len(shape) > self.min_dims:
+            for i in hrange(len(shape)):
+                yield shape[:i] + shape[i + 1:]
+
+    def shrink_sides(self, random, shape):
+        for i, side in enumerate(shape):
+            for smaller in (self.min_side, side // 2, side - 1):
+                if self.min_side <= smaller < side:
+                    yield shape[:i] + (smaller,) + shape[i + 1:]
+
+    def to_basic(self, template):
+        return list(template)
+
+    def from_basic(self, data):
+        check_data_type(list, data)
+        if not (self.min_dims <= len(data) <= self.max_dims):
+            raise BadData('Wrong number of dimensions in %r' % (data,))
+        for side in data:
+            check_data_type(integer_types, side)
+            if not (self.min_side <= side <= self.max_side):
+                raise BadData('Side %d out of range in %r' % (side, data))
+        return tuple(data)
+
+
+def array_shapes(min_dims=1, max_dims=3, min_side=1, max_side=10):
+    """Return a strategy for array shapes (tuples of int >= 0)."""
+    if not (0 <= min_dims <= max_dims):
+        raise InvalidArgument(
+            'Invalid dimensions: min_dims=%r, max_dims=%r' % (
+                min_dims, max_dims))
+    if not (0 <= min_side <= max_side):
+        raise InvalidArgument(
+            'Invalid sides: min_side=%r, max_side=%r' % (
+                min_side, max_side))
+    return ArrayShapeStrategy(min_dims, max_dims, min_side, max_side)
+
+
+def normalize_shape(shape):
+    if isinstance(shape, integer_types):
+        shape = (shape,)
+    shape = tuple(int(side) for side in shape)
+    if any(side < 0 for side in shape):
+        raise InvalidArgument('Invalid shape %r' % (shape,))
+    return shape
+
+
+def resize(array, shape):
+    """Return an array of the given shape whose cells are taken from the
+    corresponding positions of array, or zero where array has none."""
+    result = np.zeros(shape, dtype=array.dtype)
+    if array.ndim == result.ndim:
+        corner = tuple(
+            slice(0, min(a, b)) for a, b in zip(array.shape, shape))
+        result[corner] = array[corner]
+    else:
+        n = min(array.size, result.size)
+        result.flat[:n] = array.flat[:n]
+    return result
+
+
+def convert(array, dtype):
+    if array.dtype.kind == 'c' and dtype.kind != 'c':
+        array = array.real
+    with np.errstate(all='ignore'):
+        return array.astype(dtype)
+
+
+class VariableArrayStrategy(SearchStrategy):
+
+    """A strategy for arrays whose dtype and shape are drawn from strategies.
+
+    A template is a triple of the dtype template, the shape template and the
+    raw bytes of the flattened array. The bytes are generated and simplified
+    by a NumericArrayStrategy for the dtype, of which we only ever create
+    one per dtype, and simplifying the shape or dtype resizes or converts
+    the existing bytes rather than drawing new ones.
+
+    """
+
+    Parameter = namedtuple('Parameter', ('dtype', 'shape', 'cells'))
+
+    def __init__(self, dtype_strategy, shape_strategy):
+        SearchStrategy.__init__(self)
+        self.dtype_strategy = dtype_strategy
+        self.shape_strategy = shape_strategy
+        self._buffer_strategies = {}
+
+    def __repr__(self):
+        return 'VariableArrayStrategy(%r, %r)' % (
+            self.dtype_strategy, self.shape_strategy)
+
+    def dtype_of(self, template):
+        dtype = self.dtype_strategy.reify(template[0])
+        if not isinstance(dtype, np.dtype):
+            dtype = np.dtype(dtype)
+        if dtype.kind not in NUMERIC_KINDS:
+            raise InvalidArgument(
+                'Only numeric dtypes can be drawn from a strategy, '
+                'but got %r' % (dtype,))
+        return dtype
+
+    def shape_of(self, template):
+        return normalize_shape(self.shape_strategy.reify(template[1]))
+
+    def buffer_strategy(self, dtype):
+        try:
+            return self._buffer_strategies[dtype.str]
+        except KeyError:
+            strategy = NumericArrayStrategy(shape=(0,), dtype=dtype)
+            self._buffer_strategies[dtype.str] = strategy
+            return strategy
+
+    def draw_parameter(self, random):
+        return self.Parameter(
+            dtype=self.dtype_strategy.draw_parameter(random),
+            shape=self.shape_strategy.draw_parameter(random),
+            cells=draw_cells_parameter(random),
+        )
+
+    def draw_template(self, random, parameter):
+        dtype_template = self.dtype_strategy.draw_template(
+            random, parameter.dtype)
+        shape_template = self.shape_strategy.draw_template(
+            random, parameter.shape)
+        template = (dtype_template, shape_template, None)
+        dtype = self.dtype_of(template)
+        buffer_strategy = self.buffer_strategy(dtype)
+        size = reduce(operator.mul, self.shape_of(template), 1) * (
+            dtype.itemsize // buffer_strategy.cell_dtype.itemsize)
+        return (
+            dtype_template, shape_template,
+            buffer_strategy.draw_buffer(random, parameter.cells, size),
+        )
+
+    def reify(self, template):
+        return np.frombuffer(
+            bytearray(template[2]), dtype=self.dtype_of(template)
+        ).reshape(self.shape_of(template))
+
+    def simplifiers(self, random, template):
+        dtype_template, shape_template, buffer = template
+        for simplify in self.shape_strategy.simplifiers(
+            random, shape_template
+        ):
+            yield self.shape_simplifier(simplify)
+        for simplify in self.dtype_strategy.simplifiers(
+            random, dtype_template
+        ):
+            yield self.dtype_simplifier(simplify)
+        buffer_strategy = self.buffer_strategy(self.dtype_of(template))
+        for simplify in buffer_strategy.simplifiers(random, buffer):
+            yield self.buffer_simplifier(simplify.__name__)
+
+    def shape_simplifier(self, simplify):
+        def accept(random, template):
+            dtype_template, shape_template, buffer = template
+            array = self.reify(template)
+            for simpler in simplify(random, shape_template):
+                shape = self.shape_of((dtype_template, simpler, buffer))
+                yield (
+                    dtype_template, simpler, resize(array, shape).tobytes())
+        accept.__name__ = str('shape_simplifier(%s)' % (simplify.__name__,))
+        return accept
+
+    def dtype_simplifier(self, simplify):
+        def accept(random, template):
+            dtype_template, shape_template, buffer = template
+            array = self.reify(template)
+            for simpler in simplify(random, dtype_template):
+                dtype = self.dtype_of((simpler, shape_template, buffer))
+                yield (
+                    simpler, shape_template, convert(array, dtype).tobytes())
+        accept.__name__ = str('dtype_simplifier(%s)' % (simplify.__name__,))
+        return accept
+
+    def buffer_simplifier(self, name):
+        def accept(random, template):
+            dtype_template, shape_template, buffer = template
+            simplify = getattr(
+                self.buffer_strategy(self.dtype_of(template)), name)
+            for simpler in simplify(random, buffer):
+                yield (dtype_template, shape_template, simpler)
+        accept.__name__ = str(name)
+        return accept
+
+    def to_basic(self, template):
+        dtype_template, shape_template, buffer = template
+        return [
+            self.dtype_strategy.to_basic(dtype_template),
+            self.shape_strategy.to_basic(shape_template),
+            base64.b64encode(buffer).decode('ascii'),
+        ]
+
+    def from_basic(self, data):
+        check_data_type(list, data)
+        check_length(3, data)
+        check_data_type(text_type, data[2])
+        try:
+            buffer = binary_type(base64.b64decode(data[2].encode('ascii')))
+        except (TypeError, ValueError) as e:
+            raise BadData(e.args[0])
+        template = (
+            self.dtype_strategy.from_basic(data[0]),
+            self.shape_strategy.from_basic(data[1]),
+            buffer,
+        )
+        try:
+            dtype = self.dtype_of(template)
+            shape = self.shape_of(template)
+        except (InvalidArgument, TypeError, ValueError) as e:
+            raise BadData(e.args[0])
+        check_length(
+            reduce(operator.mul, shape, 1) * dtype.itemsize, buffer)
+        return template
+
+
 def is_scalar(spec):
     return spec in (
         int, bool, text_type, binary_type, float, complex
@@ -209,9 +752,30 @@ def is_scalar(spec):
 
 
 def arrays(dtype, shape, elements=None):
+    """Return a strategy for numpy arrays of the given dtype and shape.
+
+    Either of dtype and shape may also be a strategy, in which case each
+    array has a dtype and shape drawn from it. Dtypes drawn this way must be
+    numeric unless elements is also provided.
+
+    """
+    if isinstance(dtype, SearchStrategy) or isinstance(shape, SearchStrategy):
+        if not isinstance(dtype, SearchStrategy):
+            dtype = st.just(np.dtype(dtype))
+        if not isinstance(shape, SearchStrategy):
+            shape = st.just(shape)
+        if elements is not None:
+            return st.tuples(dtype, shape).flatmap(
+                lambda ds: arrays(ds[0], ds[1], elements))
+        return VariableArrayStrategy(dtype, shape)
     if not isinstance(dtype, np.dtype):
         dtype = np.dtype(dtype)
     if elements is None:
+        if shape and dtype.kind in NUMERIC_KINDS:
+            return NumericArrayStrategy(
+                shape=(shape,) if isinstance(shape, int) else shape,
+                dtype=dtype,
+            )
         elements = from_dtype(dtype)
     if isinstance(shape, int):
         shape = (shape,)
@@ -17,17 +17,30 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
-import numpy as np
+import math
+from random import Random
+
 import pytest
+
+import numpy as np
 import hypothesis.strategies as st
 from hypothesis import find, given
-from hypothesis.extra.numpy import arrays, from_dtype
+from hypothesis.errors import InvalidArgument
+from hypothesis.extra.numpy import arrays, from_dtype, array_shapes
 from hypothesis.strategytests import strategy_test_suite
 from hypothesis.internal.compat import text_type, binary_type
 
 TestFloats = strategy_test_suite(arrays(float, ()))
 TestIntMatrix = strategy_test_suite(arrays(int, (3, 2)))
 TestBoolTensor = strategy_test_suite(arrays(bool, (2, 2, 2)))
+TestComplexVector = strategy_test_suite(arrays(complex, 4))
+TestUInt8Matrix = strategy_test_suite(arrays('uint8', (2, 3)))
+TestFloat32Tensor = strategy_test_suite(arrays('float32', (2, 1, 3)))
+TestArrayShapes = strategy_test_suite(array_shapes())
+TestVariableArrays = strategy_test_suite(arrays(
+    st.sampled_from(['int8', 'float32', complex, bool]),
+    array_shapes(max_side=4),
+))
 
 
 STANDARD_TYPES = list(map(np.dtype, [
@@ -77,6 +90,98 @@ def test_can_minimize_float_arrays():
     assert 1.0 <= x.sum() <= 1.01
 
 
+def test_numeric_arrays_use_compact_templates():
+    strategy = arrays('int16', (3, 4))
+    template = strategy.draw_and_produce(Random(0))
+    assert isinstance(template, binary_type)
+    assert len(template) == 3 * 4 * 2
+
+
+def test_reified_arrays_do_not_share_memory_with_template():
+    strategy = arrays(float, (10,))
+    template = strategy.draw_and_produce(Random(0))
+    x = strategy.reify(template)
+    x[:] = 1.0
+    y = strategy.reify(template)
+    assert x.flags.writeable
+    assert not (y == 1.0).all()
+
+
+def test_can_generate_large_arrays():
+    x = find(arrays('float64', (500, 500)), lambda t: True)
+    assert x.shape == (500, 500)
+
+
+def test_can_minimize_complex_arrays():
+    x = find(arrays(complex, 10), lambda t: (t.imag > 0).any())
+    assert x.real.sum() == 0
+    assert x.imag.sum() == 1
+
+
+@pytest.mark.parametrize('size', [10, 100, 1000, 10000, 100000])
+def test_shrinking_cost_grows_logarithmically_with_array_size(size):
+    calls = [0]
+
+    def condition(t):
+        calls[0] += 1
+        return t.any()
+
+    x = find(arrays('uint32', size), condition)
+    assert x.sum() == 1
+    assert calls[0] <= 20 * math.log(size, 2) + 100
+
+
+def test_can_minimize_large_float_arrays():
+    x = find(arrays(float, 10000), lambda t: t.sum() >= 1.0)
+    assert 1.0 <= x.sum() <= 1.01
+    assert (x != 0).sum() <= 2
+
+
+@given(arrays(st.sampled_from(['uint16', 'float64']), array_shapes()))
+def test_variable_arrays_have_drawn_shapes_and_dtypes(x):
+    assert x.dtype in (np.dtype('uint16'), np.dtype('float64'))
+    assert 1 <= x.ndim <= 3
+    assert all(1 <= side <= 10 for side in x.shape)
+
+
+def test_can_drop_dimensions_of_variable_arrays():
+    x = find(arrays('int32', array_shapes()), lambda t: t.ndim >= 2)
+    assert x.shape == (1, 1)
+    assert (x == 0).all()
+
+
+def test_can_shrink_sides_of_variable_arrays():
+    x = find(arrays(float, array_shapes()), lambda t: t.size >= 4)
+    assert x.size == 4
+
+
+def test_can_simplify_dtypes_of_variable_arrays():
+    x = find(
+        arrays(st.sampled_from(['int8', 'float64']), (2, 3)),
+        lambda t: t.dtype.kind == 'f')
+    assert x.dtype == np.dtype('float64')
+    assert x.shape == (2, 3)
+    assert (x == 0).all()
+
+
+def test_only_builds_one_buffer_strategy_per_dtype():
+    strategy = arrays(st.sampled_from(['int8', 'float64']), array_shapes())
+    find(strategy, lambda t: t.size >= 10)
+    assert len(strategy._buffer_strategies) <= 2
+
+
+def test_rejects_non_numeric_drawn_dtypes():
+    with pytest.raises(InvalidArgument):
+        arrays(st.just(np.dtype(text_type)), 3).example()
+
+
+def test_validates_array_shapes_arguments():
+    with pytest.raises(InvalidArgument):
+        array_shapes(min_dims=3, max_dims=2)
+    with pytest.raises(InvalidArgument):
+        array_shapes(min_side=-1)
+
+
 class Foo(object):
     pass
 
@@ -96,3 +201,10 @@ def test_can_create_arrays_of_tuples():
         lambda x: all(t[0] < t[1] for t in x))
     for a in arr:
         assert a in ((0, 1), (-1, 0))
+
+
+def test_can_use_elements_with_variable_shapes():
+    arr = find(
+        arrays(object, array_shapes(max_side=3), foos), lambda x: x.size > 1)
+    for x in arr.flat:
+        assert isinstance(x, Foo)
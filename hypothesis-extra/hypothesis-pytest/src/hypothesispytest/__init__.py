@@ -14,9 +14,112 @@
 
 # END HEADER
 
+import os
+import json
+import time
+
 import pytest
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup('hypothesis', 'Hypothesis')
+    group.addoption(
+        '--hypothesis-show-statistics',
+        action='store_true',
+        dest='hypothesis_show_statistics',
+        default=False,
+        help=(
+            'Print statistics about where each Hypothesis test spent its '
+            'time, and save them as JSON'
+        ),
+    )
+    group.addoption(
+        '--hypothesis-statistics-file',
+        action='store',
+        dest='hypothesis_statistics_file',
+        default=None,
+        help=(
+            'File to save statistics to when they are being shown. Defaults '
+            'to statistics.json in the Hypothesis storage directory'
+        ),
+    )
+    group.addoption(
+        '--hypothesis-shards',
+        action='store',
+        type=int,
+        dest='hypothesis_shards',
+        default=1,
+        help=(
+            'Split each Hypothesis test into this many copies, each looking '
+            'at an equal share of its examples, so that pytest-xdist can run '
+            'them on different workers'
+        ),
+    )
+    group.addoption(
+        '--hypothesis-time-budget',
+        action='store',
+        type=float,
+        dest='hypothesis_time_budget',
+        default=None,
+        help=(
+            'Choose how many examples each Hypothesis test looks at so that '
+            'together they take about this many seconds'
+        ),
+    )
+
+
+def pytest_configure(config):
+    config.hypothesis_statistics = []
+    config.hypothesis_time_budget = None
+
+
+def is_hypothesis_test(item):
+    return getattr(getattr(item, 'obj', None), 'is_hypothesis_test', False)
+
+
+def shard_item(item, index, count):
+    """A copy of the test function item, which runs shard index out of count
+    of its examples."""
+    kwargs = dict(
+        name='%s[shard-%d-of-%d]' % (item.name, index, count),
+        parent=item.parent,
+        callspec=getattr(item, 'callspec', None),
+        callobj=item.obj,
+        keywords=item.keywords,
+        fixtureinfo=item._fixtureinfo,
+        originalname=item.originalname,
+    )
+    if hasattr(type(item), 'from_parent'):
+        copy = type(item).from_parent(**kwargs)
+    else:
+        copy = type(item)(**kwargs)
+    copy.hypothesis_shard = (index, count)
+    return copy
+
+
+def pytest_collection_modifyitems(config, items):
+    shards = config.getoption('hypothesis_shards')
+    if shards > 1:
+        # Only plain test functions are split: We do not know how to copy
+        # anything else (e.g. a unittest TestCase method).
+        sharded = []
+        for item in items:
+            if type(item) is pytest.Function and is_hypothesis_test(item):
+                sharded.extend(
+                    shard_item(item, index, shards)
+                    for index in range(shards)
+                )
+            else:
+                sharded.append(item)
+        items[:] = sharded
+    seconds = config.getoption('hypothesis_time_budget')
+    if seconds is None:
+        return
+    from hypothesis.budget import TimeBudget
+    tests = sum(1 for item in items if is_hypothesis_test(item))
+    config.hypothesis_time_budget = TimeBudget(seconds, tests)
+
+
 class StoringReporter(object):
 
     def __init__(self):
@@ -29,9 +132,25 @@ class StoringReporter(object):
 @pytest.mark.hookwrapper
 def pytest_pyfunc_call(pyfuncitem):
     from hypothesis.reporting import with_reporter
+    from hypothesis.statistics import Statistics, collect_statistics
+    from hypothesis.budget import with_time_budget
+    from hypothesis.internal.sharding import with_shard
     store = StoringReporter()
-    with with_reporter(store):
-        yield
+    statistics = Statistics()
+    shard = getattr(pyfuncitem, 'hypothesis_shard', None)
+    time_budget = pyfuncitem.config.hypothesis_time_budget
+    with with_reporter(store), with_shard(shard), \
+            with_time_budget(time_budget):
+        if (
+            pyfuncitem.config.getoption('hypothesis_show_statistics') and
+            is_hypothesis_test(pyfuncitem)
+        ):
+            with collect_statistics(statistics):
+                yield
+            pyfuncitem.config.hypothesis_statistics.append(
+                (pyfuncitem.nodeid, statistics))
+        else:
+            yield
     if store.results:
         pyfuncitem.hypothesis_report_information = list(store.results)
 
@@ -47,5 +166,43 @@ def pytest_runtest_makereport(item, call, __multicall__):
     return report
 
 
+def pytest_terminal_summary(terminalreporter):
+    from hypothesis.statistics import describe_statistics
+    results = getattr(terminalreporter.config, 'hypothesis_statistics', ())
+    if not results:
+        return
+    terminalreporter.write_sep('=', 'Hypothesis Statistics')
+    for nodeid, statistics in results:
+        terminalreporter.write_line(nodeid + ':')
+        for line in describe_statistics(statistics):
+            terminalreporter.write_line('  - ' + line)
+        terminalreporter.write_line('')
+
+
+def statistics_file(config):
+    from hypothesis.settings import hypothesis_home_dir
+    return (
+        config.getoption('hypothesis_statistics_file') or
+        os.path.join(hypothesis_home_dir(), 'statistics.json')
+    )
+
+
+def pytest_unconfigure(config):
+    results = getattr(config, 'hypothesis_statistics', ())
+    if not results:
+        return
+    from hypothesis.version import __version__
+    data = {
+        'hypothesis_version': __version__,
+        'created': time.time(),
+        'tests': dict(
+            (nodeid, statistics.as_dict())
+            for nodeid, statistics in results
+        ),
+    }
+    with open(statistics_file(config), 'w') as o:
+        json.dump(data, o, indent=2, sort_keys=True)
+
+
 def load():
     pass
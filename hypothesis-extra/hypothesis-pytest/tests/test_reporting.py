@@ -17,6 +17,8 @@ from __future__ import division, print_function, absolute_import, \
 
 # END HEADER
 
+import json
+
 pytest_plugins = str('pytester')
 
 
@@ -45,3 +47,67 @@ def test_runs_reporting_hook(testdir):
     assert 'Captured stdout call' not in out
     assert 'Falsifying example' in out
     assert result.ret != 0
+
+
+def test_does_not_show_statistics_by_default(testdir):
+    script = testdir.makepyfile(TESTSUITE)
+    result = testdir.runpytest(script)
+    out = '\n'.join(result.stdout.lines)
+    assert 'Hypothesis Statistics' not in out
+
+
+def test_shows_and_saves_statistics(testdir):
+    script = testdir.makepyfile(TESTSUITE)
+    output = testdir.tmpdir.join('statistics.json')
+    result = testdir.runpytest(
+        script, '--hypothesis-show-statistics',
+        '--hypothesis-statistics-file', str(output),
+    )
+    out = '\n'.join(result.stdout.lines)
+    assert 'Hypothesis Statistics' in out
+    assert 'test_this_one_is_ok:' in out
+    assert 'examples tried' in out
+    data = json.loads(output.read())
+    assert len(data['tests']) == 3
+    for statistics in data['tests'].values():
+        assert statistics['examples_tried'] > 0
+        assert 'shrinking_time' in statistics
+
+
+SHARDED_TESTSUITE = """
+from hypothesis import given
+from hypothesis.internal.sharding import current_shard
+
+@given(int)
+def test_knows_its_shard(x):
+    index, count = current_shard()
+    assert 0 <= index < count == 3
+
+@given([int])
+def test_always_sorted(xs):
+    assert sorted(xs) == xs
+
+def test_is_not_sharded():
+    assert current_shard() is None
+"""
+
+
+def test_splits_tests_into_shards(testdir):
+    script = testdir.makepyfile(SHARDED_TESTSUITE)
+    result = testdir.runpytest(script, '--verbose', '--hypothesis-shards', '3')
+    out = '\n'.join(result.stdout.lines)
+    for index in range(3):
+        assert 'test_knows_its_shard[shard-%d-of-3] PASSED' % (index,) in out
+    assert 'test_is_not_sharded PASSED' in out
+    assert 'test_is_not_sharded[' not in out
+    assert out.count('Falsifying example: test_always_sorted') == 3
+    assert result.ret != 0
+
+
+def test_runs_tests_within_time_budget(testdir):
+    script = testdir.makepyfile(TESTSUITE)
+    for _ in range(2):
+        result = testdir.runpytest(script, '--hypothesis-time-budget', '1')
+        out = '\n'.join(result.stdout.lines)
+        assert 'Falsifying example: test_always_sorted' in out
+        assert result.ret != 0
@@ -0,0 +1,202 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Sharing out a time budget for a whole test suite between its tests.
+
+Nothing is scheduled unless a TimeBudget has been installed with
+with_time_budget, in which case each test using @given asks it how many
+examples to run, based on what it remembers about previous runs of the test.
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import time
+import binascii
+from collections import namedtuple
+
+from hypothesis.settings import Settings, all_settings
+from hypothesis.internal.sharding import shard_key
+from hypothesis.internal.reflection import function_digest, \
+    fully_qualified_name
+from hypothesis.utils.dynamicvariables import DynamicVariable
+
+# A test which has passed this many times in a row is considered stable.
+STABLE_RUNS = 3
+
+# How much more of its share of the budget a test gets if it failed last time
+# it was run, has changed since then or has never been run at all, or has been
+# stable for a while.
+FAILED_WEIGHT = 4
+CHANGED_WEIGHT = 2
+STABLE_WEIGHT = 0.5
+
+
+History = namedtuple(
+    'History', ('digest', 'micros_per_example', 'passes', 'failed'))
+
+
+def history_key(test):
+    return shard_key(fully_qualified_name(test) + ':history')
+
+
+def load_history(database, test):
+    """The History last saved for test in database, or None if there is no
+    usable one."""
+    try:
+        digest, micros_per_example, passes, failed = \
+            database.fetch_record(history_key(test))
+    except (ValueError, TypeError):
+        return None
+    return History(digest, micros_per_example, passes, failed)
+
+
+def save_history(database, test, history):
+    database.save_record(history_key(test), list(history))
+
+
+def with_max_examples(settings, max_examples):
+    """A copy of settings which considers max_examples examples, with
+    max_iterations scaled to match."""
+    values = dict(
+        (name, getattr(settings, name)) for name in all_settings
+    )
+    values['max_iterations'] = max(
+        max_examples,
+        settings.max_iterations * max_examples // max(settings.max_examples, 1)
+    )
+    values['max_examples'] = max_examples
+    return Settings(database=settings.database, **values)
+
+
+class TimeBudget(object):
+
+    """A number of seconds to be shared between a number of tests.
+
+    Each test is given an equal share of whatever is left of the budget
+    between the tests which have not run yet, weighted towards tests which
+    failed last time or have changed since, and away from ones which have
+    been passing for a while. The number of examples that fits in that share
+    is worked out from how long each example generated for the test took
+    last time (not counting shrinking or replaying a failure), and
+    the test is never given fewer than settings.min_satisfying_examples.
+
+    Tests with no history are run with their settings unchanged. So are
+    tests with no database to keep history in, but their time is still
+    taken out of the budget.
+
+    """
+
+    def __init__(self, seconds, tests):
+        self.seconds = seconds
+        self.tests = tests
+        self.spent = 0.0
+
+    def __repr__(self):
+        return 'TimeBudget(seconds=%r, tests=%r, spent=%r)' % (
+            self.seconds, self.tests, self.spent
+        )
+
+    def remaining(self):
+        return max(self.seconds - self.spent, 0.0)
+
+    def share(self):
+        """The time each test which has not run yet can expect."""
+        return self.remaining() / max(self.tests, 1)
+
+    def skip(self):
+        """Record that a test which would have had a share of the budget is
+        not being run at all."""
+        self.tests = max(self.tests - 1, 0)
+
+    def schedule(self, test, settings):
+        """Start running test, returning a ScheduledRun whose settings
+        should be used to search for a falsifying example."""
+        return ScheduledRun(self, test, settings)
+
+
+class ScheduledRun(object):
+
+    """A single run of a test under a TimeBudget."""
+
+    def __init__(self, budget, test, settings):
+        self.budget = budget
+        self.test = test
+        self.database = settings.database
+        self.digest = binascii.hexlify(function_digest(test)).decode('ascii')
+        self.history = None
+        if self.database is not None:
+            self.history = load_history(self.database, test)
+        self.settings = settings
+        if self.history is not None and self.history.micros_per_example > 0:
+            weight = self.weight()
+            max_examples = int(
+                budget.share() * weight * 1000000 /
+                self.history.micros_per_example
+            )
+            max_examples = min(
+                max_examples, int(settings.max_examples * max(weight, 1)))
+            max_examples = max(
+                max_examples, settings.min_satisfying_examples, 1)
+            self.settings = with_max_examples(settings, max_examples)
+        self.start_time = time.time()
+
+    def weight(self):
+        if self.history is None or self.history.digest != self.digest:
+            return CHANGED_WEIGHT
+        if self.history.failed:
+            return FAILED_WEIGHT
+        if self.history.passes >= STABLE_RUNS:
+            return STABLE_WEIGHT
+        return 1
+
+    def finish(self, examples, search_time, failed):
+        """Record that the run is over, having generated examples examples
+        in search_time seconds, and whether it failed. All the time since
+        the run started is taken out of the budget."""
+        elapsed = time.time() - self.start_time
+        self.budget.spent += elapsed
+        self.budget.tests = max(self.budget.tests - 1, 0)
+        if self.database is None:
+            return
+        if examples:
+            micros_per_example = int(max(search_time, 0) * 1000000 / examples)
+        elif self.history is not None:
+            micros_per_example = self.history.micros_per_example
+        else:
+            micros_per_example = 0
+        if failed:
+            passes = 0
+        elif self.history is not None and self.history.digest == self.digest:
+            passes = self.history.passes + 1
+        else:
+            passes = 1
+        save_history(self.database, self.test, History(
+            self.digest, micros_per_example, passes, bool(failed)))
+
+
+budget = DynamicVariable(None)
+
+
+def current_budget():
+    return budget.value
+
+
+def with_time_budget(time_budget):
+    """Run tests using @given inside this context manager with the number of
+    examples each of them looks at chosen to fit into time_budget."""
+    return budget.with_value(time_budget)
@@ -35,15 +35,26 @@ from hypothesis.errors import Flaky, Timeout, NoSuchExample, \
     DefinitelyNoSuchExample
 from hypothesis.control import assume  # noqa
 from hypothesis.settings import Settings, Verbosity
-from hypothesis.executors import executor
+from hypothesis.executors import executor, default_executor
 from hypothesis.reporting import report, debug_report, verbose_report, \
     current_verbosity
+from hypothesis.budget import current_budget
+from hypothesis.statistics import Statistics, CombinedStatistics, \
+    collect_statistics, current_statistics
 from hypothesis.deprecation import note_deprecation
 from hypothesis.internal.compat import qualname
+from hypothesis.internal.corpus import Corpus
 from hypothesis.internal.tracker import Tracker
+from hypothesis.internal.sharding import shard_of, shard_seeds, \
+    current_shard, split_settings, validate_shard_settings
+from hypothesis.internal.verification import IncrementalRun
+from hypothesis.internal.coroutines import run_in_loop, new_event_loop, \
+    unwrap_coroutine, is_coroutine_function
+from hypothesis.internal.evaluation import evaluator_for
 from hypothesis.internal.reflection import arg_string, copy_argspec, \
     function_digest, fully_qualified_name, \
     get_pretty_function_description
+from hypothesis.internal.fingerprint import strategy_fingerprint
 from hypothesis.internal.examplesource import ParameterSource
 from hypothesis.searchstrategy.strategies import strategy
 
@@ -57,7 +68,7 @@ def time_to_call_it_a_day(settings, start_time):
 
 def find_satisfying_template(
     search_strategy, random, condition, tracker, settings, storage=None,
-    max_parameter_tries=None,
+    max_parameter_tries=None, corpus=None, seeds=None,
 ):
     """Attempt to find a template for search_strategy such that condition is
     truthy.
@@ -76,7 +87,22 @@ def find_satisfying_template(
     this a valid test) or NoSuchExample (to indicate that this probably means
     that condition is true with very high probability).
 
+    If corpus is not None, its seeds are tried after anything in storage and
+    before generating new data, and every template that satisfies
+    assumptions without satisfying condition is offered to it.
+
+    If settings.concurrent_examples is more than one, newly generated
+    templates are checked that many at a time on a pool of threads, and the
+    first one found to satisfy condition is returned.
+
+    If seeds is not None, random is seeded from the next of them before
+    each new template is generated, and a new parameter is drawn for it, so
+    that each template depends only on its seed.
+
+    Counts and timings are recorded in current_statistics() as it goes.
+
     """
+    statistics = current_statistics()
     satisfying_examples = 0
     examples_considered = 0
     timed_out = False
@@ -95,46 +121,106 @@ def find_satisfying_template(
             examples_considered += 1
             if time_to_call_it_a_day(settings, start_time):
                 break
-            tracker.track(example)
+            statistics.count('examples_tried')
+            statistics.count('database_hits')
+            with statistics.timing('tracking'):
+                tracker.track(example)
             try:
                 if condition(example):
                     return example
                 satisfying_examples += 1
+                statistics.count('satisfying_examples')
             except UnsatisfiedAssumption:
-                pass
+                statistics.count('rejections')
             if satisfying_examples >= max_examples:
                 break
 
+    if corpus is not None:
+        for group, example in corpus.replay(search_strategy, random):
+            if examples_considered >= max_iterations:
+                break
+            if satisfying_examples >= max_examples:
+                break
+            if time_to_call_it_a_day(settings, start_time):
+                break
+            with statistics.timing('tracking'):
+                seen = tracker.track(example)
+            if seen > 1:
+                statistics.count('duplicates')
+                continue
+            examples_considered += 1
+            statistics.count('examples_tried')
+            try:
+                if condition(example):
+                    return example
+            except UnsatisfiedAssumption:
+                statistics.count('rejections')
+                continue
+            satisfying_examples += 1
+            statistics.count('satisfying_examples')
+            corpus.add(group, example)
+
     parameter_source = ParameterSource(
         random=random, strategy=search_strategy,
         max_tries=max_parameter_tries,
     )
 
-    for parameter in parameter_source:  # pragma: no branch
-        if len(tracker) >= search_strategy.template_upper_bound:
-            break
-        if examples_considered >= max_iterations:
-            break
-        if satisfying_examples >= max_examples:
-            break
-        if time_to_call_it_a_day(settings, start_time):
-            break
-        examples_considered += 1
-
-        example = search_strategy.draw_template(
-            random, parameter
-        )
-        if tracker.track(example) > 1:
-            debug_report('Skipping duplicate example')
-            parameter_source.mark_bad()
-            continue
-        try:
-            if condition(example):
-                return example
-        except UnsatisfiedAssumption:
-            parameter_source.mark_bad()
-            continue
-        satisfying_examples += 1
+    evaluator = evaluator_for(condition, settings)
+    parameters = iter(parameter_source)
+    finished = False
+    try:
+        while True:
+            if evaluator.in_flight and (finished or evaluator.full()):
+                evaluation = evaluator.next_result()
+                if not evaluation.satisfied_assumptions:
+                    statistics.count('rejections')
+                    # If the parameter has changed since this template was
+                    # drawn from it then there is nothing left to mark.
+                    if (
+                        evaluation.group ==
+                        parameter_source.parameters_drawn and
+                        not parameter_source.mark_set
+                    ):
+                        parameter_source.mark_bad()
+                    continue
+                if evaluation.result:
+                    return evaluation.template
+                satisfying_examples += 1
+                statistics.count('satisfying_examples')
+                if corpus is not None:
+                    corpus.add(evaluation.group, evaluation.template)
+                continue
+            if finished:
+                break
+            if (
+                len(tracker) >= search_strategy.template_upper_bound or
+                examples_considered >= max_iterations or
+                satisfying_examples + evaluator.in_flight >= max_examples or
+                time_to_call_it_a_day(settings, start_time)
+            ):
+                finished = True
+                continue
+            with statistics.timing('generating'):
+                if seeds is None:
+                    parameter = next(parameters)
+                else:
+                    random.seed(next(seeds))
+                    parameter = parameter_source.fresh_parameter()
+                example = search_strategy.draw_template(
+                    random, parameter
+                )
+            examples_considered += 1
+            statistics.count('examples_tried')
+            with statistics.timing('tracking'):
+                seen = tracker.track(example)
+            if seen > 1:
+                statistics.count('duplicates')
+                debug_report('Skipping duplicate example')
+                parameter_source.mark_bad()
+                continue
+            evaluator.submit(parameter_source.parameters_drawn, example)
+    finally:
+        evaluator.close()
     run_time = time.time() - start_time
     timed_out = settings.timeout >= 0 and run_time >= settings.timeout
     if (
@@ -182,6 +268,7 @@ def simplify_template_such_that(
 
     """
     assert isinstance(random, Random)
+    statistics = current_statistics()
 
     yield t
     successful_shrinks = 0
@@ -213,11 +300,14 @@ def simplify_template_such_that(
                 for s in simpler:
                     if time_to_call_it_a_day(settings, start_time):
                         return
-                    if tracker.track(s) > 1:
+                    with statistics.timing('tracking'):
+                        seen = tracker.track(s)
+                    if seen > 1:
                         continue
                     try:
                         if f(s):
                             successful_shrinks += 1
+                            statistics.count('shrinks')
                             changed = True
                             yield s
                             t = s
@@ -233,7 +323,7 @@ def simplify_template_such_that(
 
 def best_satisfying_template(
     search_strategy, random, condition, settings, storage, tracker=None,
-    max_parameter_tries=None,
+    max_parameter_tries=None, corpus_storage=None, seeds=None,
 ):
     """Find and then minimize a satisfying template.
 
@@ -241,23 +331,40 @@ def best_satisfying_template(
     one. May throw all the exceptions of find_satisfying_template. Once
     an example has been found it will be further minimized.
 
+    If corpus_storage is not None and settings.corpus_size is positive, a
+    corpus of templates which did not satisfy condition is loaded from it
+    to seed the search, and saved back to it afterwards.
+
+    seeds is passed on to find_satisfying_template.
+
     """
     if tracker is None:
         tracker = Tracker()
     start_time = time.time()
 
+    corpus = None
+    if corpus_storage is not None and settings.corpus_size > 0:
+        corpus = Corpus(settings.corpus_size, random)
+        corpus.load(corpus_storage, search_strategy)
+
     successful_shrinks = -1
     with settings:
-        satisfying_example = find_satisfying_template(
-            search_strategy, random, condition, tracker, settings, storage,
-            max_parameter_tries=max_parameter_tries,
-        )
-        for simpler in simplify_template_such_that(
-            search_strategy, random, satisfying_example, condition, tracker,
-            settings, start_time,
-        ):
-            successful_shrinks += 1
-            satisfying_example = simpler
+        try:
+            satisfying_example = find_satisfying_template(
+                search_strategy, random, condition, tracker, settings,
+                storage, max_parameter_tries=max_parameter_tries,
+                corpus=corpus, seeds=seeds,
+            )
+        finally:
+            if corpus is not None:
+                corpus.save(corpus_storage, search_strategy)
+        with current_statistics().timing('shrinking'):
+            for simpler in simplify_template_such_that(
+                search_strategy, random, satisfying_example, condition,
+                tracker, settings, start_time,
+            ):
+                successful_shrinks += 1
+                satisfying_example = simpler
         if storage is not None:
             storage.save(satisfying_example, search_strategy)
         if not successful_shrinks:
@@ -311,7 +418,9 @@ def reify_and_execute(
     print_example=False, always_print=False,
 ):
     def run():
-        args, kwargs = search_strategy.reify(template)
+        statistics = current_statistics()
+        with statistics.timing('reifying'):
+            args, kwargs = search_strategy.reify(template)
         if print_example:
             report(
                 lambda: 'Falsifying example: %s(%s)' % (
@@ -330,7 +439,14 @@ def reify_and_execute(
                     )
                 )
             )
-        return test(*args, **kwargs)
+        with statistics.timing('running'):
+            return test(*args, **kwargs)
+    # Enough information for an executor to rebuild this function somewhere
+    # else given only a copy of the template (see ForkingTestCase).
+    run.hypothesis_recipe = (
+        search_strategy, test, print_example, always_print
+    )
+    run.hypothesis_template = template
     return run
 
 
@@ -353,6 +469,8 @@ def given(*generator_arguments, **generator_kwargs):
         raise InvalidArgument(
             'Cannot both be derandomized and provide an explicit random')
 
+    validate_shard_settings(settings)
+
     if not (generator_arguments or generator_kwargs):
         raise InvalidArgument(
             'given must be called with at least one argument')
@@ -372,7 +490,7 @@ def given(*generator_arguments, **generator_kwargs):
         else:
             random = provided_random or Random()
 
-        original_argspec = inspect.getargspec(test)
+        original_argspec = inspect.getargspec(unwrap_coroutine(test))
         if original_argspec.varargs:
             raise InvalidArgument(
                 'varargs are not supported with @given'
@@ -430,6 +548,27 @@ def given(*generator_arguments, **generator_kwargs):
                 selfy = None
             test_runner = executor(selfy)
 
+            try:
+                if not is_coroutine_function(test):
+                    return run_test_with(test_runner, test, arguments, kwargs)
+                # Coroutine tests get a single event loop for all of their
+                # examples, which lasts only as long as this call.
+                loop = new_event_loop()
+                try:
+                    return run_test_with(
+                        test_runner, run_in_loop(loop, test), arguments,
+                        kwargs, loop=loop,
+                    )
+                finally:
+                    loop.close()
+            finally:
+                # Executors which batch examples together need to know when
+                # there will be no more of them.
+                close_batch = getattr(test_runner, 'close_batch', None)
+                if close_batch is not None:
+                    close_batch()
+
+        def run_test_with(test_runner, run_test, arguments, kwargs, loop=None):
             for example in getattr(
                 wrapped_test, 'hypothesis_explicit_examples', ()
             ):
@@ -445,7 +584,7 @@ def given(*generator_arguments, **generator_kwargs):
                         example_kwargs[k] = v
 
                 test_runner(
-                    lambda: test(*arguments, **example_kwargs)
+                    lambda: run_test(*arguments, **example_kwargs)
                 )
 
             if not any(
@@ -455,7 +594,7 @@ def given(*generator_arguments, **generator_kwargs):
             ):
                 # All arguments have been satisfied without needing to invoke
                 # hypothesis
-                test_runner(lambda: test(*arguments, **kwargs))
+                test_runner(lambda: run_test(*arguments, **kwargs))
                 return
 
             def convert_to_specifier(v):
@@ -472,16 +611,22 @@ def given(*generator_arguments, **generator_kwargs):
 
             search_strategy = strategy(given_specifier, settings)
 
+            fingerprint = None
             if settings.database:
+                fingerprint = strategy_fingerprint(search_strategy)
                 storage = settings.database.storage(
-                    fully_qualified_name(test))
+                    fully_qualified_name(test), fingerprint)
+                corpus_storage = settings.database.storage(
+                    fully_qualified_name(test) + ':corpus', fingerprint)
+                settings.database.prefetch([storage, corpus_storage])
             else:
                 storage = None
+                corpus_storage = None
 
             def is_template_example(xs):
                 try:
                     test_runner(reify_and_execute(
-                        search_strategy, xs, test,
+                        search_strategy, xs, run_test,
                         always_print=settings.max_shrinks <= 0
                     ))
                     return False
@@ -496,25 +641,109 @@ def given(*generator_arguments, **generator_kwargs):
             is_template_example.__name__ = test.__name__
             is_template_example.__qualname__ = qualname(test)
 
-            falsifying_template = None
+            if loop is not None:
+                # Examples of coroutine tests can be run concurrently on the
+                # loop, but only if no executor needs to wrap each of them.
+                is_template_example.event_loop = loop
+                is_template_example.start_coroutine = None
+                if test_runner is default_executor:
+                    def start_coroutine(xs):
+                        return reify_and_execute(
+                            search_strategy, xs, test,
+                            always_print=settings.max_shrinks <= 0
+                        )()
+
+                    def coroutine_failed(e):
+                        if settings.max_shrinks <= 0:
+                            raise e
+                        verbose_report(lambda: ''.join(
+                            traceback.format_exception(
+                                type(e), e, getattr(e, '__traceback__', None)
+                            )))
+                        return True
+
+                    is_template_example.start_coroutine = start_coroutine
+                    is_template_example.coroutine_failed = coroutine_failed
+
+            search_settings = settings
+            if current_shard() is not None:
+                # This is one of several copies of the test, each looking at
+                # its own share of the examples.
+                search_settings = split_settings(
+                    settings, current_shard()[1])
+            seeds = None
+            if settings.derandomize and shard_of(settings)[1] > 1:
+                seeds = shard_seeds(test, *shard_of(settings))
+
+            incremental = None
+            if settings.incremental and fingerprint is not None:
+                incremental = IncrementalRun(test, fingerprint, settings)
+                if incremental.skip:
+                    verbose_report(lambda: (
+                        'Skipping %s, which passed last time and has not '
+                        'changed since' % (test.__name__,)
+                    ))
+                    incremental.finish(passed=True, examples=0)
+                    if current_budget() is not None:
+                        current_budget().skip()
+                    return
+                search_settings = incremental.settings
+
+            time_budget = current_budget()
+            if time_budget is None:
+                scheduled = None
+            else:
+                scheduled = time_budget.schedule(test, search_settings)
+                search_settings = scheduled.settings
+
+            # Statistics for just this run, kept alongside whatever is
+            # collecting statistics for the whole session.
+            run_statistics = Statistics()
+            search_time = 0.0
+            passed = False
             try:
-                falsifying_template = best_satisfying_template(
-                    search_strategy, random, is_template_example,
-                    settings, storage
-                )
-            except NoSuchExample:
-                return
-
-            with settings:
-                test_runner(reify_and_execute(
-                    search_strategy, falsifying_template, test,
-                    print_example=True
-                ))
+                falsifying_template = None
+                search_start = time.time()
+                try:
+                    with collect_statistics(CombinedStatistics(
+                        current_statistics(), run_statistics
+                    )):
+                        falsifying_template = best_satisfying_template(
+                            search_strategy, random,
+                            is_template_example, search_settings,
+                            storage, corpus_storage=corpus_storage,
+                            seeds=seeds,
+                        )
+                except NoSuchExample:
+                    passed = True
+                    return
+                finally:
+                    search_time = time.time() - search_start
+
+                with settings:
+                    test_runner(reify_and_execute(
+                        search_strategy, falsifying_template, run_test,
+                        print_example=True
+                    ))
 
-                test_runner(reify_and_execute(
-                    search_strategy, falsifying_template, test_is_flaky(test),
-                    print_example=True
-                ))
+                    test_runner(reify_and_execute(
+                        search_strategy, falsifying_template,
+                        test_is_flaky(run_test), print_example=True
+                    ))
+            finally:
+                run_data = run_statistics.as_dict()
+                if scheduled is not None:
+                    scheduled.finish(
+                        examples=(
+                            run_data['satisfying_examples'] +
+                            run_data['rejections']
+                        ),
+                        search_time=search_time - run_data['shrinking_time'],
+                        failed=not passed,
+                    )
+                if incremental is not None:
+                    incremental.finish(
+                        passed, examples=run_data['satisfying_examples'])
 
         wrapped_test.__name__ = test.__name__
         wrapped_test.__doc__ = test.__doc__
@@ -539,7 +768,7 @@ def find(specifier, condition, settings=None, random=None, storage=None):
         storage = settings.database.storage(
             'find(%s)' % (
                 binascii.hexlify(function_digest(condition)).decode('ascii'),
-            )
+            ), strategy_fingerprint(search),
         )
 
     random = random or Random()
@@ -17,40 +17,131 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
-
-from hypothesis.searchstrategy.strategies import BadData
+from hypothesis.database.backend import SQLiteBackend, CachingBackend
 from hypothesis.database.formats import JSONFormat
-from hypothesis.database.backend import SQLiteBackend
+from hypothesis.searchstrategy.strategies import BadData, trusted_data
 
 
 class Storage(object):
 
-    """Handles saving and loading examples matching a particular specifier."""
+    """Handles saving and loading examples matching a particular specifier.
+
+    If a fingerprint (see strategy_fingerprint) is provided, values are
+    stored under a key combining it with the base key. Values read back
+    under that key were written by a strategy of identical structure, so
+    they are decoded without from_basic's defensive validation. Values
+    under the plain base key (e.g. from before fingerprints were used) or
+    under the base key with another fingerprint (e.g. from before the
+    strategy or Hypothesis changed) are still read, with full validation,
+    and are moved to the fingerprinted key if they turn out to be valid.
+    Once they have all been read, anything left under other fingerprints
+    is deleted.
+
+    If the values for this storage have been fetched in advance by
+    ExampleDatabase.prefetch, the next fetch uses them rather than asking
+    the backend again.
+
+    """
 
     def __repr__(self):
-        return 'Storage(%s)' % (self.specifier,)
+        return 'Storage(%s)' % (self.key,)
 
     def __init__(
         self, backend, key, format,
-        database
+        database, fingerprint=None,
     ):
         self.database = database
         self.backend = backend
         self.format = format
         self.key = key
+        self.fingerprint = fingerprint
+        self.prefetched = None
+        if fingerprint is None:
+            self.storage_key = key
+        else:
+            self.storage_key = '%s#%s' % (key, fingerprint)
+
+    def serialize(self, value, strategy):
+        return self.format.serialize_basic(strategy.to_basic(value))
 
     def save(self, value, strategy):
-        converted = strategy.to_basic(value)
-        serialized = self.format.serialize_basic(converted)
-        self.backend.save(self.key, serialized)
+        self.backend.save(self.storage_key, self.serialize(value, strategy))
+        self.database.saw_key(self.storage_key)
+
+    def save_many(self, values, strategy):
+        """Save all of values, in one request to the backend."""
+        self.backend.save_many([
+            (self.storage_key, self.serialize(value, strategy))
+            for value in values
+        ])
+        self.database.saw_key(self.storage_key)
+
+    def delete(self, value, strategy):
+        self.backend.delete(self.storage_key, self.serialize(value, strategy))
 
     def fetch(self, strategy):
-        for data in self.backend.fetch(self.key):
+        if self.prefetched is not None:
+            saved = self.prefetched
+            self.prefetched = None
+        else:
+            saved = self.backend.fetch(self.storage_key)
+        for data in saved:
+            try:
+                basic = self.database.deserialize(self.storage_key, data)
+                if self.fingerprint is None:
+                    template = strategy.from_basic(basic)
+                else:
+                    with trusted_data.with_value(True):
+                        template = strategy.from_basic(basic)
+            except (ValueError, TypeError, IndexError, KeyError):
+                # BadData is a ValueError. The others can only happen if
+                # data written under this fingerprint has been corrupted.
+                continue
+            yield template
+        if self.fingerprint is None:
+            return
+        for template in self.migrate(self.key, strategy):
+            yield template
+        stale = self.stale_keys()
+        for key in stale:
+            for template in self.migrate(key, strategy):
+                yield template
+        if stale:
+            self.prune()
+
+    def migrate(self, key, strategy):
+        """Yield every value saved under key which is valid for strategy,
+        moving it to this storage's key."""
+        for data in self.backend.fetch(key):
             try:
-                yield strategy.from_basic(
-                    self.format.deserialize_data(data))
+                template = strategy.from_basic(
+                    self.database.deserialize(key, data))
             except BadData:
                 continue
+            self.backend.save(self.storage_key, data)
+            self.backend.delete(key, data)
+            self.database.saw_key(self.storage_key)
+            yield template
+
+    def stale_keys(self):
+        """The keys combining this storage's base key with a fingerprint
+        other than its own."""
+        prefix = self.key + '#'
+        return [
+            k for k in self.database.keys()
+            if k.startswith(prefix) and k != self.storage_key
+        ]
+
+    def prune(self):
+        """Delete all values saved under this key with a fingerprint other
+        than this storage's, returning how many were deleted."""
+        deleted = 0
+        for key in self.stale_keys():
+            for data in self.backend.fetch(key):
+                self.backend.delete(key, data)
+                deleted += 1
+            self.database.forget_key(key)
+        return deleted
 
 
 class ExampleDatabase(object):
@@ -59,6 +150,14 @@ class ExampleDatabase(object):
 
     Maps specifiers to storage for them.
 
+    If cache_size is positive then fetches from the backend will go through
+    an in-memory CachingBackend holding up to that many keys, which also
+    keeps the deserialized data for the keys it holds.
+
+    The backend's keys are only listed once: after that, keys are added and
+    removed as this database saves and prunes values. Keys created by other
+    processes in the meantime will not be seen until the next run.
+
     """
 
     def __repr__(self):
@@ -70,9 +169,13 @@ class ExampleDatabase(object):
         self,
         backend=None,
         format=None,
+        cache_size=0,
     ):
         self.backend = backend or SQLiteBackend()
+        if cache_size > 0:
+            self.backend = CachingBackend(self.backend, max_size=cache_size)
         self.format = format or JSONFormat()
+        self.known_keys = None
         if self.format.data_type() != self.backend.data_type():
             raise ValueError((
                 'Inconsistent data types: format provides data of type %s '
@@ -80,14 +183,60 @@ class ExampleDatabase(object):
                     self.format.data_type(), self.backend.data_type()
                 )))
 
-    def storage(self, key):
+    def storage(self, key, fingerprint=None):
         """Get a storage object corresponding to this specifier."""
         return Storage(
             key=key,
             database=self,
             backend=self.backend,
             format=self.format,
+            fingerprint=fingerprint,
         )
 
+    def keys(self):
+        """The keys in the backend, listed once and then kept up to date
+        with this database's changes."""
+        if self.known_keys is None:
+            self.known_keys = set(self.backend.keys())
+        return sorted(self.known_keys)
+
+    def saw_key(self, key):
+        if self.known_keys is not None:
+            self.known_keys.add(key)
+
+    def forget_key(self, key):
+        if self.known_keys is not None:
+            self.known_keys.discard(key)
+
+    def prefetch(self, storages):
+        """Fetch the values for all of storages in one request to the
+        backend, so that their next fetch does not need to make one."""
+        fetched = self.backend.fetch_many(
+            [storage.storage_key for storage in storages])
+        for storage in storages:
+            storage.prefetched = list(fetched.get(storage.storage_key, ()))
+
+    def deserialize(self, key, data):
+        """The basic data which data, saved under key, represents. This may
+        be shared with other callers, so must not be modified."""
+        if isinstance(self.backend, CachingBackend):
+            return self.backend.decode(
+                key, data, self.format.deserialize_data)
+        return self.format.deserialize_data(data)
+
+    def fetch_record(self, key):
+        """The basic data last saved under key by save_record, or None if
+        there is none."""
+        for data in self.backend.fetch(key):
+            return self.deserialize(key, data)
+        return None
+
+    def save_record(self, key, value):
+        """Save the basic data value under key, replacing anything that was
+        saved there before."""
+        for data in list(self.backend.fetch(key)):
+            self.backend.delete(key, data)
+        self.backend.save(key, self.format.serialize_basic(value))
+
     def close(self):
         self.backend.close()
@@ -17,9 +17,14 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import io
+import os
+import hashlib
 import sqlite3
+import binascii
 from abc import abstractmethod
 from contextlib import contextmanager
+from collections import OrderedDict
 
 from hypothesis.internal.compat import text_type
 
@@ -59,6 +64,42 @@ class Backend(object):
     def fetch(self, key):
         """yield the values matching this key."""
 
+    def keys(self):
+        """Iterate over all keys in the database.
+
+        This method is optional. If it is not supported then values saved
+        under an old strategy fingerprint will not be found once the
+        fingerprint changes.
+
+        """
+        return iter(())
+
+    def save_many(self, items):
+        """Save each (key, value) pair in items.
+
+        Backends for which a round trip is expensive should override
+        this to do it in one go.
+
+        """
+        for key, value in items:
+            self.save(key, value)
+
+    def fetch_many(self, keys):
+        """Return a dict mapping each of these keys to a list of its values.
+
+        Backends for which a round trip is expensive should override
+        this to do it in one go.
+
+        """
+        return dict((key, list(self.fetch(key))) for key in keys)
+
+    def close(self):
+        """Release any resources held by this backend.
+
+        The default implementation does nothing.
+
+        """
+
 
 class SQLiteBackend(Backend):
 
@@ -149,3 +190,229 @@ class SQLiteBackend(Backend):
                 )
             """)
         self.db_created = True
+
+
+def _hash(data):
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+
+
+class DirectoryBackend(Backend):
+
+    """A backend which stores its data as files in a directory.
+
+    Each key gets its own subdirectory (named by a hash of the key) and each
+    value is stored in its own file in that subdirectory (named by a hash of
+    the value). Writes go to a temporary file which is then atomically renamed
+    into place, so readers never see partially written data and need not
+    take any locks. This makes it safe for many processes to share a single
+    directory concurrently, and because each value is a separate file the
+    directory can be cached and restored incrementally.
+
+    """
+
+    KEY_FILE = '.key'
+    TEMPORARY_PREFIX = '.tmp-'
+
+    def __init__(self, path):
+        self.path = path
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, self.path)
+
+    def data_type(self):
+        return text_type
+
+    def key_path(self, key):
+        return os.path.join(self.path, _hash(key))
+
+    def value_path(self, key, value):
+        return os.path.join(self.key_path(key), _hash(value))
+
+    def _write_atomically(self, path, data):
+        directory = os.path.dirname(path)
+        temporary = os.path.join(directory, '%s%s' % (
+            self.TEMPORARY_PREFIX,
+            binascii.hexlify(os.urandom(8)).decode('ascii'),
+        ))
+        with io.open(temporary, 'w', encoding='utf-8', newline='') as o:
+            o.write(data)
+        try:
+            os.rename(temporary, path)
+        except OSError:  # pragma: no cover
+            # On Windows rename will not replace an existing file. Because
+            # files are named by the hash of their contents whoever got there
+            # first wrote the same data as us, so we can just clean up.
+            os.unlink(temporary)
+
+    def _read(self, path):
+        try:
+            with io.open(path, 'r', encoding='utf-8', newline='') as i:
+                return i.read()
+        except (IOError, OSError):
+            return None
+
+    def save(self, key, value):
+        key_path = self.key_path(key)
+        if not os.path.exists(os.path.join(key_path, self.KEY_FILE)):
+            try:
+                os.makedirs(key_path)
+            except OSError:
+                pass
+            self._write_atomically(
+                os.path.join(key_path, self.KEY_FILE), key)
+        value_path = self.value_path(key, value)
+        if not os.path.exists(value_path):
+            self._write_atomically(value_path, value)
+
+    def delete(self, key, value):
+        try:
+            os.unlink(self.value_path(key, value))
+        except OSError:
+            pass
+
+    def fetch(self, key):
+        key_path = self.key_path(key)
+        try:
+            names = os.listdir(key_path)
+        except OSError:
+            return []
+        result = []
+        for name in sorted(names):
+            if name.startswith('.'):
+                continue
+            value = self._read(os.path.join(key_path, name))
+            if value is not None:
+                result.append(value)
+        return result
+
+    def keys(self):
+        """Iterate over all keys in the database."""
+        try:
+            names = os.listdir(self.path)
+        except OSError:
+            return
+        for name in sorted(names):
+            key = self._read(os.path.join(self.path, name, self.KEY_FILE))
+            if key is not None:
+                yield key
+
+
+class CachingBackend(Backend):
+
+    """A backend which wraps another backend and keeps an in-memory cache of
+    the values fetched from it.
+
+    Up to max_size keys are cached, with the least recently used key evicted
+    first. Writes and deletes are passed straight through to the underlying
+    backend and update any cached entry, so the cache never becomes stale
+    with respect to changes made through it (changes made by other processes
+    will not be seen until the key is evicted).
+
+    hits and misses count the number of fetches that were and were not
+    answered from the cache respectively.
+
+    The results of decoding values of a cached key with decode are kept for
+    as long as the key is, so that callers need not pay for decoding the
+    same data twice.
+
+    """
+
+    def __init__(self, backend, max_size=1024):
+        if max_size <= 0:
+            raise ValueError(
+                'Cache size must be positive but got %r' % (max_size,))
+        self.backend = backend
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self.decoded = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return '%s(%r, max_size=%d)' % (
+            self.__class__.__name__, self.backend, self.max_size
+        )
+
+    def data_type(self):
+        return self.backend.data_type()
+
+    def save(self, key, value):
+        self.backend.save(key, value)
+        values = self.cache.get(key)
+        if values is not None and value not in values:
+            values.append(value)
+
+    def delete(self, key, value):
+        self.backend.delete(key, value)
+        values = self.cache.get(key)
+        if values is not None and value in values:
+            values.remove(value)
+            self.decoded.get(key, {}).pop(value, None)
+
+    def save_many(self, items):
+        items = list(items)
+        self.backend.save_many(items)
+        for key, value in items:
+            values = self.cache.get(key)
+            if values is not None and value not in values:
+                values.append(value)
+
+    def fetch_many(self, keys):
+        result = {}
+        missing = []
+        for key in keys:
+            if key in self.cache:
+                result[key] = self.fetch(key)
+            else:
+                missing.append(key)
+        if missing:
+            fetched = self.backend.fetch_many(missing)
+            self.misses += len(missing)
+            for key in missing:
+                values = list(fetched.get(key, ()))
+                self.store(key, values)
+                result[key] = list(values)
+        return result
+
+    def store(self, key, values):
+        self.cache.pop(key, None)
+        while len(self.cache) >= self.max_size:
+            evicted, _ = self.cache.popitem(last=False)
+            self.decoded.pop(evicted, None)
+        self.cache[key] = values
+
+    def fetch(self, key):
+        try:
+            values = self.cache.pop(key)
+            self.hits += 1
+        except KeyError:
+            values = list(self.backend.fetch(key))
+            self.misses += 1
+        self.store(key, values)
+        return list(values)
+
+    def decode(self, key, value, decode):
+        """Return decode(value), where value is one of the values of key.
+
+        The result is shared between everyone decoding the same value, so
+        must not be modified.
+
+        """
+        if key not in self.cache:
+            return decode(value)
+        decoded = self.decoded.setdefault(key, {})
+        try:
+            return decoded[value]
+        except KeyError:
+            result = decode(value)
+            decoded[value] = result
+            return result
+
+    def keys(self):
+        """Iterate over all keys in the underlying database."""
+        return self.backend.keys()
+
+    def close(self):
+        self.cache.clear()
+        self.decoded.clear()
+        self.backend.close()
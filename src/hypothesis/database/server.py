@@ -0,0 +1,260 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""A small server for sharing an example database between machines.
+
+The server exposes a Backend over a TCP socket so that, for example, many CI
+workers can share one corpus of examples. Run it with:
+
+    python -m hypothesis.database.server [--host HOST] [--port PORT] DIRECTORY
+
+This stores the data in DIRECTORY using a DirectoryBackend. Tests then use a
+RemoteBackend pointing at the server.
+
+The protocol is deliberately simple: each request and each response is a
+single line of JSON. A request is an object with a "command" field (one of
+the method names in COMMANDS) and an "arguments" list. A response is an
+object with either a "result" field or an "error" field.
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+
+from hypothesis.errors import DatabaseServerError
+from hypothesis.internal.compat import PY3, hrange, text_type
+from hypothesis.database.backend import Backend, DirectoryBackend
+
+if PY3:
+    import socketserver
+else:  # pragma: no cover
+    import SocketServer as socketserver
+
+COMMANDS = frozenset((
+    'save', 'delete', 'fetch', 'keys', 'save_many', 'fetch_many',
+))
+
+DEFAULT_PORT = 8649
+
+
+def encode_message(message):
+    return (json.dumps(message) + '\n').encode('utf-8')
+
+
+def decode_message(line):
+    return json.loads(line.decode('utf-8'))
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                request = decode_message(line)
+                response = {'result': self.server.execute(
+                    request['command'], request.get('arguments', ()))}
+            except Exception as e:
+                response = {'error': '%s: %s' % (type(e).__name__, e)}
+            self.wfile.write(encode_message(response))
+            self.wfile.flush()
+
+
+class DatabaseServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+
+    """Serves a backend to RemoteBackend clients.
+
+    Each client connection is handled in its own thread. Calls into the
+    backend are serialized, but they may still come from different threads,
+    so the backend must not be tied to the thread that created it (which
+    rules out SQLiteBackend). DirectoryBackend is a good choice.
+
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, backend, host='localhost', port=DEFAULT_PORT):
+        socketserver.TCPServer.__init__(self, (host, port), RequestHandler)
+        self.backend = backend
+        self.lock = threading.Lock()
+
+    def execute(self, command, arguments):
+        if command not in COMMANDS:
+            raise ValueError('Unknown command %r' % (command,))
+        with self.lock:
+            result = getattr(self.backend, command)(*arguments)
+            if command in ('fetch', 'keys'):
+                result = list(result)
+            return result
+
+
+class RemoteBackend(Backend):
+
+    """A backend which talks to a DatabaseServer.
+
+    Up to pool_size connections to the server are kept open and reused
+    between requests. If a request fails because of a network problem it
+    will be retried once on a fresh connection. If that fails too then the
+    server is treated as down for retry_interval seconds: the request and
+    every request made in that time go to fallback instead, if one was
+    provided, and otherwise raise the error, without waiting on the server
+    again.
+
+    """
+
+    def __init__(
+        self, host='localhost', port=DEFAULT_PORT, pool_size=4, timeout=10.0,
+        fallback=None, retry_interval=60.0,
+    ):
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.fallback = fallback
+        self.retry_interval = retry_interval
+        self.down_until = None
+        self.error = None
+        self.pool = []
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return '%s(%s:%d)' % (self.__class__.__name__, self.host, self.port)
+
+    def data_type(self):
+        return text_type
+
+    def connect(self):
+        connection = socket.create_connection(
+            (self.host, self.port), self.timeout)
+        return connection, connection.makefile('rb')
+
+    def acquire(self):
+        with self.lock:
+            if self.pool:
+                return self.pool.pop()
+        return self.connect()
+
+    def release(self, connection):
+        with self.lock:
+            if len(self.pool) < self.pool_size:
+                self.pool.append(connection)
+                return
+        self.discard(connection)
+
+    def discard(self, connection):
+        sock, reader = connection
+        reader.close()
+        sock.close()
+
+    def round_trip(self, command, arguments):
+        connection = self.acquire()
+        try:
+            sock, reader = connection
+            sock.sendall(encode_message({
+                'command': command, 'arguments': arguments,
+            }))
+            line = reader.readline()
+            if not line:
+                raise socket.error('Connection closed by server')
+        except:
+            self.discard(connection)
+            raise
+        self.release(connection)
+        response = decode_message(line)
+        if 'error' in response:
+            raise DatabaseServerError(response['error'])
+        return response['result']
+
+    def is_down(self):
+        return self.down_until is not None and time.time() < self.down_until
+
+    def request(self, command, *arguments):
+        if not self.is_down():
+            for _ in hrange(2):
+                try:
+                    result = self.round_trip(command, list(arguments))
+                    self.down_until = None
+                    return result
+                except (socket.error, IOError) as e:
+                    self.error = e
+            self.down_until = time.time() + self.retry_interval
+        if self.fallback is None:
+            raise self.error
+        return getattr(self.fallback, command)(*arguments)
+
+    def save(self, key, value):
+        self.request('save', key, value)
+
+    def delete(self, key, value):
+        self.request('delete', key, value)
+
+    def fetch(self, key):
+        return list(self.request('fetch', key))
+
+    def keys(self):
+        """Iterate over all keys in the database."""
+        return iter(self.request('keys'))
+
+    def save_many(self, items):
+        self.request('save_many', [list(item) for item in items])
+
+    def fetch_many(self, keys):
+        return dict(self.request('fetch_many', list(keys)))
+
+    def close(self):
+        with self.lock:
+            pool = self.pool
+            self.pool = []
+        for connection in pool:
+            self.discard(connection)
+        if self.fallback is not None:
+            self.fallback.close()
+
+
+def main(argv=None):  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog='python -m hypothesis.database.server',
+        description='Serve a directory of Hypothesis examples over TCP.',
+    )
+    parser.add_argument('directory')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    server = DatabaseServer(
+        DirectoryBackend(args.directory), host=args.host, port=args.port)
+    print('Serving %s on %s:%d' % (
+        args.directory, args.host, server.server_address[1]))
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -142,3 +142,27 @@ class AbnormalExit(HypothesisException):
 
     """Raised when a test running in a child process exits without returning or
     raising an exception."""
+
+
+class ResourceLimitExceeded(AbnormalExit):
+
+    """Raised when a test running in a child process is stopped for using more
+    memory or CPU time than it was allowed."""
+
+
+class DeadlineExceeded(ResourceLimitExceeded):
+
+    """Raised when a test running in a child process is killed for taking
+    longer than its deadline."""
+
+
+class DatabaseServerError(HypothesisException):
+
+    """Raised when an example database server reports that it could not
+    perform a request."""
+
+
+class HypothesisWarning(HypothesisException, Warning):
+
+    """Issued when something Hypothesis was asked to do is probably not
+    having the effect that was intended."""
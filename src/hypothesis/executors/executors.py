@@ -17,6 +17,8 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import threading
+
 from hypothesis.utils.extmethod import ExtMethod
 
 executor = ExtMethod()
@@ -40,8 +42,66 @@ def setup_teardown_executor(setup, teardown):
     return execute
 
 
-@executor.extend(object)
-def attr_based_executor(runner):
+class BatchExecutor(object):
+
+    """An executor which shares one expensive setup between a batch of
+    examples.
+
+    setup_batch is called before the first example of each batch and its
+    result is passed to reset_example after every example, which should
+    cheaply undo anything the example did, and to teardown_batch once the
+    batch is over. A batch ends after batch_size examples, if that is not
+    None, or when close_batch() is called at the end of the test.
+
+    Each example is run with execute, so per example setup and teardown
+    still happen inside the batch. Examples are run one at a time even if
+    they are submitted from several threads.
+
+    """
+
+    def __init__(
+        self, setup_batch, teardown_batch, reset_example, execute,
+        batch_size=None,
+    ):
+        self.setup_batch = setup_batch or (lambda: None)
+        self.teardown_batch = teardown_batch or (lambda token: None)
+        self.reset_example = reset_example or (lambda token: None)
+        self.execute = execute
+        self.batch_size = batch_size
+        self.lock = threading.RLock()
+        self.in_batch = False
+        self.token = None
+        self.examples_in_batch = 0
+
+    def __call__(self, function):
+        with self.lock:
+            if not self.in_batch:
+                self.token = self.setup_batch()
+                self.in_batch = True
+                self.examples_in_batch = 0
+            self.examples_in_batch += 1
+            try:
+                return self.execute(function)
+            finally:
+                try:
+                    self.reset_example(self.token)
+                finally:
+                    if (
+                        self.batch_size is not None and
+                        self.examples_in_batch >= self.batch_size
+                    ):
+                        self.close_batch()
+
+    def close_batch(self):
+        with self.lock:
+            if self.in_batch:
+                self.in_batch = False
+                token = self.token
+                self.token = None
+                self.teardown_batch(token)
+
+
+def example_executor(runner):
     try:
         return runner.execute_example
     except AttributeError:
@@ -54,3 +114,20 @@ def attr_based_executor(runner):
         )
 
     return default_executor
+
+
+BATCH_HOOKS = ('setup_batch', 'teardown_batch', 'reset_example')
+
+
+@executor.extend(object)
+def attr_based_executor(runner):
+    execute = example_executor(runner)
+    if any(hasattr(runner, hook) for hook in BATCH_HOOKS):
+        return BatchExecutor(
+            getattr(runner, 'setup_batch', None),
+            getattr(runner, 'teardown_batch', None),
+            getattr(runner, 'reset_example', None),
+            execute,
+            batch_size=getattr(runner, 'example_batch_size', None),
+        )
+    return execute
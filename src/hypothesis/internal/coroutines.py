@@ -0,0 +1,68 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Support for tests which are asyncio coroutine functions."""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import inspect
+
+from hypothesis.internal.reflection import copy_argspec
+
+try:
+    import asyncio
+except ImportError:  # pragma: no cover
+    asyncio = None
+
+
+def is_coroutine_function(function):
+    return asyncio is not None and asyncio.iscoroutinefunction(function)
+
+
+def unwrap_coroutine(function):
+    """asyncio.coroutine wraps functions which are not generators in a
+    function taking *args and **kwargs. Return the original function so that
+    its real argspec can be used."""
+    if is_coroutine_function(function):
+        return getattr(function, '__wrapped__', function)
+    return function
+
+
+def new_event_loop():
+    return asyncio.new_event_loop()
+
+
+def run_in_loop(loop, function):
+    """Returns a function with the same signature as the coroutine function
+    function which runs it to completion on loop and returns its result."""
+    @copy_argspec(
+        function.__name__, inspect.getargspec(unwrap_coroutine(function)))
+    def run(*args, **kwargs):
+        return loop.run_until_complete(function(*args, **kwargs))
+    return run
+
+
+def gather(loop, coroutines):
+    """Run coroutines concurrently on loop. Returns a list with, for each
+    coroutine in order, either its result or the exception it raised."""
+    # gather's loop argument is deprecated, but it takes the loop from the
+    # tasks it is given, so we put them on loop ourselves.
+    tasks = [loop.create_task(coroutine) for coroutine in coroutines]
+    if not tasks:
+        return []
+    return loop.run_until_complete(asyncio.gather(
+        *tasks, return_exceptions=True))
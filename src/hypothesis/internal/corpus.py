@@ -0,0 +1,107 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Retention of passing examples between runs of a test."""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from itertools import islice
+from collections import OrderedDict
+
+from hypothesis.internal.tracker import object_to_tracking_key
+
+
+class Corpus(object):
+
+    """A bounded collection of templates that passed a test, used to seed
+    future runs of it.
+
+    Templates are added together with a group, which is normally the
+    parameter they were drawn from. When the corpus is full a new template
+    only gets in if its group is smaller than the largest group, and then
+    pushes out a random member of the largest group. This keeps the corpus
+    spread out over as many different parameters as possible rather than
+    filling up with near copies of whatever was drawn first.
+
+    """
+
+    def __init__(self, max_size, random):
+        self.max_size = max_size
+        self.random = random
+        self.groups = OrderedDict()
+        self.tracking_keys = set()
+        self.size = 0
+        self.seeds = []
+        self.replayed = set()
+
+    def __len__(self):
+        return self.size
+
+    def templates(self):
+        for members in self.groups.values():
+            for template in members:
+                yield template
+
+    def add(self, group, template):
+        """Add template to the corpus as a member of group, returning whether
+        it was actually kept."""
+        key = object_to_tracking_key(template)
+        if key in self.tracking_keys:
+            return False
+        members = self.groups.get(group, [])
+        if self.size >= self.max_size:
+            largest_group, largest = max(
+                self.groups.items(), key=lambda item: len(item[1]))
+            if len(largest) <= len(members) + 1:
+                return False
+            evicted = largest.pop(self.random.randrange(len(largest)))
+            self.tracking_keys.discard(object_to_tracking_key(evicted))
+            self.size -= 1
+        self.groups[group] = members
+        members.append(template)
+        self.tracking_keys.add(key)
+        self.size += 1
+        return True
+
+    def replay(self, strategy, random):
+        """Yield (group, template) pairs to try before generating any new
+        data: first the seeds loaded from a previous run, then a simplified
+        variant of each seed from every simplification pass."""
+        for i, seed in enumerate(self.seeds):
+            self.replayed.add(object_to_tracking_key(seed))
+            yield ('seed', i), seed
+        for i, seed in enumerate(self.seeds):
+            for simplify in strategy.simplifiers(random, seed):
+                for mutant in islice(simplify(random, seed), 1):
+                    yield ('seed', i), mutant
+
+    def load(self, storage, strategy):
+        self.seeds = list(storage.fetch(strategy))
+
+    def save(self, storage, strategy):
+        """Write the current contents to storage, removing any seeds that
+        were tried but did not make it back into the corpus.
+
+        Seeds that were never tried (e.g. because the test failed
+        first) are left alone.
+
+        """
+        for seed in self.seeds:
+            key = object_to_tracking_key(seed)
+            if key in self.replayed and key not in self.tracking_keys:
+                storage.delete(seed, strategy)
+        storage.save_many(list(self.templates()), strategy)
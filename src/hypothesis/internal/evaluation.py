@@ -0,0 +1,222 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Evaluating a condition on many templates, possibly at once."""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
+from hypothesis.errors import UnsatisfiedAssumption
+from hypothesis.reporting import with_reporter, current_reporter
+from hypothesis.statistics import collect_statistics, current_statistics
+from hypothesis.internal.compat import PY3
+from hypothesis.internal.coroutines import gather
+
+if PY3:
+    from queue import Queue
+else:  # pragma: no cover
+    from Queue import Queue
+
+
+class Evaluation(object):
+
+    """The outcome of evaluating a condition on a template.
+
+    group is whatever was passed in when the template was submitted.
+    satisfied_assumptions is False if the condition raised
+    UnsatisfiedAssumption, and otherwise result is the value it returned.
+
+    """
+
+    def __init__(self, group, template, satisfied_assumptions, result=None):
+        self.group = group
+        self.template = template
+        self.satisfied_assumptions = satisfied_assumptions
+        self.result = result
+
+
+class SequentialEvaluator(object):
+
+    """Evaluates each template as soon as it is submitted, in the calling
+    thread."""
+
+    size = 1
+
+    def __init__(self, condition):
+        self.condition = condition
+        self.results = deque()
+
+    @property
+    def in_flight(self):
+        return len(self.results)
+
+    def full(self):
+        return self.in_flight >= self.size
+
+    def submit(self, group, template):
+        try:
+            result = Evaluation(
+                group, template, True, self.condition(template))
+        except UnsatisfiedAssumption:
+            result = Evaluation(group, template, False)
+        self.results.append(result)
+
+    def next_result(self):
+        return self.results.popleft()
+
+    def close(self):
+        pass
+
+
+class ConcurrentEvaluator(object):
+
+    """Evaluates up to size templates at once on a pool of threads.
+
+    This is only worth it when the condition spends most of its time waiting
+    on something outside the interpreter, and the condition must be safe to
+    call from several threads at once.
+
+    Results come back in the order in which they finish, not the order in
+    which they were submitted. If the condition raises anything other than
+    UnsatisfiedAssumption (including BaseExceptions such as
+    KeyboardInterrupt), it is re-raised from next_result. close() waits
+    for everything still in flight, so that nothing is left running once the
+    caller moves on.
+
+    """
+
+    def __init__(self, condition, settings, size):
+        self.condition = condition
+        self.settings = settings
+        self.size = size
+        self.in_flight = 0
+        self.results = Queue()
+        self.reporter = current_reporter()
+        self.statistics = current_statistics()
+        self.pool = ThreadPool(size)
+
+    def full(self):
+        return self.in_flight >= self.size
+
+    def evaluate(self, group, template):
+        # Settings, the reporter and statistics are thread local, so the
+        # worker threads need to be told about the ones the caller is using.
+        with self.settings:
+            with with_reporter(self.reporter):
+                with collect_statistics(self.statistics):
+                    try:
+                        return Evaluation(
+                            group, template, True, self.condition(template))
+                    except UnsatisfiedAssumption:
+                        return Evaluation(group, template, False)
+                    except BaseException as e:
+                        # Anything that escaped here would kill the worker
+                        # thread without ever putting a result on the queue,
+                        # leaving next_result waiting forever.
+                        return e
+
+    def submit(self, group, template):
+        self.in_flight += 1
+        self.pool.apply_async(
+            self.evaluate, (group, template), callback=self.results.put)
+
+    def next_result(self):
+        result = self.results.get()
+        self.in_flight -= 1
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+
+class GatheringEvaluator(object):
+
+    """Evaluates templates for a coroutine test in batches of up to size,
+    running the coroutines for each batch concurrently on a single event
+    loop.
+
+    The condition must have a start_coroutine attribute, which does the
+    synchronous part of checking a template and returns a coroutine for the
+    rest, and a coroutine_failed attribute, which is called with any
+    exception other than UnsatisfiedAssumption that a coroutine raises and
+    returns the result of the condition. Results come back in the order
+    their templates were submitted.
+
+    """
+
+    def __init__(self, condition, size):
+        self.condition = condition
+        self.size = size
+        self.pending = []
+        self.results = deque()
+
+    @property
+    def in_flight(self):
+        return len(self.pending) + len(self.results)
+
+    def full(self):
+        return self.in_flight >= self.size
+
+    def submit(self, group, template):
+        try:
+            coroutine = self.condition.start_coroutine(template)
+        except UnsatisfiedAssumption:
+            self.results.append(Evaluation(group, template, False))
+        except Exception as e:
+            self.results.append(Evaluation(
+                group, template, True, self.condition.coroutine_failed(e)))
+        else:
+            self.pending.append((group, template, coroutine))
+
+    def next_result(self):
+        if not self.results:
+            pending = self.pending
+            self.pending = []
+            outcomes = gather(
+                self.condition.event_loop, [c for _, _, c in pending])
+            for (group, template, _), outcome in zip(pending, outcomes):
+                if isinstance(outcome, UnsatisfiedAssumption):
+                    self.results.append(Evaluation(group, template, False))
+                elif isinstance(outcome, Exception):
+                    self.results.append(Evaluation(
+                        group, template, True,
+                        self.condition.coroutine_failed(outcome)))
+                else:
+                    self.results.append(Evaluation(group, template, True))
+        return self.results.popleft()
+
+    def close(self):
+        for _, _, coroutine in self.pending:
+            coroutine.close()
+        self.pending = []
+
+
+def evaluator_for(condition, settings):
+    if settings.concurrent_examples > 1 and not settings.derandomize:
+        if getattr(condition, 'start_coroutine', None) is not None:
+            return GatheringEvaluator(condition, settings.concurrent_examples)
+        # Coroutine tests which cannot be gathered share an event loop, so
+        # must not be run from several threads.
+        if not hasattr(condition, 'start_coroutine'):
+            return ConcurrentEvaluator(
+                condition, settings, settings.concurrent_examples)
+    return SequentialEvaluator(condition)
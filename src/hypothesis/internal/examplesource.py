@@ -39,6 +39,7 @@ class ParameterSource(object):
         self.max_tries = max_tries or 10
         self.random = random
         self.strategy = strategy
+        self.parameters_drawn = 0
         self.new_parameter()
         self.started = False
         self.mark_set = False
@@ -59,11 +60,19 @@ class ParameterSource(object):
         self.mark_set = True
 
     def new_parameter(self):
+        self.parameters_drawn += 1
         self.count = 0
         self.should_switch = False
         self.current_parameter = self.strategy.draw_parameter(self.random)
         return self.current_parameter
 
+    def fresh_parameter(self):
+        """Draw a new parameter value, regardless of how well the current one
+        has done."""
+        self.started = True
+        self.mark_set = False
+        return self.new_parameter()
+
     def pick_a_parameter(self):
         """Draw a parameter value, either picking one we've already generated
         or generating a new one.
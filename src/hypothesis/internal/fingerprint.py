@@ -0,0 +1,97 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Stable structural fingerprints for search strategies."""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import types
+import hashlib
+
+from hypothesis.version import __version__
+from hypothesis.settings import Settings
+from hypothesis.internal.compat import qualname, text_type, binary_type, \
+    integer_types
+from hypothesis.internal.reflection import get_pretty_function_description
+from hypothesis.searchstrategy.strategies import SearchStrategy
+
+ATOMIC_TYPES = (bool, float, text_type, binary_type, type(None)) + \
+    integer_types
+
+FUNCTION_TYPES = (
+    types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+)
+
+
+class Unfingerprintable(Exception):
+    pass
+
+
+def describe(value, seen):
+    if isinstance(value, SearchStrategy):
+        if id(value) in seen:
+            return ['cycle', seen[id(value)]]
+        seen[id(value)] = len(seen)
+        attributes = []
+        for name, attribute in sorted(vars(value).items()):
+            if name.startswith('_') or name == 'template_upper_bound':
+                continue
+            if isinstance(attribute, Settings):
+                continue
+            attributes.append([name, describe(attribute, seen)])
+        return ['strategy', describe(type(value), seen), attributes]
+    if isinstance(value, type):
+        return ['type', value.__module__, qualname(value)]
+    if isinstance(value, FUNCTION_TYPES):
+        return ['function', get_pretty_function_description(value)]
+    if isinstance(value, ATOMIC_TYPES):
+        return [type(value).__name__, repr(value)]
+    if isinstance(value, (list, tuple)):
+        return [type(value).__name__] + [describe(v, seen) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return [type(value).__name__] + sorted(
+            repr(describe(v, seen)) for v in value)
+    if isinstance(value, dict):
+        return [type(value).__name__] + sorted(
+            repr([describe(k, seen), describe(v, seen)])
+            for k, v in value.items())
+    if type(value).__repr__ is not object.__repr__:
+        return ['object', describe(type(value), seen), repr(value)]
+    # Two such objects cannot be told apart, so neither can strategies built
+    # from them.
+    raise Unfingerprintable()
+
+
+def strategy_fingerprint(strategy):
+    """Return a short text string identifying the structure of strategy.
+
+    Two strategies with the same fingerprint are built from the same types
+    of strategy with the same bounds, options and children (including the
+    source of any functions they were given) under the same version of
+    Hypothesis, and so can read each other's serialized templates without
+    validation. Changing any of these changes the fingerprint.
+
+    Returns None if strategy was built from an object which has no repr of
+    its own, as we cannot tell whether it has changed.
+
+    """
+    try:
+        description = repr(
+            ['hypothesis', __version__, describe(strategy, {})])
+    except Unfingerprintable:
+        return None
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()[:16]
@@ -0,0 +1,123 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Splitting the search for a falsifying example into several shards, which
+can be run at the same time (e.g. as copies of a test given to different
+pytest-xdist workers)."""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import warnings
+import itertools
+
+from hypothesis.errors import InvalidArgument, HypothesisWarning
+from hypothesis.settings import Settings, Verbosity, all_settings
+from hypothesis.internal.reflection import function_digest
+from hypothesis.utils.dynamicvariables import DynamicVariable
+
+SPLIT_SETTINGS = (
+    'max_examples', 'max_iterations', 'min_satisfying_examples',
+)
+
+shard = DynamicVariable(None)
+
+
+def current_shard():
+    """The (index, count) of the copy of a test that is running, if the test
+    has been split into count copies, or None if it has not."""
+    return shard.value
+
+
+def with_shard(index_and_count):
+    """Run tests using @given inside this context manager as copy index out
+    of count copies, which share the examples of each test between them.
+    None runs them as they are."""
+    return shard.with_value(index_and_count)
+
+
+def shard_key(key):
+    """key, made specific to the copy of the test that is running, for
+    records which each copy keeps for itself."""
+    if current_shard() is None:
+        return key
+    return '%s:shard-%d-of-%d' % ((key,) + current_shard())
+
+
+def shard_of(settings):
+    """The (index, count) of the shard of a test's examples to look at: The
+    shard given by settings.shard_index and settings.shard_count, split
+    further if this is one of several copies of the test."""
+    index, count = settings.shard_index, settings.shard_count
+    if current_shard() is not None:
+        copy_index, copies = current_shard()
+        index, count = index * copies + copy_index, count * copies
+    return index, count
+
+
+def shard_seeds(test, index, count):
+    """The seeds for each example looked at by shard index out of count of
+    the search for test.
+
+    There is one sequence of seeds for each test, and the shard takes every
+    count'th of them, starting from the index'th. The shards are therefore
+    disjoint: No seed is used by more than one of them, and together they
+    use the seeds at the start of the sequence with no gaps.
+
+    """
+    digest = function_digest(test)
+    for i in itertools.count(index, count):
+        yield digest + ('%d' % (i,)).encode('ascii')
+
+
+# Only warn once per session about shards without derandomize, rather than
+# for every test.
+warned_about_random_shards = False
+
+
+def validate_shard_settings(settings):
+    global warned_about_random_shards
+    if settings.shard_count < 1:
+        raise InvalidArgument(
+            'shard_count=%r must be at least 1' % (settings.shard_count,))
+    if not (0 <= settings.shard_index < settings.shard_count):
+        raise InvalidArgument(
+            'shard_index=%r must be between 0 and shard_count=%r' % (
+                settings.shard_index, settings.shard_count))
+    if settings.shard_count > 1 and not settings.derandomize:
+        warning = HypothesisWarning((
+            'shard_count=%r has no effect unless derandomize is True. '
+            'Randomized runs on each shard already draw their examples '
+            'independently.') % (settings.shard_count,))
+        if settings.strict:
+            raise warning
+        elif (
+            settings.verbosity > Verbosity.quiet and
+            not warned_about_random_shards
+        ):
+            warned_about_random_shards = True
+            warnings.warn(warning, stacklevel=3)
+
+
+def split_settings(settings, count):
+    """A copy of settings for one out of count shards, which should each
+    look at an equal share of the examples."""
+    values = dict(
+        (name, getattr(settings, name)) for name in all_settings
+    )
+    for name in SPLIT_SETTINGS:
+        values[name] = -(-values[name] // count)
+    return Settings(database=settings.database, **values)
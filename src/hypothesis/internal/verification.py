@@ -0,0 +1,109 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Remembering which tests have passed, so that they need not be run in full
+again until something they depend on changes."""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import binascii
+from collections import namedtuple
+
+from hypothesis.budget import with_max_examples
+from hypothesis.internal.sharding import shard_key
+from hypothesis.internal.reflection import function_digest, \
+    fully_qualified_name
+
+Verification = namedtuple('Verification', (
+    'digest', 'fingerprint', 'dependency_hash', 'examples', 'passed',
+    'runs_since_full',
+))
+
+
+def verification_key(test):
+    return shard_key(fully_qualified_name(test) + ':verified')
+
+
+def load_verification(database, test):
+    """The Verification last saved for test in database, or None if there is
+    no usable one."""
+    try:
+        return Verification(*database.fetch_record(verification_key(test)))
+    except (ValueError, TypeError):
+        return None
+
+
+def save_verification(database, test, verification):
+    database.save_record(verification_key(test), list(verification))
+
+
+class IncrementalRun(object):
+
+    """A run of test in incremental mode.
+
+    If the test last passed a full run which actually ran at least
+    settings.max_examples examples, and neither it, its strategy (given by
+    fingerprint) nor settings.dependency_hash have changed since, then it
+    is only run with settings.incremental_examples examples, or skipped
+    entirely if that is zero. Once settings.full_run_interval runs in a row
+    have been cut short like this, the next one is a full run regardless.
+
+    """
+
+    def __init__(self, test, fingerprint, settings):
+        self.test = test
+        self.database = settings.database
+        self.digest = binascii.hexlify(function_digest(test)).decode('ascii')
+        self.fingerprint = fingerprint
+        self.dependency_hash = settings.dependency_hash or ''
+        self.previous = load_verification(self.database, test)
+        self.full = not (
+            self.unchanged() and
+            self.previous.passed and
+            self.previous.examples >= settings.max_examples and
+            self.previous.runs_since_full < settings.full_run_interval
+        )
+        self.skip = not self.full and settings.incremental_examples <= 0
+        if self.full or self.skip:
+            self.settings = settings
+        else:
+            self.settings = with_max_examples(settings, max(
+                settings.incremental_examples,
+                settings.min_satisfying_examples,
+            ))
+
+    def unchanged(self):
+        return self.previous is not None and (
+            self.previous.digest,
+            self.previous.fingerprint,
+            self.previous.dependency_hash,
+        ) == (self.digest, self.fingerprint, self.dependency_hash)
+
+    def finish(self, passed, examples):
+        """Record whether the run passed, having run examples examples which
+        satisfied the test's assumptions. Only full runs record how many
+        examples they ran, so that a run cut short (e.g. by a timeout or a
+        TimeBudget) does not count as a full verification of the test."""
+        if self.full:
+            runs_since_full = 0
+        else:
+            examples = self.previous.examples
+            runs_since_full = self.previous.runs_since_full + 1
+        save_verification(self.database, self.test, Verification(
+            self.digest, self.fingerprint, self.dependency_hash, examples,
+            bool(passed), runs_since_full,
+        ))
@@ -273,8 +273,7 @@ class BasicSearchStrategy(SearchStrategy):
         template = Generated(data[0], data[1])
         simplifications = data[2]
         check_data_type(list, simplifications)
-        while simplifications:
-            step = simplifications.pop()
+        for step in reversed(simplifications):
             check_data_type(list, step)
             check_length(2, step)
             seed, iteration = step
@@ -29,6 +29,7 @@ from hypothesis.internal.compat import hrange, integer_types
 from hypothesis.utils.extmethod import ExtMethod
 from hypothesis.internal.chooser import chooser
 from hypothesis.utils.conventions import not_set
+from hypothesis.utils.dynamicvariables import DynamicVariable
 
 
 class StrategyExtMethod(ExtMethod):
@@ -77,11 +78,22 @@ def check_type(typ, value, e=WrongFormat):
         ))
 
 
+#: While this is True, check_data_type and check_length do nothing. This is
+#: set when reading data which is known to have been written by a strategy
+#: with the same structure, so that from_basic can skip the defensive
+#: validation it would otherwise need.
+trusted_data = DynamicVariable(False)
+
+
 def check_data_type(typ, value):
+    if trusted_data.value:
+        return
     check_type(typ, value, BadData)
 
 
 def check_length(l, value, e=BadData):
+    if trusted_data.value:
+        return
     try:
         actual = len(value)
     except TypeError:
@@ -280,6 +292,9 @@ class SearchStrategy(object):
         is however required that to_basic(from_basic(data)) == data (if this
         does not raise an exception).
 
+        data must not be modified: the example database may pass the same
+        data to from_basic more than once.
+
         """
         raise NotImplementedError(  # pragma: no cover
             '%s.from_basic()' % (self.__class__.__name__))
@@ -65,6 +65,21 @@ def storage_directory(name):
     mkdir_p(path)
     return path
 
+
+def integer_from_environment(name, default):
+    """The integer value of the environment variable name, or default if it
+    is not set."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise InvalidArgument(
+            'Invalid value %r for environment variable %s: Expected an '
+            'integer' % (value, name))
+
+
 all_settings = {}
 
 
@@ -234,9 +249,13 @@ class Settings(object):
         if self._database is not_set and self.database_file is not None:
             from hypothesis.database import ExampleDatabase
             from hypothesis.database.backend import SQLiteBackend
-            self._database = databases.get(self.database_file) or (
-                ExampleDatabase(backend=SQLiteBackend(self.database_file)))
-            databases[self.database_file] = self._database
+            key = (self.database_file, self.database_cache_size)
+            self._database = databases.get(key) or (
+                ExampleDatabase(
+                    backend=SQLiteBackend(self.database_file),
+                    cache_size=self.database_cache_size,
+                ))
+            databases[key] = self._database
         return self._database
 
     def __enter__(self):
@@ -344,6 +363,113 @@ in which case no storage will be used.
 """
 )
 
+Settings.define_setting(
+    'database_cache_size',
+    default=0,
+    description="""
+If this is positive then the database loaded from database_file will keep an
+in-memory cache of up to this many keys in front of the file, so that
+repeatedly fetching the examples for the same test does not go back to disk.
+This only applies to the database created from database_file: To cache an
+explicitly provided database, pass cache_size when creating the
+ExampleDatabase.
+"""
+)
+
+Settings.define_setting(
+    'corpus_size',
+    default=0,
+    description="""
+If this is positive then up to this many examples which passed a test are
+kept in the database, chosen to come from as many different parts of the
+search space as possible. Future runs of the test will try these (and
+simplified variants of them) before generating any new data. This requires a
+database to be set.
+"""
+)
+
+Settings.define_setting(
+    'concurrent_examples',
+    default=1,
+    description="""
+If this is more than one then up to this many newly generated examples will be
+run at once, each on its own thread. This can make tests which spend most of
+their time waiting on I/O much faster, but the test (and any setup and teardown
+for it) must be safe to run from several threads at once. Shrinking is
+unaffected and always runs one example at a time. This is ignored when
+derandomize is True.
+
+If the test is a coroutine function then examples are instead run in batches
+of this size on its event loop using asyncio.gather, without any threads. This
+only happens if the test does not customise how its examples are executed
+(e.g. with setup_example).
+"""
+)
+
+Settings.define_setting(
+    'shard_count',
+    default=lambda: integer_from_environment('HYPOTHESIS_SHARD_COUNT', 1),
+    description="""
+The number of shards the examples for each test are split between, e.g. one
+per node running your test suite in CI. This only has an effect when
+derandomize is True: Each example is then generated from its own seed, taken
+from one sequence of seeds for the test, and the shard given by shard_index
+takes every shard_count'th seed of it. The shards therefore never share a seed,
+while each of them still runs the same examples every time. Defaults to the
+value of the environment variable HYPOTHESIS_SHARD_COUNT if it is set.
+"""
+)
+
+Settings.define_setting(
+    'shard_index',
+    default=lambda: integer_from_environment('HYPOTHESIS_SHARD_INDEX', 0),
+    description="""
+Which of the shard_count shards this is, counting from zero. Defaults to the
+value of the environment variable HYPOTHESIS_SHARD_INDEX if it is set.
+"""
+)
+
+Settings.define_setting(
+    'incremental',
+    default=os.getenv('HYPOTHESIS_INCREMENTAL') == 'true',
+    description="""
+If set to True, tests using @given remember in the database whether they
+passed. A test which passed its last full run, and whose source, strategies and
+dependency_hash have not changed since, is then only run with
+incremental_examples examples, until full_run_interval runs in a row have been
+cut short like this. This requires a database to be set.
+"""
+)
+
+Settings.define_setting(
+    'incremental_examples',
+    default=0,
+    description="""
+The number of examples to run for an unchanged test which passed last time when
+incremental is True. If this is zero such tests are skipped entirely.
+"""
+)
+
+Settings.define_setting(
+    'full_run_interval',
+    default=10,
+    description="""
+When incremental is True, the number of runs in a row of an unchanged test
+which may be skipped or cut short before it is run in full again.
+"""
+)
+
+Settings.define_setting(
+    'dependency_hash',
+    default=lambda: os.getenv('HYPOTHESIS_DEPENDENCY_HASH'),
+    description="""
+Any string describing the code a test depends on, e.g. a hash of the source of
+the module under test. When incremental is True, a test is always run in full
+if this has changed since it last passed. Defaults to the value of the
+environment variable HYPOTHESIS_DEPENDENCY_HASH if it is set.
+"""
+)
+
 
 @total_ordering
 class Verbosity(object):
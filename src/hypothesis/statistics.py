@@ -0,0 +1,173 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Statistics about where Hypothesis spends its time.
+
+Nothing is collected unless a Statistics object has been installed with
+collect_statistics, in which case the core fills it in as it goes.
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import time
+import threading
+
+from hypothesis.utils.dynamicvariables import DynamicVariable
+
+COUNTERS = (
+    'examples_tried', 'duplicates', 'rejections', 'satisfying_examples',
+    'database_hits', 'shrinks',
+)
+
+TIMINGS = (
+    'generating', 'reifying', 'running', 'tracking', 'shrinking',
+)
+
+
+class Timer(object):
+
+    def __init__(self, statistics, name):
+        self.statistics = statistics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.time()
+
+    def __exit__(self, *args):
+        self.statistics.add_time(self.name, time.time() - self.start)
+
+
+class NoTimer(object):
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *args):
+        pass
+
+
+no_timer = NoTimer()
+
+
+class Statistics(object):
+
+    """Counts and timings for one or more runs of Hypothesis.
+
+    Examples may be run on several threads at once (see
+    Settings.concurrent_examples), so all updates go through a lock.
+    Timings are in seconds and may overlap: Time spent shrinking includes
+    the time spent reifying and running the test for each shrink.
+
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = dict((name, 0) for name in COUNTERS)
+        self.times = dict((name, 0.0) for name in TIMINGS)
+
+    def __repr__(self):
+        return 'Statistics(%s)' % (', '.join(
+            '%s=%r' % item for item in sorted(self.as_dict().items())
+        ),)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counts[name] += amount
+
+    def add_time(self, name, seconds):
+        with self.lock:
+            self.times[name] += seconds
+
+    def timing(self, name):
+        """A context manager adding the time spent inside it to name."""
+        return Timer(self, name)
+
+    def as_dict(self):
+        """A JSON serializable dict of all the statistics, with timings
+        given under their name plus a _time suffix."""
+        with self.lock:
+            result = dict(self.counts)
+            for name, seconds in self.times.items():
+                result[name + '_time'] = seconds
+        return result
+
+
+class NoStatistics(object):
+
+    """Stands in for Statistics when nothing is collecting them."""
+
+    def count(self, name, amount=1):
+        pass
+
+    def add_time(self, name, seconds):
+        pass
+
+    def timing(self, name):
+        return no_timer
+
+
+no_statistics = NoStatistics()
+
+
+class CombinedStatistics(object):
+
+    """Passes everything recorded on to each of several statistics objects,
+    e.g. to keep separate counts for one test while still contributing to
+    the statistics for a whole run."""
+
+    def __init__(self, *targets):
+        self.targets = targets
+
+    def count(self, name, amount=1):
+        for target in self.targets:
+            target.count(name, amount)
+
+    def add_time(self, name, seconds):
+        for target in self.targets:
+            target.add_time(name, seconds)
+
+    def timing(self, name):
+        return Timer(self, name)
+
+
+collector = DynamicVariable(no_statistics)
+
+
+def current_statistics():
+    return collector.value
+
+
+def collect_statistics(statistics):
+    return collector.with_value(statistics)
+
+
+def describe_statistics(statistics):
+    """A short human readable summary of statistics, as a list of lines."""
+    data = statistics.as_dict()
+    return [
+        '%d examples tried (%d duplicates, %d rejected by assumptions, '
+        '%d from the database)' % (
+            data['examples_tried'], data['duplicates'], data['rejections'],
+            data['database_hits'],
+        ),
+        '%d successful shrinks' % (data['shrinks'],),
+        ' '.join((
+            'Time spent: %.2fs generating, %.2fs reifying, %.2fs running the',
+            'test, %.2fs tracking, %.2fs shrinking',
+        )) % tuple(data[name + '_time'] for name in TIMINGS),
+    ]
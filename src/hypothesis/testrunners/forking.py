@@ -18,7 +18,10 @@ from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
 import os
+import time
 import pickle
+import signal
+import threading
 import traceback
 from unittest import TestCase
 from collections import namedtuple
@@ -37,6 +40,11 @@ except AttributeError:  # pragma: no cover
 
 Report = namedtuple('Report', ('data',))
 Error = namedtuple('Error', ('exception',))
+Done = namedtuple('Done', ())
+
+# How long a fork server child is given to exit once its input is closed
+# before it is killed.
+CLOSE_GRACE_PERIOD = 1.0
 
 
 def report_to(w):  # pragma: no cover
@@ -45,6 +53,229 @@ def report_to(w):  # pragma: no cover
     return writer
 
 
+def serve_examples(recipe, r, w, batch_size):  # pragma: no cover
+    """Main loop for a fork server child: Read pickled templates from r and
+    run them, writing the results to w, until r is closed or batch_size
+    examples have been run."""
+    from hypothesis.core import reify_and_execute
+    search_strategy, test, print_example, always_print = recipe
+    examples_run = 0
+    while batch_size is None or examples_run < batch_size:
+        try:
+            template = pickle.load(r)
+        except EOFError:
+            break
+        examples_run += 1
+        try:
+            with with_reporter(report_to(w)):
+                reify_and_execute(
+                    search_strategy, template, test,
+                    print_example=print_example, always_print=always_print,
+                )()
+            pickle.dump(Done(), w)
+        except BaseException as e:
+            try:
+                pickle.dump(Error(e), w)
+            except:
+                traceback.print_exc()
+                os._exit(1)
+        w.flush()
+    os._exit(0)
+
+
+def fork_and_run(function, started=None):
+    """Call function in a forked child, passing anything it reports back to
+    the current reporter.
+
+    started, if provided, is called with the pid of the child as soon as it
+    has been forked. Returns a pair (pid, error) once the child has finished
+    running function, where error is the exception function raised or None.
+    It is the caller's responsibility to wait for the child.
+
+    """
+    r, w = os.pipe()
+    r = os.fdopen(r, 'rb')
+    w = os.fdopen(w, 'wb')
+    pid = os.fork()
+    if not pid:  # pragma: no cover
+        succeeded = False
+        try:
+            r.close()
+            with with_reporter(report_to(w)):
+                function()
+                succeeded = True
+            w.close()
+        except BaseException as e:
+            try:
+                pickle.dump(Error(e), w)
+                w.close()
+            except:
+                traceback.print_exc()
+        finally:
+            if succeeded:
+                os._exit(0)
+            else:
+                os._exit(1)
+    w.close()
+    if started is not None:
+        started(pid)
+    error = None
+    try:
+        while True:
+            message = pickle.load(r)
+            if isinstance(message, Report):
+                current_reporter()(message.data)
+            else:
+                assert isinstance(message, Error)
+                error = message.exception
+                break
+    except EOFError:
+        pass
+    finally:
+        r.close()
+    return pid, error
+
+
+class Worker(object):
+
+    """A child process forked to run examples from one recipe."""
+
+    def __init__(self, recipe, batch_size, siblings):
+        to_child_r, to_child_w = os.pipe()
+        from_child_r, from_child_w = os.pipe()
+        self.pid = os.fork()
+        if not self.pid:  # pragma: no cover
+            os.close(to_child_w)
+            os.close(from_child_r)
+            for sibling in siblings:
+                os.close(sibling.input.fileno())
+                os.close(sibling.output.fileno())
+            serve_examples(
+                recipe, os.fdopen(to_child_r, 'rb'),
+                os.fdopen(from_child_w, 'wb'), batch_size,
+            )
+        os.close(to_child_r)
+        os.close(from_child_w)
+        self.input = os.fdopen(to_child_w, 'wb')
+        self.output = os.fdopen(from_child_r, 'rb')
+        self.batch_size = batch_size
+        self.examples_run = 0
+        self.alive = True
+
+    def execute(self, data):
+        """Run the pickled template data in the child, returning the
+        exception it raised (or None), or raising AbnormalExit if the child
+        died."""
+        self.examples_run += 1
+        if (
+            self.batch_size is not None and
+            self.examples_run >= self.batch_size
+        ):
+            self.alive = False
+        try:
+            self.input.write(data)
+            self.input.flush()
+            while True:
+                message = pickle.load(self.output)
+                if isinstance(message, Report):
+                    current_reporter()(message.data)
+                elif isinstance(message, Error):
+                    return message.exception
+                else:
+                    assert isinstance(message, Done)
+                    return None
+        except (EOFError, IOError, OSError):
+            self.alive = False
+            raise AbnormalExit()
+
+    def close(self, grace_period=CLOSE_GRACE_PERIOD):
+        """Close the child's input, which tells it to exit, and wait for it
+        to do so, killing it if it has not within grace_period seconds."""
+        self.alive = False
+        for f in (self.input, self.output):
+            try:
+                f.close()
+            except (IOError, OSError):
+                pass
+        deadline = time.time() + grace_period
+        while time.time() < deadline:
+            pid, _ = os.waitpid(self.pid, os.WNOHANG)
+            if pid:
+                return
+            time.sleep(0.01)
+        try:
+            os.kill(self.pid, signal.SIGKILL)
+        except OSError:  # pragma: no cover
+            pass
+        os.waitpid(self.pid, 0)
+
+
+class ForkServer(object):
+
+    """Keeps size children forked and ready to run examples built from a
+    single recipe, replacing them when they die or have run batch_size
+    examples.
+
+    Each example is handed to a child which is not currently running one,
+    waiting for one to become free if necessary, so several children are
+    only busy at once when examples are executed from several threads (see
+    Settings.concurrent_examples).
+
+    """
+
+    def __init__(self, recipe, size, batch_size):
+        self.recipe = recipe
+        self.size = max(1, size)
+        self.batch_size = batch_size
+        self.workers = []
+        self.idle = []
+        self.condition = threading.Condition()
+
+    def accepts(self, recipe):
+        return all(a is b for a, b in zip(recipe, self.recipe))
+
+    def fill(self):
+        while len(self.workers) < self.size:
+            worker = Worker(
+                self.recipe, self.batch_size, list(self.workers))
+            self.workers.append(worker)
+            self.idle.append(worker)
+
+    def acquire(self):
+        with self.condition:
+            self.fill()
+            while not self.idle:
+                self.condition.wait()
+            return self.idle.pop()
+
+    def release(self, worker):
+        with self.condition:
+            if worker.alive:
+                self.idle.append(worker)
+            else:
+                self.workers.remove(worker)
+                worker.close()
+                self.fill()
+            self.condition.notify()
+
+    def execute(self, data):
+        worker = self.acquire()
+        try:
+            error = worker.execute(data)
+        finally:
+            self.release(worker)
+        if error is not None:
+            raise error
+
+    def close(self):
+        with self.condition:
+            workers = self.workers
+            self.workers = []
+            self.idle = []
+        for worker in workers:
+            worker.close()
+
+
 class ForkingTestCase(TestCase):
 
     """ForkingTestcase lets you write tests such that Hypothesis will run each
@@ -57,49 +288,61 @@ class ForkingTestCase(TestCase):
     Note that this will not work correctly with coverage. This might be fixable
     but it's not currently obvious how.
 
+    By default every example gets a freshly forked child. If fork_server is
+    set to True, examples generated by @given are instead sent to a pool of
+    fork_server_size children which are forked once and then run examples
+    in a loop, and are only replaced when they crash or exit abnormally.
+    Each child runs one example at a time, so more than one of them is only
+    useful when examples are run concurrently. If
+    fork_server_batch_size is not None, each child is also retired after
+    running that many examples, bounding how much state can leak between
+    examples. Examples which cannot be sent to a child (e.g. because their
+    template cannot be pickled) are run in a fresh child as usual.
+
     """
 
+    fork_server = False
+    fork_server_size = 2
+    fork_server_batch_size = None
+    _fork_server = None
+
     def execute_example(self, function):
-        r, w = os.pipe()
-        r = os.fdopen(r, 'rb')
-        w = os.fdopen(w, 'wb')
-        pid = os.fork()
-        if not pid:  # pragma: no cover
-            succeeded = False
-            try:
-                r.close()
-                with with_reporter(report_to(w)):
-                    function()
-                    succeeded = True
-            except BaseException as e:
+        if self.fork_server:
+            recipe = getattr(function, 'hypothesis_recipe', None)
+            if recipe is not None:
                 try:
-                    pickle.dump(Error(e), w)
-                    w.close()
-                except:
-                    traceback.print_exc()
-            finally:
-                if succeeded:
-                    os._exit(0)
-                else:
-                    os._exit(1)
-        w.close()
-        error = None
-        try:
-            while True:
-                message = pickle.load(r)
-                if isinstance(message, Report):
-                    current_reporter()(message.data)
+                    data = pickle.dumps(function.hypothesis_template)
+                except Exception:
+                    pass
                 else:
-                    assert isinstance(message, Error)
-                    error = message.exception
-                    break
-        except EOFError:
-            pass
-        finally:
-            r.close()
+                    return self.fork_server_for(recipe).execute(data)
+        return self.execute_in_fresh_child(function)
+
+    def fork_server_for(self, recipe):
+        server = self._fork_server
+        if server is not None and not server.accepts(recipe):
+            server.close()
+            server = None
+        if server is None:
+            server = ForkServer(
+                recipe, self.fork_server_size, self.fork_server_batch_size)
+            self._fork_server = server
+        return server
 
+    def shutdown_fork_server(self):
+        server = self._fork_server
+        if server is not None:
+            self._fork_server = None
+            server.close()
+
+    def tearDown(self):
+        self.shutdown_fork_server()
+        super(ForkingTestCase, self).tearDown()
+
+    def execute_in_fresh_child(self, function):
+        pid, error = fork_and_run(function)
+        _, exitstatus = os.waitpid(pid, 0)
         if error is not None:
             raise error
-        _, exitstatus = os.waitpid(pid, 0)
         if exitstatus:
             raise AbnormalExit()
@@ -0,0 +1,189 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import os
+import sys
+import time
+import signal
+import resource
+import threading
+from collections import namedtuple
+
+from hypothesis.errors import AbnormalExit, InvalidArgument, \
+    DeadlineExceeded, ResourceLimitExceeded
+from hypothesis.reporting import verbose_report
+from hypothesis.testrunners.forking import ForkingTestCase, fork_and_run
+
+ResourceUsage = namedtuple(
+    'ResourceUsage', ('wall_time', 'cpu_time', 'peak_memory'))
+
+
+def peak_memory_from_rusage(rusage):
+    # ru_maxrss is in bytes on OSX but kilobytes everywhere else.
+    if sys.platform == 'darwin':  # pragma: no cover
+        return rusage.ru_maxrss
+    return rusage.ru_maxrss * 1024
+
+
+def current_memory():
+    """Return the address space and resident set sizes of this process in
+    bytes, or None if they cannot be found (i.e. not on Linux)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            size, resident = statm.read().split()[:2]
+    except (IOError, OSError):  # pragma: no cover
+        return None
+    page_size = resource.getpagesize()
+    return int(size) * page_size, int(resident) * page_size
+
+
+class IsolatedTestCase(ForkingTestCase):
+
+    """IsolatedTestCase runs each example in a fresh subprocess, as
+    ForkingTestCase does, but can also limit the resources each example
+    is allowed to use:
+
+    * memory_limit caps how far the address space of the child may grow
+      beyond its size when it was forked, in bytes. An example which runs
+      out of memory fails with ResourceLimitExceeded. Where the size at fork
+      cannot be found (anywhere but Linux) the limit is on the whole address
+      space, including everything inherited from the parent.
+    * cpu_time_limit caps the CPU time of the child, in seconds. An example
+      which uses more than that is killed and fails with
+      ResourceLimitExceeded.
+    * deadline caps the wall clock time of the child, in seconds. An example
+      which takes longer than that is killed and fails with
+      DeadlineExceeded.
+
+    Because these are ordinary test failures, Hypothesis will shrink the
+    example that caused them like any other.
+
+    The wall time, CPU time and peak memory use of each example are
+    recorded in resource_usage as ResourceUsage tuples and shown in verbose
+    output. Peak memory is the child's peak resident set size less the
+    parent's when the child was forked, as the child starts out sharing
+    all of the parent's memory. Where the parent's size cannot be found it
+    includes that shared memory.
+
+    Limits only make sense for a child that runs a single example, so
+    setting fork_server is an error.
+
+    """
+
+    memory_limit = None
+    cpu_time_limit = None
+    deadline = None
+
+    def __init__(self, *args, **kwargs):
+        super(IsolatedTestCase, self).__init__(*args, **kwargs)
+        self.resource_usage = []
+
+    def apply_limits(self):  # pragma: no cover
+        if self.memory_limit is not None:
+            memory = current_memory()
+            limit = self.memory_limit
+            if memory is not None:
+                limit += memory[0]
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        if self.cpu_time_limit is not None:
+            limit = max(1, int(self.cpu_time_limit + 0.5))
+            resource.setrlimit(resource.RLIMIT_CPU, (limit, limit + 1))
+
+    def limited(self, function):
+        def run():  # pragma: no cover
+            self.apply_limits()
+            try:
+                return function()
+            except MemoryError:
+                raise ResourceLimitExceeded(
+                    'Example exceeded the memory limit of %d bytes' % (
+                        self.memory_limit,))
+        return run
+
+    def execute_example(self, function):
+        if self.fork_server:
+            raise InvalidArgument(
+                'IsolatedTestCase runs each example in its own child, so it '
+                'cannot use a fork server')
+        deadline_hit = []
+        timers = []
+        # Once the child has finished running the example it may be reaped
+        # at any moment, after which its pid could belong to some other
+        # process. The timer therefore only kills it while holding this lock
+        # and before finished is set, which happens before reaping.
+        lock = threading.Lock()
+        finished = []
+
+        def started(pid):
+            if self.deadline is not None:
+                def kill():
+                    with lock:
+                        if finished:
+                            return
+                        deadline_hit.append(True)
+                        os.kill(pid, signal.SIGKILL)
+                timer = threading.Timer(self.deadline, kill)
+                timer.daemon = True
+                timer.start()
+                timers.append(timer)
+
+        memory = current_memory()
+        start = time.time()
+        pid, error = fork_and_run(self.limited(function), started)
+        with lock:
+            finished.append(True)
+            for timer in timers:
+                timer.cancel()
+        _, exitstatus, rusage = os.wait4(pid, 0)
+        usage = ResourceUsage(
+            wall_time=time.time() - start,
+            cpu_time=rusage.ru_utime + rusage.ru_stime,
+            peak_memory=max(0, peak_memory_from_rusage(rusage) - (
+                memory[1] if memory is not None else 0)),
+        )
+        self.resource_usage.append(usage)
+        verbose_report(lambda: (
+            'Example took %.3fs (%.3fs CPU) and peaked at %d bytes'
+        ) % usage)
+
+        if deadline_hit:
+            raise DeadlineExceeded(
+                'Example took longer than the deadline of %.3fs' % (
+                    self.deadline,))
+        if error is not None:
+            raise error
+        if self.exceeded_cpu_time_limit(exitstatus, usage):
+            raise ResourceLimitExceeded(
+                'Example exceeded the CPU time limit of %.3fs' % (
+                    self.cpu_time_limit,))
+        if exitstatus:
+            raise AbnormalExit()
+
+    def exceeded_cpu_time_limit(self, exitstatus, usage):
+        """Was the child killed for using too much CPU time? It gets SIGXCPU
+        at the soft limit and SIGKILL at the hard one, but a SIGKILL could
+        also have come from elsewhere (e.g. the OOM killer), so only counts
+        if the child had actually used up its CPU time."""
+        if self.cpu_time_limit is None or not os.WIFSIGNALED(exitstatus):
+            return False
+        signum = os.WTERMSIG(exitstatus)
+        return signum == signal.SIGXCPU or (
+            signum == signal.SIGKILL and
+            usage.cpu_time >= self.cpu_time_limit
+        )
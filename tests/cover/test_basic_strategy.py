@@ -189,3 +189,16 @@ def test_can_recalculate_shrinks_without_reify_cache():
         assert not (~strat.reify(template) & strat.reify(shrunk_template))
     new_template = strat.from_basic(strat.to_basic(template))
     assert strat.reify(template) == strat.reify(new_template)
+
+
+def test_from_basic_does_not_modify_its_data():
+    random = Random('test_from_basic_does_not_modify_its_data')
+    strat = basic(Bitfields)
+    template = some_template(strat, random)
+    for shrunk_template in strat.full_simplify(random, template):
+        data = strat.to_basic(shrunk_template)
+        copy = strat.to_basic(shrunk_template)
+        new_template = strat.from_basic(data)
+        assert data == copy
+        assert strat.to_basic(new_template) == data
+        assert strat.reify(new_template) == strat.reify(shrunk_template)
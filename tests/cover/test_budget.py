@@ -0,0 +1,218 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import binascii
+import threading
+
+import pytest
+
+from hypothesis import given
+from hypothesis.budget import STABLE_RUNS, History, TimeBudget, \
+    history_key, load_history, save_history, current_budget, \
+    with_time_budget
+from hypothesis.database import ExampleDatabase
+from hypothesis.settings import Settings
+from hypothesis.statistics import Statistics, collect_statistics
+from hypothesis.strategies import integers
+from hypothesis.internal.reflection import function_digest
+
+
+def digest_of(test):
+    return binascii.hexlify(function_digest(test)).decode('ascii')
+
+
+def saved_history(database, name):
+    """The History saved by the @given test called name."""
+    for key in database.backend.keys():
+        if key.endswith('.%s:history' % (name,)):
+            data, = database.backend.fetch(key)
+            return History(*database.format.deserialize_data(data))
+
+
+def test_no_budget_by_default():
+    assert current_budget() is None
+
+
+def test_shares_what_is_left_between_remaining_tests():
+    budget = TimeBudget(10, 4)
+    assert budget.share() == 2.5
+    budget.spent = 6
+    budget.tests = 2
+    assert budget.share() == 2
+    budget.spent = 12
+    assert budget.share() == 0
+
+
+def test_history_round_trips():
+    database = ExampleDatabase()
+
+    def test(x):
+        pass
+
+    assert load_history(database, test) is None
+    history = History(digest_of(test), 250, 2, False)
+    save_history(database, test, history)
+    save_history(database, test, history)
+    assert load_history(database, test) == history
+    assert len(list(database.backend.fetch(history_key(test)))) == 1
+
+
+def test_ignores_bad_history():
+    database = ExampleDatabase()
+
+    def test(x):
+        pass
+
+    database.backend.save(history_key(test), '[1, 2]')
+    assert load_history(database, test) is None
+
+
+def test_runs_unchanged_without_history():
+    def test(x):
+        pass
+
+    settings = Settings(database=ExampleDatabase(), max_examples=123)
+    run = TimeBudget(1, 1).schedule(test, settings)
+    assert run.settings is settings
+
+
+def run_with_history(test, history, **kwargs):
+    database = ExampleDatabase()
+    save_history(database, test, history)
+    settings = Settings(database=database, **kwargs)
+    return TimeBudget(1, 1).schedule(test, settings)
+
+
+def test_fits_examples_into_share():
+    def test(x):
+        pass
+
+    run = run_with_history(
+        test, History(digest_of(test), 10000, 1, False), max_examples=1000)
+    assert run.settings.max_examples == 100
+
+
+def test_never_goes_below_min_satisfying_examples():
+    def test(x):
+        pass
+
+    run = run_with_history(
+        test, History(digest_of(test), 10 ** 9, 1, False),
+        min_satisfying_examples=7)
+    assert run.settings.max_examples == 7
+    assert run.settings.max_iterations >= 7
+
+
+def test_does_not_exceed_max_examples_for_stable_tests():
+    def test(x):
+        pass
+
+    run = run_with_history(
+        test, History(digest_of(test), 1, STABLE_RUNS, False),
+        max_examples=50)
+    assert run.settings.max_examples == 50
+
+
+@pytest.mark.parametrize(('failed', 'passes', 'changed', 'examples'), [
+    (True, 0, False, 400),
+    (False, 0, True, 200),
+    (False, 1, False, 100),
+    (False, STABLE_RUNS, False, 50),
+])
+def test_weights_by_history(failed, passes, changed, examples):
+    def test(x):
+        pass
+
+    digest = 'changed' if changed else digest_of(test)
+    run = run_with_history(
+        test, History(digest, 10000, passes, failed), max_examples=1000)
+    assert run.settings.max_examples == examples
+
+
+def test_records_history_of_given_tests():
+    database = ExampleDatabase()
+    budget = TimeBudget(60, 2)
+
+    @given(integers(), settings=Settings(database=database))
+    def test_passes(x):
+        pass
+
+    @given(integers(), settings=Settings(database=database))
+    def test_fails(x):
+        assert x < 10
+
+    with with_time_budget(budget):
+        test_passes()
+        with pytest.raises(AssertionError):
+            test_fails()
+
+    assert budget.tests == 0
+    assert budget.spent > 0
+    passed = saved_history(database, 'test_passes')
+    assert not passed.failed
+    assert passed.passes == 1
+    assert passed.micros_per_example > 0
+    failed = saved_history(database, 'test_fails')
+    assert failed.failed
+    assert failed.passes == 0
+
+
+def test_counts_consecutive_passes():
+    database = ExampleDatabase()
+
+    @given(integers(), settings=Settings(database=database))
+    def test_passes(x):
+        pass
+
+    for _ in range(3):
+        with with_time_budget(TimeBudget(60, 1)):
+            test_passes()
+    assert saved_history(database, 'test_passes').passes == 3
+
+
+def test_records_cost_per_generated_example():
+    database = ExampleDatabase()
+
+    def test(x):
+        pass
+
+    budget = TimeBudget(60, 1)
+    run = budget.schedule(test, Settings(database=database))
+    run.finish(examples=100, search_time=1.0, failed=False)
+    assert load_history(database, test).micros_per_example == 10000
+    assert budget.tests == 0
+
+
+def test_counts_concurrent_examples():
+    database = ExampleDatabase()
+    lock = threading.Lock()
+    calls = [0]
+
+    @given(integers(), settings=Settings(
+        database=database, concurrent_examples=4, max_examples=100))
+    def test_ints(x):
+        with lock:
+            calls[0] += 1
+
+    statistics = Statistics()
+    with collect_statistics(statistics):
+        with with_time_budget(TimeBudget(60, 1)):
+            test_ints()
+    data = statistics.as_dict()
+    assert data['satisfying_examples'] + data['rejections'] == calls[0]
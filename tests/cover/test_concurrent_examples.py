@@ -0,0 +1,115 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import time
+import threading
+
+import pytest
+
+from hypothesis import Settings, find, given, assume
+from hypothesis.errors import Unsatisfiable
+from hypothesis.strategies import lists, integers
+from hypothesis.internal.evaluation import ConcurrentEvaluator, \
+    SequentialEvaluator, evaluator_for
+
+concurrent = Settings(
+    concurrent_examples=4, max_examples=50, database=None, timeout=-1)
+
+
+def test_runs_examples_concurrently():
+    lock = threading.Lock()
+    running = [0]
+    most_running = [0]
+
+    @given(integers(), settings=concurrent)
+    def test_waits(x):
+        with lock:
+            running[0] += 1
+            most_running[0] = max(most_running[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    test_waits()
+    assert 1 < most_running[0] <= 4
+
+
+class Interrupt(BaseException):
+    pass
+
+
+def test_reraises_base_exceptions_from_worker_threads():
+    @given(integers(), settings=concurrent)
+    def test_interrupted(x):
+        raise Interrupt()
+
+    with pytest.raises(Interrupt):
+        test_interrupted()
+
+
+def test_finds_and_shrinks_failures():
+    @given(lists(integers()), settings=concurrent)
+    def test_short(xs):
+        time.sleep(0.001)
+        assert len(xs) < 3
+
+    with pytest.raises(AssertionError):
+        test_short()
+
+
+def test_find_gets_a_minimal_example_concurrently():
+    assert find(
+        lists(integers()), lambda xs: len(xs) >= 3, settings=concurrent
+    ) == [0, 0, 0]
+
+
+def test_unsatisfiable_assumptions_are_still_detected():
+    @given(integers(), settings=concurrent)
+    def test_never(x):
+        assume(False)
+
+    with pytest.raises(Unsatisfiable):
+        test_never()
+
+
+def test_errors_from_the_condition_propagate():
+    def condition(x):
+        raise ValueError()
+
+    evaluator = evaluator_for(condition, concurrent)
+    try:
+        evaluator.submit(0, 0)
+        with pytest.raises(ValueError):
+            evaluator.next_result()
+    finally:
+        evaluator.close()
+
+
+def test_only_runs_concurrently_when_asked_to():
+    assert isinstance(
+        evaluator_for(bool, Settings(concurrent_examples=1)),
+        SequentialEvaluator)
+    assert isinstance(
+        evaluator_for(
+            bool, Settings(concurrent_examples=2, derandomize=True)),
+        SequentialEvaluator)
+    evaluator = evaluator_for(bool, Settings(concurrent_examples=2))
+    assert isinstance(evaluator, ConcurrentEvaluator)
+    evaluator.close()
@@ -0,0 +1,171 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from unittest import TestCase
+
+import pytest
+
+from hypothesis import Settings, given, assume
+from hypothesis.errors import Unsatisfiable
+from tests.common.utils import capture_out
+from hypothesis.strategies import lists, integers
+from hypothesis.internal.evaluation import GatheringEvaluator
+
+asyncio = pytest.importorskip('asyncio')
+
+settings = Settings(max_examples=20, database=None)
+concurrent = Settings(
+    concurrent_examples=5, max_examples=20, database=None, timeout=-1)
+
+
+def wait_for_a_bit(loop):
+    future = asyncio.Future(loop=loop)
+    loop.call_soon(future.set_result, None)
+    return future
+
+
+def test_runs_coroutine_tests_to_completion():
+    completed = []
+
+    @given(integers(), settings=settings)
+    @asyncio.coroutine
+    def test_completes(x):
+        for f in wait_for_a_bit(asyncio.get_event_loop()):
+            yield f
+        completed.append(x)
+
+    test_completes()
+    assert completed
+
+
+def test_reuses_one_event_loop_per_call():
+    loops = set()
+
+    @given(integers(), settings=settings)
+    @asyncio.coroutine
+    def test_loops(x):
+        loops.add(asyncio.get_event_loop())
+
+    test_loops()
+    assert len(loops) == 1
+    assert all(loop.is_closed() for loop in loops)
+    test_loops()
+    assert len(loops) == 2
+
+
+@pytest.mark.parametrize('settings', [settings, concurrent])
+def test_finds_and_shrinks_failures_in_coroutines(settings):
+    @given(lists(integers()), settings=settings)
+    @asyncio.coroutine
+    def test_short(xs):
+        for f in wait_for_a_bit(asyncio.get_event_loop()):
+            yield f
+        assert len(xs) < 3
+
+    with capture_out() as out:
+        with pytest.raises(AssertionError):
+            test_short()
+    assert 'test_short(xs=[0, 0, 0])' in out.getvalue()
+
+
+def test_gathers_examples_concurrently():
+    running = [0]
+    most_running = [0]
+
+    @given(integers(), settings=concurrent)
+    @asyncio.coroutine
+    def test_gathered(x):
+        running[0] += 1
+        most_running[0] = max(most_running[0], running[0])
+        for f in wait_for_a_bit(asyncio.get_event_loop()):
+            yield f
+        running[0] -= 1
+
+    test_gathered()
+    assert most_running[0] == 5
+
+
+def test_assumptions_in_gathered_coroutines():
+    @given(integers(), settings=concurrent)
+    @asyncio.coroutine
+    def test_never(x):
+        assume(False)
+
+    with pytest.raises(Unsatisfiable):
+        test_never()
+
+
+def test_errors_are_raised_when_not_shrinking():
+    @given(integers(), settings=Settings(
+        concurrent_examples=5, max_shrinks=0, database=None))
+    @asyncio.coroutine
+    def test_fails(x):
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        test_fails()
+
+
+class TestCoroutineMethods(TestCase):
+
+    def setup_example(self):
+        self.setup = True
+
+    @given(integers(), settings=concurrent)
+    @asyncio.coroutine
+    def test_sees_setup(self, x):
+        assert self.setup
+
+
+class Condition(object):
+
+    def __init__(self, start):
+        self.start_coroutine = start
+        self.coroutine_failed = lambda e: True
+        self.event_loop = None
+
+
+def test_gathering_evaluator_handles_synchronous_failures():
+    def start(x):
+        if x:
+            raise ValueError()
+        assume(False)
+
+    evaluator = GatheringEvaluator(Condition(start), 2)
+    evaluator.submit(0, False)
+    evaluator.submit(1, True)
+    assert evaluator.full()
+    assert not evaluator.next_result().satisfied_assumptions
+    assert evaluator.next_result().result
+    evaluator.close()
+
+
+def test_gathering_evaluator_closes_pending_coroutines():
+    @asyncio.coroutine
+    def never_run():
+        yield
+
+    coroutine = never_run()
+    evaluator = GatheringEvaluator(Condition(lambda x: coroutine), 2)
+    evaluator.submit(0, 0)
+    evaluator.close()
+    assert not evaluator.in_flight
+    with pytest.raises(StopIteration):
+        next(coroutine)
@@ -0,0 +1,152 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from random import Random
+
+import pytest
+
+from hypothesis import given, assume
+from hypothesis.errors import Unsatisfiable
+from hypothesis.database import ExampleDatabase
+from hypothesis.settings import Settings
+from hypothesis.strategies import lists, integers
+from hypothesis.internal.corpus import Corpus
+
+
+def test_does_not_add_duplicates():
+    corpus = Corpus(10, Random(0))
+    assert corpus.add(0, 1)
+    assert not corpus.add(1, 1)
+    assert len(corpus) == 1
+
+
+def test_does_not_grow_beyond_max_size():
+    corpus = Corpus(3, Random(0))
+    for i in range(10):
+        corpus.add(i, i)
+    assert len(corpus) == 3
+    assert len(corpus.tracking_keys) == 3
+    assert len(list(corpus.templates())) == 3
+
+
+def test_spreads_out_over_groups():
+    corpus = Corpus(4, Random(0))
+    for i in range(4):
+        assert corpus.add(0, i)
+    assert not corpus.add(0, 100)
+    for group in (1, 2, 3):
+        assert corpus.add(group, group * 10)
+    assert not corpus.add(4, 40)
+    assert sorted(map(len, corpus.groups.values())) == [1, 1, 1, 1]
+
+
+def test_replays_seeds_then_simplified_seeds():
+    corpus = Corpus(10, Random(0))
+    strategy = integers()
+    template = strategy.draw_and_produce(Random(0))
+    corpus.seeds = [template]
+    replayed = list(corpus.replay(strategy, Random(0)))
+    assert replayed[0] == (('seed', 0), template)
+    assert len(replayed) > 1
+    assert all(group == ('seed', 0) for group, _ in replayed)
+
+
+def run_with_corpus(test, database, corpus_size=10, max_examples=20):
+    settings = Settings(
+        database=database, corpus_size=corpus_size, max_examples=max_examples,
+    )
+    given(integers(), settings=settings)(test)()
+
+
+def test_passing_examples_are_replayed_first():
+    database = ExampleDatabase()
+    try:
+        seen = []
+
+        def test(x):
+            seen.append(x)
+
+        test.__name__ = 'test_passing_examples_are_replayed_first'
+        run_with_corpus(test, database)
+        first_run = list(seen)
+        del seen[:]
+        run_with_corpus(test, database)
+        assert len(set(seen[:10]) & set(first_run)) == 10
+    finally:
+        database.close()
+
+
+def test_corpus_finds_regressions_immediately():
+    database = ExampleDatabase()
+    try:
+        seen = []
+        broken = [False]
+
+        def test(x):
+            seen.append(x)
+            if broken[0] and x in first_run:
+                assert False
+
+        test.__name__ = 'test_corpus_finds_regressions_immediately'
+        first_run = []
+        run_with_corpus(test, database, corpus_size=5)
+        first_run = list(seen)
+        del seen[:]
+        broken[0] = True
+        with pytest.raises(AssertionError):
+            run_with_corpus(test, database, corpus_size=5)
+        assert seen[0] in first_run
+    finally:
+        database.close()
+
+
+def test_corpus_is_not_used_when_disabled():
+    database = ExampleDatabase()
+    try:
+        @given(integers(), settings=Settings(database=database))
+        def test_nothing_saved(x):
+            pass
+
+        test_nothing_saved()
+        assert list(database.backend.keys()) == []
+    finally:
+        database.close()
+
+
+def test_forgets_seeds_that_no_longer_satisfy_assumptions():
+    database = ExampleDatabase()
+    try:
+        reject = [False]
+
+        @given(lists(integers()), settings=Settings(
+            database=database, corpus_size=5, max_examples=10,
+        ))
+        def test_rejects(xs):
+            assume(not reject[0])
+
+        test_rejects()
+        key = [k for k in database.backend.keys() if ':corpus#' in k]
+        assert len(database.backend.fetch(key[0])) == 5
+        reject[0] = True
+        with pytest.raises(Unsatisfiable):
+            test_rejects()
+        assert database.backend.fetch(key[0]) == []
+    finally:
+        database.close()
@@ -20,13 +20,15 @@ from __future__ import division, print_function, absolute_import, \
 import time
 
 import pytest
+
 import hypothesis.settings as hs
 from hypothesis import given, assume, strategy
 from hypothesis.errors import Timeout, Unsatisfiable
 from hypothesis.database import ExampleDatabase
-from hypothesis.strategies import text, integers
+from hypothesis.strategies import text, booleans, integers
 from hypothesis.internal.compat import hrange, text_type, integer_types
-from hypothesis.database.backend import Backend, SQLiteBackend
+from hypothesis.database.backend import Backend, SQLiteBackend, \
+    CachingBackend
 from hypothesis.database.formats import Format, JSONFormat
 
 
@@ -123,6 +125,41 @@ def test_can_save_all_strings(s):
     storage.save(tuple(s), text())
 
 
+def test_can_enable_cache_for_any_backend():
+    db = ExampleDatabase(
+        backend=InMemoryBackend(), format=ObjectFormat(), cache_size=10)
+    assert isinstance(db.backend, CachingBackend)
+    storage = db.storage('cached')
+    storage.save(True, booleans())
+    assert list(storage.fetch(booleans())) == [True]
+    assert list(storage.fetch(booleans())) == [True]
+    assert db.backend.hits == 1
+
+
+def test_cache_keeps_deserialized_data():
+    class CountingFormat(JSONFormat):
+        calls = 0
+
+        def deserialize_data(self, data):
+            CountingFormat.calls += 1
+            return super(CountingFormat, self).deserialize_data(data)
+
+    db = ExampleDatabase(format=CountingFormat(), cache_size=10)
+    storage = db.storage('cached')
+    storage.save(True, booleans())
+    storage.save(False, booleans())
+    for _ in hrange(3):
+        assert sorted(storage.fetch(booleans())) == [False, True]
+    assert CountingFormat.calls == 2
+
+
+def test_settings_can_enable_cache(tmpdir):
+    settings = hs.Settings(
+        database_file=str(tmpdir.join('cached.db')), database_cache_size=10)
+    assert isinstance(settings.database.backend, CachingBackend)
+    assert settings.database.backend.max_size == 10
+
+
 def test_db_has_path_in_repr():
     backend = SQLiteBackend(':memory:')
     db = ExampleDatabase(backend=backend)
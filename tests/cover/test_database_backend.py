@@ -17,10 +17,18 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import os
+import shutil
+import tempfile
+import threading
+
+import pytest
+
 from hypothesis import given
 from tests.common import settings as small_settings
 from hypothesis.strategies import text, lists, tuples
-from hypothesis.database.backend import SQLiteBackend
+from hypothesis.database.backend import Backend, SQLiteBackend, \
+    CachingBackend, DirectoryBackend
 
 
 @given(lists(tuples(text(), text())), settings=small_settings)
@@ -74,3 +82,184 @@ def test_can_fetch_all_keys():
     backend.save('foo', 'baz')
     backend.save('boib', 'baz')
     assert len(list(backend.keys())) == 2
+
+
+def test_directory_backend_preserves_line_endings():
+    path = tempfile.mkdtemp()
+    try:
+        backend = DirectoryBackend(path)
+        backend.save('\r\n', '\r')
+        backend.save('\r\n', '\r\n')
+        assert list(backend.keys()) == ['\r\n']
+        assert sorted(backend.fetch('\r\n')) == ['\r', '\r\n']
+    finally:
+        shutil.rmtree(path)
+
+
+@given(lists(tuples(text(), text())), settings=small_settings)
+def test_directory_backend_returns_what_you_put_in(xs):
+    path = tempfile.mkdtemp()
+    try:
+        backend = DirectoryBackend(path)
+        mapping = {}
+        for key, value in xs:
+            mapping.setdefault(key, set()).add(value)
+            backend.save(key, value)
+        for key, values in mapping.items():
+            backend_contents = list(backend.fetch(key))
+            distinct_backend_contents = set(backend_contents)
+            assert len(backend_contents) == len(distinct_backend_contents)
+            assert distinct_backend_contents == set(values)
+        assert set(backend.keys()) == set(mapping)
+    finally:
+        shutil.rmtree(path)
+
+
+def test_directory_backend_can_delete_keys(tmpdir):
+    backend = DirectoryBackend(str(tmpdir))
+    backend.save('foo', 'bar')
+    backend.save('foo', 'baz')
+    backend.delete('foo', 'bar')
+    backend.delete('foo', 'bar')
+    assert list(backend.fetch('foo')) == ['baz']
+
+
+def test_directory_backend_can_fetch_all_keys(tmpdir):
+    backend = DirectoryBackend(str(tmpdir))
+    backend.save('foo', 'bar')
+    backend.save('foo', 'baz')
+    backend.save('boib', 'baz')
+    assert sorted(backend.keys()) == ['boib', 'foo']
+
+
+def test_directory_backend_is_empty_if_directory_is_missing(tmpdir):
+    backend = DirectoryBackend(str(tmpdir.join('nope')))
+    assert backend.fetch('foo') == []
+    assert list(backend.keys()) == []
+
+
+def test_directory_backend_ignores_debris(tmpdir):
+    backend = DirectoryBackend(str(tmpdir))
+    backend.save('foo', 'bar')
+    key_path = backend.key_path('foo')
+    with open(os.path.join(key_path, '.tmp-deadbeef'), 'w') as o:
+        o.write('partial')
+    os.mkdir(os.path.join(key_path, 'not-a-value'))
+    os.mkdir(str(tmpdir.join('not-a-key')))
+    assert backend.fetch('foo') == ['bar']
+    assert list(backend.keys()) == ['foo']
+
+
+def test_directory_backend_recovers_key_directory_without_key_file(tmpdir):
+    backend = DirectoryBackend(str(tmpdir))
+    os.mkdir(backend.key_path('foo'))
+    backend.save('foo', 'bar')
+    assert list(backend.keys()) == ['foo']
+
+
+def test_directory_backend_can_be_shared_between_writers(tmpdir):
+    def write(i):
+        backend = DirectoryBackend(str(tmpdir))
+        for j in range(20):
+            backend.save('shared', '%d' % (j,))
+            backend.save('key%d' % (i,), '%d' % (j,))
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    backend = DirectoryBackend(str(tmpdir))
+    assert len(backend.fetch('shared')) == 20
+    assert len(list(backend.keys())) == 5
+    assert 'DirectoryBackend' in repr(backend)
+    backend.close()
+
+
+def test_backend_close_does_nothing_by_default():
+    class TrivialBackend(Backend):
+        pass
+    TrivialBackend().close()
+
+
+def test_caching_backend_counts_hits_and_misses():
+    backend = CachingBackend(SQLiteBackend(':memory:'))
+    backend.save('foo', 'bar')
+    assert backend.fetch('foo') == ['bar']
+    assert backend.fetch('foo') == ['bar']
+    assert backend.fetch('baz') == []
+    assert backend.hits == 1
+    assert backend.misses == 2
+
+
+def test_caching_backend_writes_through():
+    underlying = SQLiteBackend(':memory:')
+    backend = CachingBackend(underlying)
+    backend.save('foo', 'bar')
+    assert backend.fetch('foo') == ['bar']
+    backend.save('foo', 'baz')
+    backend.save('foo', 'baz')
+    assert sorted(backend.fetch('foo')) == ['bar', 'baz']
+    backend.delete('foo', 'bar')
+    backend.delete('foo', 'bar')
+    assert backend.fetch('foo') == ['baz']
+    assert underlying.fetch('foo') == ['baz']
+    assert list(backend.keys()) == ['foo']
+    assert backend.misses == 1
+
+
+def test_caching_backend_evicts_least_recently_used():
+    backend = CachingBackend(SQLiteBackend(':memory:'), max_size=2)
+    backend.fetch('a')
+    backend.fetch('b')
+    backend.fetch('a')
+    backend.fetch('c')
+    assert list(backend.cache) == ['a', 'c']
+    assert backend.misses == 3
+
+
+def test_caching_backend_does_not_expose_its_cache():
+    backend = CachingBackend(SQLiteBackend(':memory:'))
+    backend.fetch('a').append('b')
+    assert backend.fetch('a') == []
+
+
+def test_caching_backend_keeps_decoded_values_of_cached_keys():
+    backend = CachingBackend(SQLiteBackend(':memory:'), max_size=1)
+    decoded = []
+
+    def decode(value):
+        decoded.append(value)
+        return [value]
+
+    backend.save('a', '1')
+    assert backend.decode('a', '1', decode) == ['1']
+    backend.fetch('a')
+    assert backend.decode('a', '1', decode) == ['1']
+    assert backend.decode('a', '1', decode) == ['1']
+    assert decoded == ['1', '1']
+    backend.fetch('b')
+    assert backend.decode('a', '1', decode) == ['1']
+    assert decoded == ['1', '1', '1']
+
+
+def test_caching_backend_forgets_decoded_values_when_deleted():
+    backend = CachingBackend(SQLiteBackend(':memory:'))
+    backend.save('a', '1')
+    backend.fetch('a')
+    backend.decode('a', '1', int)
+    backend.delete('a', '1')
+    assert backend.decoded['a'] == {}
+
+
+def test_caching_backend_rejects_empty_cache():
+    with pytest.raises(ValueError):
+        CachingBackend(SQLiteBackend(':memory:'), max_size=0)
+
+
+def test_caching_backend_clears_on_close():
+    backend = CachingBackend(SQLiteBackend(':memory:'))
+    backend.fetch('a')
+    backend.close()
+    assert not backend.cache
+    assert 'SQLiteBackend' in repr(backend)
@@ -0,0 +1,242 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import shutil
+import socket
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from hypothesis import given
+from tests.common import settings as small_settings
+from hypothesis.errors import DatabaseServerError
+from hypothesis.database import ExampleDatabase
+from hypothesis.strategies import text, lists, tuples
+from hypothesis.database.server import RemoteBackend, DatabaseServer
+from hypothesis.database.backend import SQLiteBackend, DirectoryBackend
+
+
+@contextmanager
+def serving(backend):
+    server = DatabaseServer(backend, host='localhost', port=0)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def remote(server, **kwargs):
+    return RemoteBackend(port=server.server_address[1], **kwargs)
+
+
+def unused_port():
+    s = socket.socket()
+    s.bind(('localhost', 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+def test_remote_backend_round_trips(tmpdir):
+    with serving(DirectoryBackend(str(tmpdir))) as server:
+        backend = remote(server)
+        try:
+            backend.save('foo', 'bar')
+            backend.save('foo', 'baz')
+            backend.save('boib', 'baz')
+            backend.delete('foo', 'bar')
+            assert backend.fetch('foo') == ['baz']
+            assert sorted(backend.keys()) == ['boib', 'foo']
+            assert 'RemoteBackend' in repr(backend)
+        finally:
+            backend.close()
+
+
+@given(lists(tuples(text(), text())), settings=small_settings)
+def test_remote_backend_bulk_operations(xs):
+    path = tempfile.mkdtemp()
+    try:
+        with serving(DirectoryBackend(path)) as server:
+            backend = remote(server)
+            try:
+                mapping = {}
+                for key, value in xs:
+                    mapping.setdefault(key, set()).add(value)
+                backend.save_many(xs)
+                fetched = backend.fetch_many(list(mapping) + ['missing'])
+                assert fetched.pop('missing') == []
+                assert dict(
+                    (k, set(v)) for k, v in fetched.items()) == mapping
+            finally:
+                backend.close()
+    finally:
+        shutil.rmtree(path)
+
+
+def test_reuses_connections(tmpdir):
+    with serving(DirectoryBackend(str(tmpdir))) as server:
+        backend = remote(server, pool_size=1)
+        try:
+            backend.fetch('foo')
+            connection = backend.pool[0]
+            backend.fetch('foo')
+            assert backend.pool == [connection]
+        finally:
+            backend.close()
+        assert backend.pool == []
+
+
+def test_reconnects_when_a_connection_dies(tmpdir):
+    with serving(DirectoryBackend(str(tmpdir))) as server:
+        backend = remote(server)
+        try:
+            backend.save('foo', 'bar')
+            for sock, _ in backend.pool:
+                sock.close()
+            assert backend.fetch('foo') == ['bar']
+        finally:
+            backend.close()
+
+
+def test_discards_connections_beyond_pool_size(tmpdir):
+    with serving(DirectoryBackend(str(tmpdir))) as server:
+        backend = remote(server, pool_size=0)
+        try:
+            backend.save('foo', 'bar')
+            assert backend.pool == []
+            assert backend.fetch('foo') == ['bar']
+        finally:
+            backend.close()
+
+
+def test_falls_back_to_local_backend_if_server_is_unavailable():
+    fallback = SQLiteBackend(':memory:')
+    backend = RemoteBackend(port=unused_port(), fallback=fallback)
+    backend.save('foo', 'bar')
+    assert backend.fetch('foo') == ['bar']
+    assert fallback.fetch('foo') == ['bar']
+    backend.close()
+
+
+def test_raises_if_server_is_unavailable_and_there_is_no_fallback():
+    backend = RemoteBackend(port=unused_port())
+    with pytest.raises(socket.error):
+        backend.fetch('foo')
+
+
+class CountingRemoteBackend(RemoteBackend):
+
+    def __init__(self, *args, **kwargs):
+        super(CountingRemoteBackend, self).__init__(*args, **kwargs)
+        self.connections = 0
+
+    def connect(self):
+        self.connections += 1
+        return super(CountingRemoteBackend, self).connect()
+
+
+def test_does_not_retry_a_server_which_is_down():
+    backend = CountingRemoteBackend(
+        port=unused_port(), fallback=SQLiteBackend(':memory:'))
+    backend.save('foo', 'bar')
+    assert backend.connections == 2
+    assert backend.is_down()
+    assert backend.fetch('foo') == ['bar']
+    assert backend.fetch_many(['foo']) == {'foo': ['bar']}
+    assert backend.connections == 2
+    backend.close()
+
+
+def test_raises_the_last_error_while_the_server_is_down():
+    backend = CountingRemoteBackend(port=unused_port())
+    with pytest.raises(socket.error):
+        backend.fetch('foo')
+    with pytest.raises(socket.error):
+        backend.fetch('foo')
+    assert backend.connections == 2
+
+
+def test_tries_the_server_again_after_the_retry_interval():
+    backend = CountingRemoteBackend(
+        port=unused_port(), fallback=SQLiteBackend(':memory:'),
+        retry_interval=0.0,
+    )
+    backend.save('foo', 'bar')
+    backend.save('foo', 'baz')
+    assert backend.connections == 4
+    backend.close()
+
+
+def test_reports_server_errors(tmpdir):
+    with serving(DirectoryBackend(str(tmpdir))) as server:
+        backend = remote(server)
+        try:
+            with pytest.raises(DatabaseServerError):
+                backend.request('drop_all_tables')
+            with pytest.raises(DatabaseServerError):
+                backend.request('save', 'too few arguments')
+            backend.save('foo', 'bar')
+            assert backend.fetch('foo') == ['bar']
+        finally:
+            backend.close()
+
+
+def test_can_use_remote_backend_for_example_database(tmpdir):
+    with serving(DirectoryBackend(str(tmpdir))) as server:
+        db = ExampleDatabase(backend=remote(server), cache_size=10)
+        try:
+            db.backend.save_many([('a', '1'), ('b', '2')])
+            assert db.backend.fetch_many(['a']) == {'a': ['1']}
+            assert db.backend.fetch_many(['a', 'b']) == {
+                'a': ['1'], 'b': ['2']}
+            assert db.backend.hits == 1
+            assert db.backend.misses == 2
+            db.backend.save_many([('a', '3'), ('c', '4')])
+            assert sorted(db.backend.fetch('a')) == ['1', '3']
+            assert db.backend.fetch('c') == ['4']
+        finally:
+            db.close()
+
+
+def test_prefetches_storages_in_one_request(tmpdir):
+    with serving(DirectoryBackend(str(tmpdir))) as server:
+        backend = CountingRemoteBackend(port=server.server_address[1])
+        db = ExampleDatabase(backend=backend)
+        try:
+            db.storage('a').save_many([('1',), ('2',)], text())
+            db.storage('b').save(('3',), text())
+            storages = [db.storage('a'), db.storage('b'), db.storage('c')]
+            requests = []
+            original = backend.request
+            backend.request = lambda *args: (
+                requests.append(args[0]) or original(*args))
+            db.prefetch(storages)
+            assert sorted(storages[0].fetch(text())) == [('1',), ('2',)]
+            assert list(storages[1].fetch(text())) == [('3',)]
+            assert list(storages[2].fetch(text())) == []
+            assert requests == ['fetch_many']
+        finally:
+            db.close()
@@ -0,0 +1,174 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from decimal import Decimal
+from collections import namedtuple
+
+import pytest
+
+from hypothesis import given
+from hypothesis.database import ExampleDatabase
+from hypothesis.settings import Settings
+from hypothesis.strategies import just, sets, text, lists, tuples, \
+    booleans, integers, fixed_dictionaries
+from hypothesis.internal.fingerprint import strategy_fingerprint
+from hypothesis.searchstrategy.strategies import BadData, check_length, \
+    trusted_data, check_data_type
+
+Point = namedtuple('Point', ('x', 'y'))
+
+
+@pytest.mark.parametrize('make', [
+    lambda: integers(),
+    lambda: integers(min_value=0, max_value=10),
+    lambda: lists(text(), average_size=3.0),
+    lambda: fixed_dictionaries({'a': integers(), 'b': booleans()}),
+    lambda: integers().map(lambda x: x + 1),
+    lambda: integers().flatmap(lambda x: lists(just(x))),
+    lambda: just(object()),
+    lambda: just({1: 2, 3: 4}),
+    lambda: just(frozenset([1, 2])),
+    lambda: tuples(integers(), integers()).map(lambda t: Point(*t)),
+])
+def test_fingerprint_is_stable(make):
+    assert strategy_fingerprint(make()) == strategy_fingerprint(make())
+
+
+@pytest.mark.parametrize(('left', 'right'), [
+    (integers(), booleans()),
+    (integers(min_value=0, max_value=10), integers(min_value=0, max_value=11)),
+    (lists(integers()), sets(integers())),
+    (lists(integers()), lists(booleans())),
+    (
+        integers().map(lambda x: x + 1),
+        integers().map(lambda x: x + 2),
+    ),
+    (just(Decimal('1')), just(Decimal('2'))),
+])
+def test_fingerprint_changes_with_structure(left, right):
+    assert strategy_fingerprint(left) != strategy_fingerprint(right)
+
+
+def test_does_not_fingerprint_objects_which_cannot_be_told_apart():
+    assert strategy_fingerprint(just(object())) is None
+    assert strategy_fingerprint(lists(just(object()))) is None
+
+
+def test_fingerprint_handles_cycles():
+    s = lists(integers())
+    s.element_strategy.cycle = s
+    strategy_fingerprint(s)
+
+
+def test_trusted_data_skips_validation():
+    with pytest.raises(BadData):
+        check_length(2, [1])
+    with pytest.raises(BadData):
+        check_data_type(list, 1)
+    with trusted_data.with_value(True):
+        check_length(2, [1])
+        check_data_type(list, 1)
+
+
+def test_stores_data_under_fingerprinted_key():
+    db = ExampleDatabase()
+    strat = booleans()
+    storage = db.storage('key', strategy_fingerprint(strat))
+    storage.save(True, strat)
+    assert list(db.backend.keys()) == [storage.storage_key]
+    assert storage.storage_key.startswith('key#')
+    assert list(storage.fetch(strat)) == [True]
+    assert 'key' in repr(storage)
+
+
+def test_skips_corrupted_trusted_data():
+    db = ExampleDatabase()
+    strat = lists(booleans())
+    storage = db.storage('key', strategy_fingerprint(strat))
+    db.backend.save(storage.storage_key, '5')
+    assert list(storage.fetch(strat)) == []
+
+
+def test_migrates_valid_unfingerprinted_data():
+    db = ExampleDatabase()
+    strat = booleans()
+    db.storage('key').save(True, strat)
+    db.backend.save('key', '"not a boolean"')
+    storage = db.storage('key', strategy_fingerprint(strat))
+    assert list(storage.fetch(strat)) == [True]
+    assert db.backend.fetch('key') == ['"not a boolean"']
+    assert list(storage.fetch(strat)) == [True]
+
+
+def test_migrates_valid_data_from_other_fingerprints():
+    db = ExampleDatabase()
+    strat = booleans()
+    db.backend.save('key#0123456789abcdef', 'true')
+    db.backend.save('key#0123456789abcdef', '"not a boolean"')
+    db.backend.save('key#fedcba9876543210', 'false')
+    storage = db.storage('key', strategy_fingerprint(strat))
+    assert sorted(storage.fetch(strat)) == [False, True]
+    assert list(db.backend.keys()) == [storage.storage_key]
+    assert sorted(storage.fetch(strat)) == [False, True]
+
+
+def test_prunes_stale_fingerprints():
+    db = ExampleDatabase()
+    old = db.storage('key', strategy_fingerprint(integers()))
+    db.backend.save(old.storage_key, '[0, "1"]')
+    db.storage('other', 'deadbeef').save(True, booleans())
+    new = db.storage('key', strategy_fingerprint(booleans()))
+    new.save(True, booleans())
+    assert new.prune() == 1
+    assert db.backend.fetch(old.storage_key) == []
+    assert list(new.fetch(booleans())) == [True]
+    assert db.backend.fetch('other#deadbeef') == ['1']
+
+
+def test_lists_keys_once_per_database():
+    db = ExampleDatabase()
+    listings = []
+    keys = db.backend.keys
+    db.backend.keys = lambda: listings.append(1) or keys()
+    old = db.storage('key', 'deadbeef')
+    new = db.storage('key', strategy_fingerprint(booleans()))
+    assert list(new.fetch(booleans())) == []
+    assert db.keys() == []
+    old.save(True, booleans())
+    assert new.stale_keys() == [old.storage_key]
+    assert new.prune() == 1
+    assert new.stale_keys() == []
+    assert len(listings) == 1
+
+
+def test_given_saves_under_fingerprint():
+    db = ExampleDatabase()
+
+    @given(x=integers(), settings=Settings(database=db))
+    def test_fails(x):
+        assert x < 10
+
+    with pytest.raises(AssertionError):
+        test_fails()
+    keys = list(db.backend.keys())
+    assert len(keys) == 1
+    assert keys[0].endswith(
+        '#' + strategy_fingerprint(
+            tuples(tuples(), fixed_dictionaries({'x': integers()}))))
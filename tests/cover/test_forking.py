@@ -18,17 +18,20 @@ from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
 import os
+import time
+import signal
 
 import pytest
+
 import hypothesis.reporting as reporting
-from hypothesis import given
+from hypothesis import Settings, given
 from hypothesis.errors import AbnormalExit
 from tests.common.utils import capture_out
-from hypothesis.strategies import sets, booleans, integers
+from hypothesis.strategies import sets, booleans, integers, streaming
 
-ForkingTestCase = pytest.importorskip(
-    'hypothesis.testrunners.forking'
-).ForkingTestCase
+forking = pytest.importorskip('hypothesis.testrunners.forking')
+ForkingTestCase = forking.ForkingTestCase
+ForkServer = forking.ForkServer
 
 
 def test_runs_normally_if_no_failure():
@@ -98,3 +101,143 @@ def test_captures_output_from_child():
                 ).test_positive()
         out = out.getvalue()
         assert 'Falsifying example: test_positive' in out
+
+
+class ForkServerTestCase(ForkingTestCase):
+    fork_server = True
+
+
+def test_fork_server_runs_normally_if_no_failure():
+    class Foo(ForkServerTestCase):
+
+        @given(sets(booleans()))
+        def runs_normally(self, x):
+            pass
+
+    foo = Foo('runs_normally')
+    foo.runs_normally()
+    assert len(foo._fork_server.workers) == 2
+    foo.tearDown()
+    assert foo._fork_server is None
+
+
+def test_fork_server_reuses_children():
+    class Foo(ForkServerTestCase):
+        fork_server_size = 1
+
+        @given(integers())
+        def test_pids(self, x):
+            reporting.report(str(os.getpid()))
+
+    pids = set()
+    with reporting.with_reporter(pids.add):
+        Foo('test_pids').test_pids()
+    assert os.getpid() not in set(map(int, pids))
+    assert len(pids) == 1
+
+
+def test_fork_server_retires_children_after_a_batch():
+    class Foo(ForkServerTestCase):
+        fork_server_size = 1
+        fork_server_batch_size = 10
+
+        @given(integers(), settings=Settings(max_examples=50))
+        def test_pids(self, x):
+            reporting.report(str(os.getpid()))
+
+    reports = []
+    with reporting.with_reporter(reports.append):
+        Foo('test_pids').test_pids()
+    pids = set(reports)
+    assert len(pids) >= len(reports) // 10
+    assert max(reports.count(pid) for pid in pids) <= 10
+
+
+def test_fork_server_passes_exceptions_back():
+    class Foo(ForkServerTestCase):
+
+        @given(integers())
+        def test_positive(self, x):
+            assert x > 0
+
+    with reporting.with_reporter(reporting.default):
+        with capture_out() as out:
+            with pytest.raises(AssertionError):
+                Foo('test_positive').test_positive()
+    assert 'Falsifying example: test_positive' in out.getvalue()
+
+
+def test_fork_server_replaces_children_that_die():
+    class Foo(ForkServerTestCase):
+
+        @given(integers())
+        def test_dies(self, x):
+            if x > 0:
+                os._exit(1)
+
+    foo = Foo('test_dies')
+    with pytest.raises(AbnormalExit):
+        foo.test_dies()
+    assert len(foo._fork_server.workers) == 2
+    assert all(w.alive for w in foo._fork_server.workers)
+    foo.shutdown_fork_server()
+
+
+def test_fork_server_falls_back_for_unpicklable_templates():
+    class Foo(ForkServerTestCase):
+
+        @given(streaming(integers()))
+        def test_streams(self, x):
+            pass
+
+    foo = Foo('test_streams')
+    foo.test_streams()
+    assert foo._fork_server is None
+    foo.shutdown_fork_server()
+
+
+def test_fork_server_is_replaced_for_a_new_test():
+    class Foo(ForkServerTestCase):
+
+        @given(integers())
+        def test_a(self, x):
+            pass
+
+        @given(booleans())
+        def test_b(self, x):
+            pass
+
+    foo = Foo('test_a')
+    foo.test_a()
+    first = foo._fork_server
+    foo.test_b()
+    assert foo._fork_server is not first
+    assert first.workers == []
+    foo.tearDown()
+
+
+def test_fork_server_runs_concurrent_examples_in_several_children():
+    class Foo(ForkServerTestCase):
+
+        @given(integers(), settings=Settings(
+            max_examples=20, concurrent_examples=2, database=None))
+        def test_pids(self, x):
+            time.sleep(0.01)
+            reporting.report(str(os.getpid()))
+
+    reports = []
+    with reporting.with_reporter(reports.append):
+        Foo('test_pids').test_pids()
+    assert len(set(reports)) == 2
+
+
+def test_kills_children_which_do_not_exit():
+    server = ForkServer((None, None, False, False), 1, None)
+    server.fill()
+    worker, = server.workers
+    os.kill(worker.pid, signal.SIGSTOP)
+    start = time.time()
+    worker.close(grace_period=0.1)
+    assert time.time() - start < 5
+    with pytest.raises(OSError):
+        os.waitpid(worker.pid, os.WNOHANG)
@@ -0,0 +1,195 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import os
+import time
+import signal
+
+import pytest
+
+from hypothesis import Settings, Verbosity, given
+from hypothesis.errors import AbnormalExit, InvalidArgument, \
+    DeadlineExceeded, ResourceLimitExceeded
+from tests.common.utils import capture_out
+from hypothesis.reporting import with_reporter
+from hypothesis.strategies import integers
+
+IsolatedTestCase = pytest.importorskip(
+    'hypothesis.testrunners.isolated'
+).IsolatedTestCase
+
+settings = Settings(max_examples=5, database=None)
+
+
+def test_records_resource_usage_of_each_example():
+    class Foo(IsolatedTestCase):
+
+        @given(integers(), settings=settings)
+        def test_foo(self, x):
+            pass
+
+    test = Foo('test_foo')
+    test.test_foo()
+    assert test.resource_usage
+    for usage in test.resource_usage:
+        assert usage.wall_time >= 0
+        assert usage.cpu_time >= 0
+        assert usage.peak_memory >= 0
+
+
+def test_peak_memory_does_not_include_the_parent():
+    ballast = b'\1' * (2 ** 28)
+
+    class Foo(IsolatedTestCase):
+
+        @given(integers(), settings=settings)
+        def test_foo(self, x):
+            pass
+
+    test = Foo('test_foo')
+    test.test_foo()
+    for usage in test.resource_usage:
+        assert usage.peak_memory < len(ballast)
+
+
+def test_memory_limit_is_on_growth_after_the_fork():
+    ballast = b'\1' * (2 ** 28)
+
+    class Foo(IsolatedTestCase):
+        memory_limit = 2 ** 27
+
+        @given(integers(), settings=settings)
+        def test_foo(self, x):
+            b'\0' * (2 ** 20)
+
+    Foo('test_foo').test_foo()
+    assert ballast
+
+
+def test_fork_server_is_not_supported():
+    class Foo(IsolatedTestCase):
+        fork_server = True
+
+        @given(integers(), settings=settings)
+        def test_foo(self, x):
+            pass
+
+    with pytest.raises(InvalidArgument):
+        Foo('test_foo').test_foo()
+
+
+def test_reports_resource_usage_in_verbose_mode():
+    class Foo(IsolatedTestCase):
+
+        @given(integers(), settings=Settings(
+            max_examples=1, database=None, verbosity=Verbosity.verbose))
+        def test_foo(self, x):
+            pass
+
+    with capture_out() as out:
+        with with_reporter(print):
+            Foo('test_foo').test_foo()
+    assert 'peaked at' in out.getvalue()
+
+
+def test_exceeding_memory_limit_is_a_failure():
+    class Foo(IsolatedTestCase):
+        memory_limit = 2 ** 30
+
+        @given(integers(), settings=settings)
+        def test_foo(self, x):
+            b'\0' * (2 ** 31)
+
+    with pytest.raises(ResourceLimitExceeded):
+        Foo('test_foo').test_foo()
+
+
+def test_exceeding_cpu_time_limit_is_a_failure():
+    class Foo(IsolatedTestCase):
+        cpu_time_limit = 1
+
+        @given(integers(), settings=settings)
+        def test_foo(self, x):
+            while True:
+                pass
+
+    with pytest.raises(ResourceLimitExceeded) as e:
+        Foo('test_foo').test_foo()
+    assert not isinstance(e.value, DeadlineExceeded)
+
+
+def test_exceeding_deadline_is_a_failure():
+    class Foo(IsolatedTestCase):
+        deadline = 0.1
+
+        @given(integers(), settings=settings)
+        def test_foo(self, x):
+            time.sleep(10)
+
+    with pytest.raises(DeadlineExceeded):
+        Foo('test_foo').test_foo()
+
+
+def test_examples_within_limits_pass():
+    class Foo(IsolatedTestCase):
+        memory_limit = 2 ** 32
+        cpu_time_limit = 10
+        deadline = 10
+
+        @given(integers(), settings=settings)
+        def test_foo(self, x):
+            pass
+
+    Foo('test_foo').test_foo()
+
+
+def test_still_raises_errors_from_the_test():
+    class Foo(IsolatedTestCase):
+        deadline = 10
+
+        @given(integers(), settings=settings)
+        def test_foo(self, x):
+            assert False
+
+    with pytest.raises(AssertionError):
+        Foo('test_foo').test_foo()
+
+
+def test_abnormal_exits_are_still_reported():
+    class Foo(IsolatedTestCase):
+
+        @given(integers(), settings=settings)
+        def test_foo(self, x):
+            import os
+            os._exit(1)
+
+    with pytest.raises(AbnormalExit):
+        Foo('test_foo').test_foo()
+
+
+def test_other_kills_are_not_cpu_time_limit_failures():
+    class Foo(IsolatedTestCase):
+        cpu_time_limit = 10
+
+        @given(integers(), settings=settings)
+        def test_foo(self, x):
+            os.kill(os.getpid(), signal.SIGKILL)
+
+    with pytest.raises(AbnormalExit):
+        Foo('test_foo').test_foo()
@@ -18,6 +18,7 @@ from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
 import pytest
+
 from hypothesis import given, assume
 from hypothesis.strategies import text, integers
 
@@ -137,3 +138,72 @@ def test_tears_down_without_setup():
     x.give_me_an_int()
     assert x.teardowns > 0
     assert not hasattr(x, 'setups')
+
+
+class HasBatchHooks(SomeGivens):
+
+    def __init__(self):
+        self.events = []
+
+    def setup_batch(self):
+        self.events.append('setup_batch')
+        return len(self.events)
+
+    def teardown_batch(self, token):
+        self.events.append(('teardown_batch', token))
+
+    def reset_example(self, token):
+        self.events.append(('reset', token))
+
+
+def test_sets_up_one_batch_per_test_call():
+    x = HasBatchHooks()
+    x.give_me_an_int()
+    assert x.events[0] == 'setup_batch'
+    assert x.events[-1] == ('teardown_batch', 1)
+    assert x.events.count('setup_batch') == 1
+    resets = x.events[1:-1]
+    assert resets
+    assert all(e == ('reset', 1) for e in resets)
+
+
+def test_tears_down_batch_on_failure():
+    x = HasBatchHooks()
+    with pytest.raises(AssertionError):
+        x.give_me_a_positive_int()
+    assert x.events.count('setup_batch') == 1
+    assert x.events[-1][0] == 'teardown_batch'
+
+
+def test_batch_size_limits_examples_per_batch():
+    class Foo(HasBatchHooks):
+        example_batch_size = 2
+
+    x = Foo()
+    x.give_me_an_int()
+    setups = x.events.count('setup_batch')
+    resets = len([e for e in x.events if e[0] == 'reset'])
+    assert setups == (resets + 1) // 2
+    assert len([e for e in x.events if e[0] == 'teardown_batch']) == setups
+
+
+def test_runs_example_setup_inside_batch():
+    class Foo(HasBatchHooks, HasSetupAndTeardown):
+        pass
+
+    x = Foo()
+    x.give_me_an_int()
+    assert x.setups == x.teardowns
+    assert x.setups == len([e for e in x.events if e[0] == 'reset'])
+
+
+def test_batch_hooks_are_optional():
+    class Foo(SomeGivens):
+
+        def reset_example(self, token):
+            assert token is None
+            self.resets = getattr(self, 'resets', 0) + 1
+
+    x = Foo()
+    x.give_me_an_int()
+    assert x.resets > 0
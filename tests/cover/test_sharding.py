@@ -0,0 +1,220 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import warnings
+from itertools import islice
+
+import pytest
+
+from hypothesis import given, assume
+from hypothesis.errors import Unsatisfiable, InvalidArgument, \
+    HypothesisWarning
+from hypothesis.budget import history_key
+from hypothesis.database import ExampleDatabase
+from hypothesis.settings import Settings
+from hypothesis.strategies import integers
+from hypothesis.internal import sharding
+from hypothesis.internal.sharding import shard_of, with_shard, \
+    shard_seeds, current_shard, split_settings
+
+
+def test_runs_unsharded_by_default():
+    assert current_shard() is None
+
+
+def test_shard_seeds_are_reproducible_and_disjoint():
+    def test(x):
+        pass
+
+    def seeds(index, count):
+        return list(islice(shard_seeds(test, index, count), 10))
+
+    shards = [seeds(i, 3) for i in range(3)]
+    assert shards == [seeds(i, 3) for i in range(3)]
+    assert sorted(sum(shards, [])) == sorted(seeds(0, 1) + seeds(10, 1) +
+                                             seeds(20, 1))
+    assert len(set(sum(shards, []))) == 30
+
+
+def test_copies_split_the_shard_from_settings():
+    settings = Settings(shard_index=1, shard_count=2)
+    assert shard_of(settings) == (1, 2)
+    with with_shard((2, 3)):
+        assert shard_of(settings) == (5, 6)
+    assert shard_of(Settings()) == (0, 1)
+
+
+def test_split_settings_round_up():
+    settings = split_settings(Settings(
+        max_examples=100, max_iterations=200, min_satisfying_examples=5,
+        timeout=3,
+    ), 3)
+    assert settings.max_examples == 34
+    assert settings.max_iterations == 67
+    assert settings.min_satisfying_examples == 2
+    assert settings.timeout == 3
+
+
+def test_splits_examples_between_shards():
+    calls = []
+
+    @given(integers(), settings=Settings(max_examples=100, database=None))
+    def test_ints(x):
+        calls.append(x)
+
+    with with_shard((0, 4)):
+        test_ints()
+    assert 0 < len(calls) <= 25
+
+
+def test_shards_are_random_unless_derandomized():
+    def run(index=0, **kwargs):
+        seen = []
+
+        @given(integers(), settings=Settings(
+            database=None, max_examples=20, **kwargs))
+        def test_ints(x):
+            seen.append(x)
+
+        with with_shard((index, 2)):
+            test_ints()
+        return seen
+
+    assert run() != run()
+    assert run(derandomize=True) == run(derandomize=True)
+    assert run(0, derandomize=True) != run(1, derandomize=True)
+
+
+def test_shards_share_failures_through_the_database():
+    database = ExampleDatabase()
+    seen = []
+
+    @given(integers(), settings=Settings(database=database))
+    def test_small(x):
+        seen.append(x)
+        assert x < 10
+
+    with with_shard((0, 2)):
+        with pytest.raises(AssertionError):
+            test_small()
+    failure = seen[-1]
+    del seen[:]
+    with with_shard((1, 2)):
+        with pytest.raises(AssertionError):
+            test_small()
+    assert seen[0] == failure
+
+
+def test_raises_unsatisfiable_from_shards():
+    @given(integers(), settings=Settings(database=None))
+    def test_nothing(x):
+        assume(False)
+
+    with with_shard((1, 3)):
+        with pytest.raises(Unsatisfiable):
+            test_nothing()
+
+
+def test_shards_keep_their_own_history():
+    def test(x):
+        pass
+
+    keys = set()
+    for index in range(2):
+        with with_shard((index, 2)):
+            keys.add(history_key(test))
+    keys.add(history_key(test))
+    assert len(keys) == 3
+
+
+def derandomized_examples(index, count, copy=None):
+    seen = []
+
+    @given(integers(), settings=Settings(
+        derandomize=True, database=None, max_examples=20,
+        shard_index=index, shard_count=count,
+    ))
+    def test_ints(x):
+        seen.append(x)
+
+    with with_shard(copy):
+        test_ints()
+    return seen
+
+
+def test_derandomized_shards_are_reproducible_and_distinct():
+    assert derandomized_examples(0, 2) == derandomized_examples(0, 2)
+    assert derandomized_examples(0, 2) != derandomized_examples(1, 2)
+
+
+def test_copies_of_a_test_are_shards_of_its_seeds():
+    assert derandomized_examples(0, 1, (1, 2)) == \
+        derandomized_examples(1, 2)[:10]
+
+
+def test_reads_shards_from_environment(monkeypatch):
+    monkeypatch.setenv('HYPOTHESIS_SHARD_INDEX', '2')
+    monkeypatch.setenv('HYPOTHESIS_SHARD_COUNT', '5')
+    settings = Settings()
+    assert settings.shard_index == 2
+    assert settings.shard_count == 5
+
+
+@pytest.mark.parametrize(('index', 'count'), [(0, 0), (-1, 2), (2, 2)])
+def test_rejects_invalid_shards(index, count):
+    with pytest.raises(InvalidArgument):
+        @given(integers(), settings=Settings(
+            shard_index=index, shard_count=count))
+        def test_ints(x):
+            pass
+
+
+def test_rejects_invalid_shards_from_environment(monkeypatch):
+    monkeypatch.setenv('HYPOTHESIS_SHARD_COUNT', 'lots')
+    with pytest.raises(InvalidArgument) as e:
+        Settings()
+    assert 'HYPOTHESIS_SHARD_COUNT' in e.value.args[0]
+
+
+def test_warns_about_sharding_without_derandomize():
+    with pytest.raises(HypothesisWarning):
+        @given(integers(), settings=Settings(
+            shard_index=0, shard_count=2, strict=True))
+        def test_ints(x):
+            pass
+
+
+def test_does_not_warn_about_derandomized_shards():
+    @given(integers(), settings=Settings(
+        shard_index=0, shard_count=2, strict=True, derandomize=True))
+    def test_ints(x):
+        pass
+
+
+def test_only_warns_about_random_shards_once(monkeypatch):
+    monkeypatch.setattr(sharding, 'warned_about_random_shards', False)
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        for _ in range(3):
+            @given(integers(), settings=Settings(
+                shard_index=0, shard_count=2, strict=False))
+            def test_ints(x):
+                pass
+    assert len(
+        [x for x in w if issubclass(x.category, HypothesisWarning)]) == 1
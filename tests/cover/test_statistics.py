@@ -0,0 +1,116 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import pytest
+
+from hypothesis import find, given, assume
+from hypothesis.database import ExampleDatabase
+from hypothesis.settings import Settings
+from hypothesis.statistics import Statistics, collect_statistics, \
+    current_statistics, describe_statistics
+from hypothesis.strategies import lists, booleans, integers
+
+
+def test_does_not_collect_statistics_by_default():
+    assert current_statistics().timing('running') is not None
+    current_statistics().count('shrinks')
+
+
+def test_counts_examples_and_rejections():
+    statistics = Statistics()
+
+    @given(integers(), settings=Settings(max_examples=50, database=None))
+    def test_positive(x):
+        assume(x > 0)
+
+    with collect_statistics(statistics):
+        test_positive()
+    data = statistics.as_dict()
+    assert data['examples_tried'] >= 50
+    assert data['rejections'] > 0
+    assert data['shrinks'] == 0
+    assert data['database_hits'] == 0
+    assert data['running_time'] > 0
+    assert data['generating_time'] > 0
+
+
+def test_counts_duplicates():
+    statistics = Statistics()
+
+    @given(lists(booleans()), settings=Settings(
+        max_examples=200, database=None))
+    def test_bools(x):
+        pass
+
+    with collect_statistics(statistics):
+        test_bools()
+    assert statistics.as_dict()['duplicates'] > 0
+
+
+def test_counts_shrinks_and_database_hits():
+    database = ExampleDatabase()
+    settings = Settings(database=database)
+    statistics = Statistics()
+    with collect_statistics(statistics):
+        find(integers(), lambda x: x >= 100, settings=settings)
+    data = statistics.as_dict()
+    assert data['shrinks'] > 0
+    assert data['shrinking_time'] > 0
+    assert data['database_hits'] == 0
+
+    statistics = Statistics()
+    with collect_statistics(statistics):
+        find(integers(), lambda x: x >= 100, settings=settings)
+    assert statistics.as_dict()['database_hits'] == 1
+
+
+def test_collects_from_concurrent_examples():
+    statistics = Statistics()
+
+    @given(integers(), settings=Settings(
+        max_examples=20, database=None, concurrent_examples=4))
+    def test_ints(x):
+        pass
+
+    with collect_statistics(statistics):
+        test_ints()
+    assert statistics.as_dict()['running_time'] > 0
+
+
+def test_does_not_lose_statistics_on_failure():
+    statistics = Statistics()
+
+    @given(integers(), settings=Settings(database=None))
+    def test_small(x):
+        assert x < 10
+
+    with collect_statistics(statistics):
+        with pytest.raises(AssertionError):
+            test_small()
+    assert statistics.as_dict()['shrinks'] > 0
+
+
+def test_describes_statistics():
+    statistics = Statistics()
+    statistics.count('examples_tried', 3)
+    statistics.add_time('running', 1.5)
+    description = '\n'.join(describe_statistics(statistics))
+    assert '3 examples tried' in description
+    assert '1.50s running' in description
+    assert 'examples_tried=3' in repr(statistics)
@@ -0,0 +1,189 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import pytest
+
+from hypothesis import given
+from hypothesis.database import ExampleDatabase
+from hypothesis.settings import Settings
+from hypothesis.budget import TimeBudget, with_time_budget
+from hypothesis.strategies import integers, booleans
+from hypothesis.internal.verification import Verification, \
+    IncrementalRun, verification_key, load_verification, save_verification
+
+
+def counting_test(settings, values=integers()):
+    calls = []
+
+    @given(values, settings=settings)
+    def test_ints(x):
+        calls.append(x)
+    return test_ints, calls
+
+
+def runs(test, calls):
+    del calls[:]
+    test()
+    return len(calls)
+
+
+def test_verification_round_trips():
+    database = ExampleDatabase()
+
+    def test(x):
+        pass
+
+    assert load_verification(database, test) is None
+    verification = Verification('a', 'b', '', 100, True, 2)
+    save_verification(database, test, verification)
+    assert load_verification(database, test) == verification
+
+
+def test_ignores_bad_verification():
+    database = ExampleDatabase()
+
+    def test(x):
+        pass
+
+    database.backend.save(verification_key(test), '[1, 2]')
+    assert load_verification(database, test) is None
+
+
+def test_first_run_is_full():
+    def test(x):
+        pass
+
+    settings = Settings(database=ExampleDatabase(), incremental=True)
+    run = IncrementalRun(test, 'fingerprint', settings)
+    assert run.full
+    assert not run.skip
+    assert run.settings is settings
+
+
+def test_runs_in_full_when_off():
+    test, calls = counting_test(Settings(database=ExampleDatabase()))
+    assert runs(test, calls) > 0
+    assert runs(test, calls) > 0
+
+
+def test_skips_unchanged_tests_which_passed():
+    test, calls = counting_test(Settings(
+        database=ExampleDatabase(), incremental=True))
+    assert runs(test, calls) > 0
+    assert runs(test, calls) == 0
+
+
+def test_runs_reduced_budget():
+    test, calls = counting_test(Settings(
+        database=ExampleDatabase(), incremental=True, max_examples=100,
+        incremental_examples=10, min_satisfying_examples=1,
+    ))
+    assert runs(test, calls) > 10
+    assert 0 < runs(test, calls) <= 10
+
+
+def test_never_goes_below_min_satisfying_examples():
+    def test(x):
+        pass
+
+    database = ExampleDatabase()
+    save_verification(database, test, Verification(
+        IncrementalRun(test, 'f', Settings(database=database)).digest,
+        'f', '', 200, True, 0))
+    run = IncrementalRun(test, 'f', Settings(
+        database=database, incremental_examples=1,
+        min_satisfying_examples=5, max_examples=200,
+    ))
+    assert not run.full
+    assert run.settings.max_examples == 5
+
+
+def test_runs_in_full_every_interval():
+    test, calls = counting_test(Settings(
+        database=ExampleDatabase(), incremental=True, full_run_interval=2))
+    results = [runs(test, calls) for _ in range(6)]
+    assert [bool(r) for r in results] == [
+        True, False, False, True, False, False]
+
+
+def test_runs_in_full_when_dependencies_change():
+    database = ExampleDatabase()
+    test, calls = counting_test(Settings(
+        database=database, incremental=True, dependency_hash='1'))
+    assert runs(test, calls) > 0
+    assert runs(test, calls) == 0
+    test, calls = counting_test(Settings(
+        database=database, incremental=True, dependency_hash='2'))
+    assert runs(test, calls) > 0
+
+
+def test_runs_in_full_when_strategy_changes():
+    database = ExampleDatabase()
+    test, calls = counting_test(Settings(
+        database=database, incremental=True))
+    assert runs(test, calls) > 0
+    test, calls = counting_test(Settings(
+        database=database, incremental=True), integers(min_value=0))
+    assert runs(test, calls) > 0
+
+
+def test_runs_in_full_when_asked_for_more_examples():
+    database = ExampleDatabase()
+    test, calls = counting_test(Settings(
+        database=database, incremental=True, max_examples=10))
+    assert runs(test, calls) > 0
+    test, calls = counting_test(Settings(
+        database=database, incremental=True, max_examples=20))
+    assert runs(test, calls) > 0
+
+
+def test_runs_in_full_after_failure():
+    settings = Settings(database=ExampleDatabase(), incremental=True)
+    failing = [True]
+    calls = []
+
+    @given(integers(), settings=settings)
+    def test_ints(x):
+        calls.append(x)
+        assert not failing[0]
+
+    with pytest.raises(AssertionError):
+        test_ints()
+    failing[0] = False
+    assert runs(test_ints, calls) > 0
+    assert runs(test_ints, calls) == 0
+
+
+def test_runs_cut_short_are_not_full_verifications():
+    test, calls = counting_test(Settings(
+        database=ExampleDatabase(), incremental=True, max_examples=100,
+        min_satisfying_examples=1,
+    ), booleans())
+    assert runs(test, calls) > 0
+    assert runs(test, calls) > 0
+
+
+def test_skipped_tests_leave_the_budget_to_others():
+    test, calls = counting_test(Settings(
+        database=ExampleDatabase(), incremental=True))
+    runs(test, calls)
+    budget = TimeBudget(60, 2)
+    with with_time_budget(budget):
+        assert runs(test, calls) == 0
+    assert budget.tests == 1